@@ -12,6 +12,15 @@ class Config:
     # Default window size (change by picking a key from RESOLUTIONS)
     WIDTH, HEIGHT = RESOLUTIONS["720p"]
     TARGET_FPS = 60
+    # Dirty-rect presentation: redraw/present only changed regions in scenes that support it
+    DIRTY_RECTS = False
+    # Idle handling: skip redraws when nothing changes and block on input instead of spinning
+    IDLE_SKIP = True
+    UNFOCUSED_FPS = 10  # frame cap while the window is in the background
+    MINIMIZED_WAIT_MS = 250  # wake-up interval while minimized (no rendering)
+    # Longest step given to movement/scene updates; a frame after an idle wait can be ~1 s
+    # long (the clock still advances by all of it)
+    MAX_STEP_MS = 50
 
     # Movement
     SPEED = 140.0  # px/s
@@ -48,9 +57,117 @@ class Config:
         "soil_ready": (200, 170, 60),
     }
 
+    # Rewind: state snapshots every N world frames in a bounded ring (F7 rewinds)
+    SNAPSHOTS = True
+    SNAPSHOT_INTERVAL_FRAMES = 30
+    SNAPSHOT_CAPACITY = 240  # ~2 minutes at 60 FPS with the default interval
+    SNAPSHOT_KEYFRAME_EVERY = 20  # full snapshot every N snapshots, deltas in between
+    SNAPSHOT_REWIND_SECONDS = 5.0
+
+    # Named saves: "binary" (compressed container, sections decoded on demand) or "json" (legacy)
+    SAVE_FORMAT = "binary"
+    # Save backend: "store" keeps each named save as a small manifest and stores its sections
+    # once in a shared content-addressed store (saves/store); "files" writes one SAVE_FORMAT file per save
+    SAVE_BACKEND = "store"
+
+    # Frame capture (background PNG encoding): save thumbnails and F10 clip recording to CAPTURE_DIR
+    CAPTURE_THUMB_SIZE = (160, 90)
+    CAPTURE_DIR = "captures"
+    CAPTURE_CLIP_FPS = 15
+    CAPTURE_CLIP_SCALE = 0.5  # clip frames are downscaled by this factor
+    CAPTURE_QUEUE_MAX = 8  # clip frames are dropped while this many writes are pending
+
+    # Journaled autosave: small change records appended to saves/journal/<slot>, compacted periodically
+    JOURNAL_AUTOSAVE = True
+    JOURNAL_AUTOSAVE_SECONDS = 30.0  # of play (world) time
+    JOURNAL_COMPACT_RECORDS = 64  # fold the log into a new base after this many records
+
+    # Key bindings per input context (key names as accepted by pygame.key.key_code).
+    # UPPERCASE values are actions polled by the game, dotted values are event topics
+    # published on key press. "shared" bindings apply in the gameplay, dialog and panel contexts.
+    KEY_BINDINGS = {
+        "shared": {
+            "f1": "ui.debug.toggle",
+            "m": "ui.minimap.toggle",
+            "i": "ui.inventory.toggle",
+            "j": "ui.journal.toggle",
+            "c": "ui.character.toggle",
+            "h": "ui.help.toggle",
+            "p": "ui.pause.open",
+            "q": "ui.quit.open",
+            "f5": "TIME_SKIP",
+            "f6": "COINS_PLUS",
+            "f9": "GIVE_SWORD",
+            "f7": "world.rewind",
+            "f10": "capture.clip.toggle",
+        },
+        "gameplay": {
+            "w": "MOVE_UP", "up": "MOVE_UP",
+            "s": "MOVE_DOWN", "down": "MOVE_DOWN",
+            "a": "MOVE_LEFT", "left": "MOVE_LEFT",
+            "d": "MOVE_RIGHT", "right": "MOVE_RIGHT",
+            "space": "INTERACT",
+            "left shift": "RUN", "right shift": "RUN",
+            "escape": "CANCEL",
+            "e": "TILL",
+            "f": "PLANT",
+        },
+        "dialog": {
+            "w": "CHOICE_UP", "up": "CHOICE_UP",
+            "s": "CHOICE_DOWN", "down": "CHOICE_DOWN",
+            "space": "INTERACT",
+            "a": "CONFIRM_ALT",
+            "escape": "CANCEL",
+        },
+        "panel": {
+            "w": "ui.nav.up", "up": "ui.nav.up",
+            "s": "ui.nav.down", "down": "ui.nav.down",
+            "space": "ui.nav.confirm", "return": "ui.nav.confirm",
+            "a": "ui.nav.alt",
+            "escape": "ui.panel.close",
+        },
+        "menu": {
+            "w": "NAV_UP", "up": "NAV_UP",
+            "s": "NAV_DOWN", "down": "NAV_DOWN",
+            "space": "CONFIRM", "return": "CONFIRM",
+            "escape": "CANCEL",
+            "delete": "DELETE",
+        },
+    }
+
+    # Scene drawing: static drawables are culled to the camera through a grid of this cell size (px)
+    SPATIAL_CELL_SIZE = 256
+
+    # NPC navigation: grid baked from scene colliders, LRU path cache, per-frame search budget
+    NAV_CELL_SIZE = 32  # agents must fit in one cell
+    NAV_PATH_CACHE = 512
+    NAV_BUDGET_MS = 2.0
+    NAV_WORKER = False  # solve path requests on a background thread instead
+
+    # NPC schedules: NPCs outside the active scene are re-evaluated every N game minutes
+    SCHEDULE_TICK_MINUTES = 5
+    NPC_WALK_SPEED = 60.0  # px/s
+
+    # HUD notifications: lifetime, fade-out, window for merging "+N Coins"-style deltas
+    NOTIFY_DURATION_MS = 2000
+    NOTIFY_FADE_MS = 400
+    NOTIFY_COALESCE_MS = 1500
+    NOTIFY_MAX_VISIBLE = 4
+    NOTIFY_CAPACITY = 16
+
+    # Dialogue panel: reveal each line glyph by glyph (Space first completes the line)
+    DIALOG_TYPEWRITER = False
+    DIALOG_CHARS_PER_SEC = 45.0
+
     # Farming
     FARM_GROWTH_MINUTES = 720.0  # 12 in-game hours by default
 
+    # Minimap exploration (fog of war)
+    FOG_OF_WAR = True
+    EXPLORE_CELL_SIZE = 32  # world px per exploration cell
+    EXPLORE_VIEW_RADIUS = 256  # world px revealed around the player
+    EXPLORE_LOG_CAP = 4096  # pending reveal log entries kept for the minimap fog
+
     # Debug
     DEBUG_OVERLAY = False
     DRAW_DEBUG_SHAPES = False
@@ -58,3 +175,6 @@ class Config:
     # Data paths
     DATA_DIR = "game/data"
     SCENES_DIR = f"{DATA_DIR}/scenes"
+    SCHEDULES_FILE = f"{DATA_DIR}/schedules.json"
+    QUESTS_FILE = f"{DATA_DIR}/quests.json"
+    DIALOGUE_DIR = f"{DATA_DIR}/dialogue"
@@ -0,0 +1,185 @@
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Archetype-based entity storage. Entities with the same set of components share an
+# Archetype whose components are stored column-wise (structure of arrays): numeric
+# components registered in COMPONENTS are NumPy arrays with one row per entity, anything
+# else is a plain Python list. Systems ask for a component signature with query() and
+# work on whole columns at once instead of visiting entities one by one.
+
+# name -> (dtype, per-entity shape) for NumPy-backed components
+COMPONENTS: Dict[str, Tuple[Any, Tuple[int, ...]]] = {
+    "Transform": (np.float64, (2,)),  # world position (top-left of the collider box), px
+    "Velocity": (np.float64, (2,)),  # px/s
+    "Collider": (np.float64, (2,)),  # box size (w, h), px
+    "Renderable": (np.uint8, (3,)),  # fill colour
+    "Wander": (np.float64, (2,)),  # (ms until the next heading change, walk speed px/s)
+}
+
+
+def register_component(name: str, dtype: Any, shape: Tuple[int, ...] = ()):
+    """Declare a NumPy-backed component; unregistered components are stored as objects."""
+    COMPONENTS[name] = (dtype, tuple(shape))
+
+
+class Archetype:
+    """All entities with exactly `signature` as their component set."""
+    __slots__ = ("signature", "columns", "ids", "count")
+
+    def __init__(self, signature: FrozenSet[str], capacity: int = 16):
+        self.signature = signature
+        self.columns: Dict[str, Any] = {}
+        for name in signature:
+            spec = COMPONENTS.get(name)
+            self.columns[name] = np.zeros((capacity,) + spec[1], dtype=spec[0]) if spec else []
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+
+    def column(self, name: str):
+        """The live rows of a component column (a NumPy view or a list)."""
+        col = self.columns[name]
+        return col[:self.count] if isinstance(col, np.ndarray) else col
+
+    def entity_ids(self) -> np.ndarray:
+        return self.ids[:self.count]
+
+    def _grow(self):
+        cap = max(16, len(self.ids) * 2)
+        for name, col in self.columns.items():
+            if isinstance(col, np.ndarray):
+                grown = np.zeros((cap,) + col.shape[1:], dtype=col.dtype)
+                grown[:self.count] = col[:self.count]
+                self.columns[name] = grown
+        ids = np.zeros(cap, dtype=np.int64)
+        ids[:self.count] = self.ids[:self.count]
+        self.ids = ids
+
+    def append(self, eid: int, values: Dict[str, Any]) -> int:
+        if self.count == len(self.ids):
+            self._grow()
+        row = self.count
+        for name, col in self.columns.items():
+            if isinstance(col, np.ndarray):
+                col[row] = values[name]
+            else:
+                col.append(values[name])
+        self.ids[row] = eid
+        self.count += 1
+        return row
+
+    def row_values(self, row: int) -> Dict[str, Any]:
+        return {name: (col[row].copy() if isinstance(col, np.ndarray) else col[row]) for name, col in self.columns.items()}
+
+    def remove(self, row: int) -> Optional[int]:
+        """Swap-remove a row; returns the id of the entity moved into `row` (if any)."""
+        last = self.count - 1
+        moved = None
+        for name, col in self.columns.items():
+            if isinstance(col, np.ndarray):
+                if row != last:
+                    col[row] = col[last]
+            else:
+                if row != last:
+                    col[row] = col[last]
+                col.pop()
+        if row != last:
+            moved = int(self.ids[last])
+            self.ids[row] = moved
+        self.count = last
+        return moved
+
+
+class EntityStore:
+    """
+    Entities of one scene. spawn(Transform=(x, y), Collider=(w, h), ...) returns an id;
+    query("Transform", "Velocity") yields every archetype holding at least those components.
+    """
+    def __init__(self):
+        self._archetypes: Dict[FrozenSet[str], Archetype] = {}
+        self._where: Dict[int, Tuple[Archetype, int]] = {}
+        self._next_id = 1
+        self._query_cache: Dict[FrozenSet[str], List[Archetype]] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, eid: int) -> bool:
+        return eid in self._where
+
+    def _archetype(self, signature: FrozenSet[str]) -> Archetype:
+        arch = self._archetypes.get(signature)
+        if arch is None:
+            arch = self._archetypes[signature] = Archetype(signature)
+            self._query_cache.clear()
+        return arch
+
+    def spawn(self, **components: Any) -> int:
+        eid = self._next_id
+        self._next_id += 1
+        arch = self._archetype(frozenset(components))
+        self._where[eid] = (arch, arch.append(eid, components))
+        return eid
+
+    def despawn(self, eid: int) -> bool:
+        loc = self._where.pop(eid, None)
+        if loc is None:
+            return False
+        arch, row = loc
+        moved = arch.remove(row)
+        if moved is not None:
+            self._where[moved] = (arch, row)
+        return True
+
+    def clear(self):
+        self._archetypes.clear()
+        self._where.clear()
+        self._query_cache.clear()
+
+    def get(self, eid: int, name: str) -> Any:
+        arch, row = self._where[eid]
+        return arch.columns[name][row]
+
+    def set(self, eid: int, name: str, value: Any):
+        arch, row = self._where[eid]
+        arch.columns[name][row] = value
+
+    def has(self, eid: int, name: str) -> bool:
+        loc = self._where.get(eid)
+        return loc is not None and name in loc[0].signature
+
+    def _move(self, eid: int, values: Dict[str, Any]):
+        self.despawn(eid)
+        arch = self._archetype(frozenset(values))
+        self._where[eid] = (arch, arch.append(eid, values))
+
+    def add_component(self, eid: int, name: str, value: Any):
+        """Add (or replace) a component; moves the entity to another archetype."""
+        arch, row = self._where[eid]
+        if name in arch.signature:
+            arch.columns[name][row] = value
+            return
+        values = arch.row_values(row)
+        values[name] = value
+        self._move(eid, values)
+
+    def remove_component(self, eid: int, name: str):
+        arch, row = self._where[eid]
+        if name not in arch.signature:
+            return
+        values = arch.row_values(row)
+        del values[name]
+        self._move(eid, values)
+
+    def query(self, *names: str) -> List[Archetype]:
+        """Non-empty archetypes whose signature includes all `names`."""
+        key = frozenset(names)
+        archs = self._query_cache.get(key)
+        if archs is None:
+            archs = self._query_cache[key] = [a for sig, a in self._archetypes.items() if key <= sig]
+        return [a for a in archs if a.count]
+
+    def spawn_from_json(self, defs: Iterable[Dict[str, Any]]) -> List[int]:
+        """Spawn scene JSON "entities": [{"components": {"Transform": [x, y], ...}}, ...]."""
+        return [self.spawn(**dict(d.get("components") or {})) for d in defs]
@@ -1,9 +1,92 @@
 import pygame
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from game.config import Config
+
+
+def _key_code(name: str) -> Optional[int]:
+    try:
+        return pygame.key.key_code(name)
+    except (ValueError, pygame.error):
+        return getattr(pygame, "K_" + name, None)
+
+
+class KeyMap:
+    """
+    Key -> actions lookup per input context, compiled from Config.KEY_BINDINGS.
+    "shared" bindings are folded into each of SHARED_CONTEXTS at compile time, so resolving
+    a key is a single dict lookup for the active context. Compiled lazily because key names
+    are resolved through pygame.key, which wants pygame initialized.
+    """
+    SHARED_CONTEXTS = ("gameplay", "dialog", "panel")
+
+    def __init__(self, bindings: Optional[Dict[str, Dict[str, Union[str, List[str]]]]] = None):
+        src = Config.KEY_BINDINGS if bindings is None else bindings
+        self._bindings: Dict[str, Dict[str, Tuple[str, ...]]] = {
+            ctx: {name: self._as_tuple(acts) for name, acts in table.items()}
+            for ctx, table in src.items()
+        }
+        self._table: Optional[Dict[str, Dict[int, Tuple[str, ...]]]] = None
+
+    @staticmethod
+    def _as_tuple(actions: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+        return (actions,) if isinstance(actions, str) else tuple(actions)
+
+    def _compile(self) -> Dict[str, Dict[int, Tuple[str, ...]]]:
+        shared = self._bindings.get("shared", {})
+        table: Dict[str, Dict[int, Tuple[str, ...]]] = {}
+        for ctx, bindings in self._bindings.items():
+            if ctx == "shared":
+                continue
+            merged = dict(shared) if ctx in self.SHARED_CONTEXTS else {}
+            merged.update(bindings)
+            compiled: Dict[int, Tuple[str, ...]] = {}
+            for name, acts in merged.items():
+                code = _key_code(name)
+                if code is not None and acts:
+                    compiled[code] = acts
+            table[ctx] = compiled
+        self._table = table
+        return table
+
+    def lookup(self, context: str, key: int) -> Tuple[str, ...]:
+        table = self._table or self._compile()
+        ctx = table.get(context)
+        return ctx.get(key, ()) if ctx else ()
+
+    def keys(self, context: str) -> Dict[int, Tuple[str, ...]]:
+        table = self._table or self._compile()
+        return table.get(context, {})
+
+    def bind(self, context: str, key_name: str, actions: Union[str, Iterable[str]]):
+        """Rebind a key in a context ("shared" affects every shared context)."""
+        self._bindings.setdefault(context, {})[key_name] = self._as_tuple(actions)
+        self._table = None
+
+    def unbind(self, context: str, key_name: str):
+        self._bindings.get(context, {}).pop(key_name, None)
+        self._table = None
+
+    def polled_actions(self) -> List[str]:
+        # UPPERCASE names are polled actions; everything else is an event topic
+        names = []
+        for table in self._bindings.values():
+            for acts in table.values():
+                for a in acts:
+                    if a.isupper() and a not in names:
+                        names.append(a)
+        return names
+
+
+# Default bindings, shared by Input and the menu scenes
+keymap = KeyMap()
 
 
 class Input:
-    def __init__(self):
+    def __init__(self, keys: Optional[KeyMap] = None):
+        self.keymap = keys or keymap
+        # Active context: gameplay, dialog, panel or menu (set by the main loop)
+        self.context = "gameplay"
         self.actions: Dict[str, bool] = {
             "MOVE_UP": False,
             "MOVE_DOWN": False,
@@ -20,71 +103,55 @@ class Input:
             "COINS_PLUS": False,
             "GIVE_SWORD": False,
         }
+        for name in self.keymap.polled_actions():
+            self.actions.setdefault(name, False)
         self._pressed_frame: Dict[str, bool] = {k: False for k in self.actions}
 
-    def process_pygame_event(self, event: pygame.event.Event, events_bus):
-        if event.type in (pygame.KEYDOWN, pygame.KEYUP):
-            down = event.type == pygame.KEYDOWN
-            if event.key in (pygame.K_w, pygame.K_UP):
-                self.actions["MOVE_UP"] = down
-                if down:
-                    events_bus.publish("ui.nav.up", {})
-            if event.key in (pygame.K_s, pygame.K_DOWN):
-                self.actions["MOVE_DOWN"] = down
-                if down:
-                    events_bus.publish("ui.nav.down", {})
-            if event.key in (pygame.K_a, pygame.K_LEFT):
-                self.actions["MOVE_LEFT"] = down
-            if event.key in (pygame.K_d, pygame.K_RIGHT):
-                self.actions["MOVE_RIGHT"] = down
-            if event.key == pygame.K_SPACE:
-                self.actions["INTERACT"] = down
-                if down:
-                    self._pressed_frame["INTERACT"] = True
-                    events_bus.publish("ui.nav.confirm", {})
-            if event.key == pygame.K_a:
-                self.actions["CONFIRM_ALT"] = down
-                if down:
-                    self._pressed_frame["CONFIRM_ALT"] = True
-                    events_bus.publish("ui.nav.alt", {})
-            if event.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
-                self.actions["RUN"] = down
-            if event.key == pygame.K_ESCAPE:
-                self.actions["CANCEL"] = down
-                if down:
-                    self._pressed_frame["CANCEL"] = True
-            if event.key == pygame.K_F5:
-                self.actions["TIME_SKIP"] = down
-                if down:
-                    self._pressed_frame["TIME_SKIP"] = True
-            if event.key == pygame.K_F6:
-                self.actions["COINS_PLUS"] = down
-                if down:
-                    self._pressed_frame["COINS_PLUS"] = True
-            if event.key == pygame.K_F9:
-                self.actions["GIVE_SWORD"] = down
-                if down:
-                    self._pressed_frame["GIVE_SWORD"] = True
-            if event.key == pygame.K_e:
-                self.actions["TILL"] = down
-                if down:
-                    self._pressed_frame["TILL"] = True
-            if event.key == pygame.K_f:
-                self.actions["PLANT"] = down
+    def set_context(self, context: str):
+        if context == self.context:
+            return
+        self.context = context
+        # Held actions belong to the old context; pick up keys still held that mean something here
+        self.release_all()
+        try:
+            pressed = pygame.key.get_pressed()
+        except pygame.error:
+            return
+        for key, acts in self.keymap.keys(context).items():
+            try:
+                held = pressed[key]
+            except IndexError:
+                continue
+            if held:
+                for name in acts:
+                    if name in self.actions:
+                        self.actions[name] = True
+
+    def process_pygame_event(self, event: pygame.event.Event, events_bus) -> Tuple[str, ...]:
+        """Apply a key event in the active context. Returns the actions/topics fired by a key press."""
+        if event.type not in (pygame.KEYDOWN, pygame.KEYUP):
+            return ()
+        acts = self.keymap.lookup(self.context, event.key)
+        if not acts:
+            return ()
+        down = event.type == pygame.KEYDOWN
+        for name in acts:
+            if name in self.actions:
+                self.actions[name] = down
                 if down:
-                    self._pressed_frame["PLANT"] = True
-            if event.key == pygame.K_F1 and down:
-                events_bus.publish("ui.debug.toggle", {})
-            if event.key == pygame.K_m and down:
-                events_bus.publish("ui.minimap.toggle", {})
-            if event.key == pygame.K_i and down:
-                events_bus.publish("ui.inventory.toggle", {})
-            if event.key == pygame.K_j and down:
-                events_bus.publish("ui.journal.toggle", {})
-            if event.key == pygame.K_c and down:
-                events_bus.publish("ui.character.toggle", {})
-            if event.key == pygame.K_h and down:
-                events_bus.publish("ui.help.toggle", {})
+                    self._pressed_frame[name] = True
+            elif down:
+                events_bus.publish(name, {})
+        return acts if down else ()
+
+    def any_active(self) -> bool:
+        # True while any action is held or was pressed this frame
+        return any(self.actions.values()) or any(self._pressed_frame.values())
+
+    def release_all(self):
+        # Used when the window loses focus: key-up events will not arrive
+        for k in self.actions:
+            self.actions[k] = False
 
     def was_pressed(self, action: str) -> bool:
         return self._pressed_frame.get(action, False)
@@ -0,0 +1,110 @@
+from enum import IntEnum
+from typing import Any, Dict, Iterable, List, Optional
+
+import pygame
+
+
+# Typed scene records built once from scene JSON. Tags ("npc.farmer", "door.shop", ...)
+# are parsed at load into a Kind so per-frame code compares ints instead of strings.
+
+
+class Kind(IntEnum):
+    OTHER = 0
+    DOOR = 1
+    NPC = 2
+    SIGN = 3
+    BED = 4
+    BUILDING = 5
+
+
+_KIND_PREFIX = {
+    "door": Kind.DOOR,
+    "npc": Kind.NPC,
+    "sign": Kind.SIGN,
+    "bed": Kind.BED,
+    "building": Kind.BUILDING,
+}
+
+
+def parse_kind(tag: str) -> Kind:
+    return _KIND_PREFIX.get(tag.split(".", 1)[0], Kind.OTHER)
+
+
+class Interactable:
+    __slots__ = ("tag", "kind", "rect", "prompt", "action", "active")
+
+    def __init__(self, tag: str, rect: pygame.Rect, prompt: Optional[str] = None, action: Optional[Dict[str, Any]] = None):
+        self.tag = tag
+        self.kind = parse_kind(tag)
+        self.rect = rect
+        self.prompt = prompt
+        self.action = action or {}
+        self.active = True  # False while a scheduled NPC is elsewhere
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "Interactable":
+        return cls(str(d.get("tag", "")), pygame.Rect(*d["rect"]), d.get("prompt"), d.get("action"))
+
+    def __repr__(self) -> str:
+        return f"Interactable({self.tag!r}, {self.rect})"
+
+
+class Trigger:
+    __slots__ = ("tag", "rect", "on_enter")
+
+    def __init__(self, tag: str, rect: pygame.Rect, on_enter: Optional[Dict[str, Any]] = None):
+        self.tag = tag
+        self.rect = rect
+        self.on_enter = on_enter or {}
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "Trigger":
+        return cls(str(d.get("tag", "")), pygame.Rect(*d["rect"]), d.get("on_enter"))
+
+
+class Collider:
+    """Tagged static collider (buildings); the rect is shared with world_colliders."""
+    __slots__ = ("tag", "kind", "rect")
+
+    def __init__(self, tag: str, rect: pygame.Rect):
+        self.tag = tag
+        self.kind = parse_kind(tag)
+        self.rect = rect
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "Collider":
+        return cls(str(d.get("tag", "")), pygame.Rect(*d["rect"]))
+
+
+class Plot:
+    __slots__ = ("id", "rect", "state", "planted_minutes")
+
+    def __init__(self, plot_id: Optional[str], rect: pygame.Rect, state: str = "untilled", planted_minutes: Optional[float] = None):
+        self.id = plot_id
+        self.rect = rect
+        self.state = state  # untilled|tilled|planted|ready
+        self.planted_minutes = planted_minutes
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "Plot":
+        return cls(d.get("id"), pygame.Rect(*d["rect"]))
+
+
+def load_records(cls, entries: Iterable[Dict[str, Any]]) -> List[Any]:
+    return [cls.from_json(d) for d in entries]
+
+
+def by_kind(items: Iterable[Any]) -> Dict[Kind, List[Any]]:
+    """Group records per Kind (every Kind has a list, possibly empty)."""
+    out: Dict[Kind, List[Any]] = {k: [] for k in Kind}
+    for it in items:
+        out[it.kind].append(it)
+    return out
+
+
+def by_tag(items: Iterable[Any]) -> Dict[str, Any]:
+    """First record per tag."""
+    out: Dict[str, Any] = {}
+    for it in items:
+        out.setdefault(it.tag, it)
+    return out
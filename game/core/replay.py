@@ -0,0 +1,244 @@
+import gzip
+import hashlib
+import json
+import os
+import struct
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pygame
+
+from game.config import Config
+from game.core import session
+from game.util.rng import reseed
+
+
+# Input log layout (gzip stream):
+#   MAGIC, <HI version + header length, JSON header {"actions": [...], ...}
+#   then records, each starting with a type byte:
+#     FRAME  <BHIIB  dt ms, held action bits, pressed action bits, topic count; then <H topic id each
+#     TOPIC  <BHB    topic id, name length; then the UTF-8 name
+#     RESET  <BII    rng seed, JSON length; then {"save": ..., "ui": ...} (start state of a session)
+#     CHECK  <B20s   sha1 state digest at this point (written when a menu opens and on close)
+MAGIC = b"RPGINPUT"
+VERSION = 1
+
+_REC_FRAME = 1
+_REC_TOPIC = 2
+_REC_RESET = 3
+_REC_CHECK = 4
+
+_HEADER = struct.Struct("<HI")
+_FRAME = struct.Struct("<BHIIB")
+_TOPIC_ID = struct.Struct("<H")
+_TOPIC = struct.Struct("<BHB")
+_RESET = struct.Struct("<BII")
+_CHECK = struct.Struct("<B20s")
+
+# DebugUI panel state restored with each RESET (panels consume ui.nav.* topics)
+_UI_FIELDS = ("inventory_visible", "journal_visible", "character_visible", "help_visible", "_inv_selection")
+
+
+def state_digest(scene_manager) -> bytes:
+    """sha1 over the full persisted state (GameState, time, scene and player position)."""
+    data = session.build_save_dict(scene_manager)
+    blob = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha1(blob).digest()
+
+
+class InputRecorder:
+    """
+    Records the per-frame action state that drives the world (after key lookup), so a
+    session can be replayed without a window, keyboard or wall clock. A RESET record with
+    the starting save and a fresh RNG seed is written whenever the world is replaced
+    wholesale (new game, load), and CHECK records hold state digests for verification.
+    """
+    def __init__(self, path: str, input_sys, debug_ui=None):
+        self.debug_ui = debug_ui
+        self.actions: List[str] = list(input_sys.actions.keys())
+        if len(self.actions) > 32:
+            raise ValueError("InputRecorder supports at most 32 actions")
+        self._polled = set(self.actions)
+        self._topic_ids: Dict[str, int] = {}
+        self._pending_topics: List[int] = []
+        self._generation: Optional[int] = None
+        self.frames = 0
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._f = gzip.open(path, "wb")
+        header = json.dumps({
+            "actions": self.actions,
+            "target_fps": Config.TARGET_FPS,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        }).encode("utf-8")
+        self._f.write(MAGIC + _HEADER.pack(VERSION, len(header)) + header)
+
+    def _topic_id(self, name: str) -> int:
+        tid = self._topic_ids.get(name)
+        if tid is None:
+            tid = self._topic_ids[name] = len(self._topic_ids)
+            raw = name.encode("utf-8")
+            self._f.write(_TOPIC.pack(_REC_TOPIC, tid, len(raw)) + raw)
+        return tid
+
+    def note_fired(self, fired):
+        # Event topics published by Input; replayed before the next recorded frame
+        for name in fired:
+            if name not in self._polled:
+                self._pending_topics.append(self._topic_id(name))
+
+    def _write_reset(self, scene_manager):
+        seed = reseed()
+        ui = {}
+        if self.debug_ui is not None:
+            ui = {k: getattr(self.debug_ui, k, None) for k in _UI_FIELDS}
+        blob = json.dumps({"save": session.build_save_dict(scene_manager), "ui": ui}).encode("utf-8")
+        self._f.write(_RESET.pack(_REC_RESET, seed, len(blob)) + blob)
+        # Topics fired before the world was replaced don't belong to the new session
+        self._pending_topics = []
+
+    def record_frame(self, dt: float, input_sys, scene_manager):
+        """Call right before the world is stepped with `dt` from the current Input state."""
+        if scene_manager.generation != self._generation:
+            self._generation = scene_manager.generation
+            self._write_reset(scene_manager)
+        held = 0
+        pressed = 0
+        acts = input_sys.actions
+        pf = input_sys._pressed_frame
+        for i, name in enumerate(self.actions):
+            if acts.get(name):
+                held |= 1 << i
+            if pf.get(name):
+                pressed |= 1 << i
+        topics = self._pending_topics[:255]
+        self._pending_topics = self._pending_topics[255:]
+        rec = _FRAME.pack(_REC_FRAME, max(0, min(0xFFFF, int(dt))), held, pressed, len(topics))
+        if topics:
+            rec += b"".join(_TOPIC_ID.pack(t) for t in topics)
+        self._f.write(rec)
+        self.frames += 1
+
+    def checkpoint(self, scene_manager):
+        # Only for the session being recorded (a reset world hasn't been stepped yet)
+        if scene_manager.generation != self._generation or scene_manager.world is None:
+            return
+        self._f.write(_CHECK.pack(_REC_CHECK, state_digest(scene_manager)))
+
+    def close(self, scene_manager=None):
+        if self._f is None:
+            return
+        if scene_manager is not None:
+            self.checkpoint(scene_manager)
+        self._f.close()
+        self._f = None
+
+
+def read_input_log(path: str) -> Tuple[Dict[str, Any], Iterator[Tuple]]:
+    """Return (header, records). Records are ("frame", dt, held, pressed, topic_ids),
+    ("topic", id, name), ("reset", seed, data) or ("check", digest)."""
+    f = gzip.open(path, "rb")
+    if f.read(len(MAGIC)) != MAGIC:
+        f.close()
+        raise ValueError(f"Not an input log: {path}")
+    version, hlen = _HEADER.unpack(f.read(_HEADER.size))
+    if version != VERSION:
+        f.close()
+        raise ValueError(f"Unsupported input log version {version}")
+    header = json.loads(f.read(hlen).decode("utf-8"))
+
+    def _records():
+        with f:
+            while True:
+                kind = f.read(1)
+                if not kind:
+                    return
+                t = kind[0]
+                if t == _REC_FRAME:
+                    _, dt, held, pressed, n = _FRAME.unpack(kind + f.read(_FRAME.size - 1))
+                    ids = struct.unpack(f"<{n}H", f.read(2 * n)) if n else ()
+                    yield ("frame", dt, held, pressed, ids)
+                elif t == _REC_TOPIC:
+                    _, tid, n = _TOPIC.unpack(kind + f.read(_TOPIC.size - 1))
+                    yield ("topic", tid, f.read(n).decode("utf-8"))
+                elif t == _REC_RESET:
+                    _, seed, n = _RESET.unpack(kind + f.read(_RESET.size - 1))
+                    yield ("reset", seed, json.loads(f.read(n).decode("utf-8")))
+                elif t == _REC_CHECK:
+                    _, digest = _CHECK.unpack(kind + f.read(_CHECK.size - 1))
+                    yield ("check", digest)
+                else:
+                    raise ValueError(f"Corrupt input log: record type {t}")
+
+    return header, _records()
+
+
+def run_replay(path: str) -> Dict[str, Any]:
+    """
+    Feed an input log back through the world headless and as fast as possible.
+    Returns frame/timing stats, the final state digest and how many CHECK digests matched.
+    """
+    from game.core.events import EventBus
+    from game.core.input import Input
+    from game.core.scene import SceneManager
+    from game.core.ui_debug import DebugUI
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((Config.WIDTH, Config.HEIGHT))
+
+    events = EventBus()
+    input_sys = Input()
+    scene_manager = SceneManager(events)
+    session.register_world_scenes(scene_manager)
+    debug_ui = DebugUI(events)
+
+    header, records = read_input_log(path)
+    bits = [(1 << i, name) for i, name in enumerate(header.get("actions", [])) if name in input_sys.actions]
+    topics: Dict[int, str] = {}
+    frames = 0
+    game_ms = 0
+    checks = 0
+    mismatches: List[int] = []
+    t0 = time.perf_counter()
+    for rec in records:
+        kind = rec[0]
+        if kind == "frame":
+            _, dt, held, pressed, ids = rec
+            for bit, name in bits:
+                input_sys.actions[name] = bool(held & bit)
+                input_sys._pressed_frame[name] = bool(pressed & bit)
+            for tid in ids:
+                events.publish(topics.get(tid, ""), {})
+            session.step_world(scene_manager, input_sys, events, dt)
+            frames += 1
+            game_ms += dt
+        elif kind == "topic":
+            topics[rec[1]] = rec[2]
+        elif kind == "reset":
+            _, seed, data = rec
+            session.apply_save(scene_manager, data.get("save"))
+            for k, v in (data.get("ui") or {}).items():
+                if k in _UI_FIELDS and v is not None:
+                    setattr(debug_ui, k, v)
+            reseed(seed)
+        elif kind == "check":
+            checks += 1
+            if state_digest(scene_manager) != rec[1]:
+                mismatches.append(frames)
+    wall = time.perf_counter() - t0
+    final = state_digest(scene_manager).hex() if scene_manager.world is not None else None
+    return {
+        "frames": frames,
+        "game_seconds": round(game_ms / 1000.0, 3),
+        "wall_seconds": round(wall, 3),
+        "fps": round(frames / wall, 1) if wall > 0 else None,
+        "digest": final,
+        "checks": checks,
+        "mismatched_at_frames": mismatches,
+        "match": checks > 0 and not mismatches,
+    }
@@ -1,25 +1,207 @@
 import json
+import numpy as np
 import pygame
 from typing import Dict, Callable, Optional, Any, List, Tuple
 
 from game.core.camera import Camera
 from game.config import Config
 from game.util.serialization import load_json
+from game.core.entity import EntityStore
+from game.core.records import Interactable, Kind, Trigger, by_kind, by_tag, load_records
+from game.scripts_common import spawn_crowds_from_json
+from game.systems.movement import collider_edges, integrate_entities, move_entities, wander_entities
+from game.systems.navigation import Navigator, NavGrid, roam_entities
+from game.systems.schedules import NpcAgent, schedules
+from game.util.rng import derive_seed
+from game.util.spatial import SpatialGrid
 
 
 class BaseScene:
+    # Menus receive raw pygame events via handle_event() and freeze the world clock.
+    # Overlays are menus drawn over a frozen copy of the last presented frame (`backdrop`).
+    is_menu = False
+    is_overlay = False
+
     def __init__(self, manager: "SceneManager"):
         self.manager = manager
         self.events = manager.events
         self.camera = Camera(viewport=(Config.WIDTH, Config.HEIGHT))
         self.name = self.__class__.__name__
         self.bounds = pygame.Rect(0, 0, Config.WIDTH, Config.HEIGHT)
-        self.entities: List[Dict[str, Any]] = []
+        # Dynamic entities (NPC crowds, animals, ...) in archetype storage; the player stays a dict
+        self.entities = EntityStore()
+        self.crowd_rng = np.random.default_rng(0)
+        self._collider_edges = collider_edges([])
+        self._collider_edges_version = -1
+        self.nav: Optional[Navigator] = None
         self.world_colliders: List[pygame.Rect] = []
-        self.interactables: List[Dict[str, Any]] = []
-        self.triggers: List[Dict[str, Any]] = []
+        self.interactables: List[Interactable] = []
+        self.triggers: List[Trigger] = []
+        # Interactables grouped by Kind and keyed by tag (see load_interactables)
+        self.kinds: Dict[Kind, List[Interactable]] = by_kind(())
+        self.tagged: Dict[str, Interactable] = {}
+        # Scheduled NPCs by id (see update_npcs) and named spots from the scene JSON
+        self.npcs: Dict[str, NpcAgent] = {}
+        self.spots: Dict[str, List[float]] = {}
+        self.npc_version = 0
         self.player: Optional[Dict[str, Any]] = None
         self.prompt_text: Optional[str] = None
+        # Bumped whenever static geometry (roads/buildings/colliders) changes so
+        # cached renderings such as the minimap can be rebuilt.
+        self.geometry_version = 0
+        self.backdrop: Optional[pygame.Surface] = None
+        # Static drawables by group, indexed lazily (see set_drawables/visible)
+        self._drawable_groups: Dict[str, List[Any]] = {}
+        self._draw_index: Dict[str, SpatialGrid] = {}
+        self._draw_index_version = -1
+        self._visible: Dict[Tuple[str, int], List[Any]] = {}
+        self._visible_key = None
+
+    def mark_geometry_dirty(self):
+        self.geometry_version += 1
+
+    def load_interactables(self, data: Dict[str, Any]):
+        # Typed records for the scene JSON's "interactables" and "triggers"
+        self.interactables = load_records(Interactable, data.get("interactables", []))
+        self.triggers = load_records(Trigger, data.get("triggers", []))
+        self.kinds = by_kind(self.interactables)
+        self.tagged = by_tag(self.interactables)
+        self.spots = dict(data.get("spots", {}))
+        self.npcs = {}
+        for it in self.kinds[Kind.NPC]:
+            npc_id = it.tag.split(".", 1)[-1]
+            if schedules.has(npc_id):
+                self.npcs[npc_id] = NpcAgent(npc_id, it)
+        if self.npcs:
+            from game.util.time_of_day import TimeOfDay
+            self.update_npcs(0.0, TimeOfDay.minutes)
+
+    @property
+    def static_interactables(self) -> List[Interactable]:
+        # Interactables that never move (scheduled NPCs are drawn from active_npcs() instead)
+        moving = [a.record for a in self.npcs.values()]
+        return [it for it in self.interactables if it not in moving]
+
+    def active_npcs(self) -> List[Interactable]:
+        return [a.record for a in self.npcs.values() if a.record.active]
+
+    @property
+    def scene_key(self) -> str:
+        # Scene name as used by scene changes, saves and schedules
+        data = getattr(self, "data", None)
+        return data.get("name", self.name.lower()) if data else self.name.lower()
+
+    def _spot_point(self, agent: NpcAgent, spot: Optional[str]):
+        point = self.spots.get(spot) if spot else None
+        return tuple(point) if point else agent.home
+
+    def update_npcs(self, dt: float, minutes: float):
+        """
+        Full-detail schedule simulation for this scene's NPCs: show/hide them as their block
+        enters or leaves the scene, place them on arrival and walk them between spots.
+        """
+        if not self.npcs:
+            return
+        scene = self.scene_key
+        pending = False
+        for agent in self.npcs.values():
+            blk = schedules.block_at(agent.id, minutes)
+            if blk is not agent.block:
+                here = blk.scene == scene
+                was_here = agent.block is not None and agent.record.active
+                agent.block = blk
+                if here and was_here:
+                    self._send_npc(agent, self._spot_point(agent, blk.spot))
+                elif here:
+                    agent.place(self._spot_point(agent, blk.spot))
+                else:
+                    agent.path = []
+                if agent.record.active != here:
+                    agent.record.active = here
+                    self.npc_version += 1
+            if agent.record.active and agent.path:
+                pending = pending or not isinstance(agent.path, list)
+                if agent.walk(dt, Config.NPC_WALK_SPEED, self.nav):
+                    self.npc_version += 1
+        if pending and self.nav is not None:
+            self.nav.poll()
+
+    def _send_npc(self, agent: NpcAgent, spot):
+        nav = self.navigator()
+        grid = nav.grid
+        agent.target = (float(spot[0]), float(spot[1]))
+        start = grid.nearest_walkable(grid.cell_at(*agent.pos))
+        goal = grid.nearest_walkable(grid.cell_at(*spot))
+        # Without a grid path walk straight there
+        agent.path = nav.request(start, goal) if start is not None and goal is not None else [agent.target]
+
+    def load_entities(self, data: Dict[str, Any]):
+        # Scene JSON "entities": [{"components": {"Transform": [x, y], "Collider": [w, h], ...}}]
+        # and "crowds" (wandering groups). Call after colliders and interactables are loaded.
+        self.entities.clear()
+        self.entities.spawn_from_json(data.get("entities", []))
+        # Crowds use their own random stream so they never shift gameplay RNG rolls
+        self.crowd_rng = np.random.default_rng(derive_seed(f"crowd.{self.name}"))
+        blocked = self.world_colliders + [it.rect for it in self.interactables] + [t.rect for t in self.triggers]
+        spawn_crowds_from_json(self.entities, data.get("crowds", []), blocked, self.crowd_rng)
+        if self.entities.query("Path"):
+            self.navigator()
+
+    def navigator(self) -> Navigator:
+        # Navigation grid baked from world_colliders on first use (kept current by colliders_changed)
+        if self.nav is None:
+            self.nav = Navigator(NavGrid.bake(self.bounds, self.world_colliders))
+        return self.nav
+
+    def colliders_changed(self, *areas: pygame.Rect):
+        # Call after editing world_colliders with the areas that changed (old and new rects)
+        if self.nav is not None:
+            for area in areas:
+                self.nav.grid.update_area(area, self.world_colliders)
+        self.mark_geometry_dirty()
+
+    def step_entities(self, dt: float):
+        # Wander, then move every entity in one batch (colliding with the world, each other and the player)
+        if not len(self.entities):
+            return
+        if self._collider_edges_version != self.geometry_version:
+            self._collider_edges = collider_edges(self.world_colliders)
+            self._collider_edges_version = self.geometry_version
+        wander_entities(self.entities, dt, self.crowd_rng)
+        if self.nav is not None:
+            roam_entities(self.entities, dt, self.crowd_rng, self.nav)
+            self.nav.poll()
+        obstacles = [self.player["rect"]] if self.player else None
+        move_entities(self.entities, dt, self._collider_edges, self.bounds, obstacles)
+        integrate_entities(self.entities, dt)
+
+    def set_drawables(self, **groups: List[Any]):
+        """
+        Register static drawables (Rects or dicts with a "rect") by group name, e.g.
+        set_drawables(roads=self.roads, buildings=self.buildings). The lists are indexed
+        in a SpatialGrid on first use and re-indexed after mark_geometry_dirty().
+        """
+        self._drawable_groups = dict(groups)
+        self._draw_index_version = -1
+
+    def visible(self, group: str, margin: int = 16) -> List[Any]:
+        # Drawables of `group` within the camera view (plus `margin` px for outlines/labels);
+        # cached until the camera moves or the geometry changes
+        if self._draw_index_version != self.geometry_version:
+            cell = getattr(Config, "SPATIAL_CELL_SIZE", 256)
+            self._draw_index = {name: SpatialGrid.from_items(items, cell) for name, items in self._drawable_groups.items()}
+            self._draw_index_version = self.geometry_version
+            self._visible_key = None
+        key = (tuple(self.camera.rect), self.geometry_version)
+        if key != self._visible_key:
+            self._visible = {}
+            self._visible_key = key
+        hits = self._visible.get((group, margin))
+        if hits is None:
+            grid = self._draw_index.get(group)
+            hits = grid.query(self.camera.rect.inflate(margin * 2, margin * 2)) if grid is not None else []
+            self._visible[(group, margin)] = hits
+        return hits
 
     def load(self):
         raise NotImplementedError
@@ -33,15 +215,83 @@ class BaseScene:
     def draw(self, surface: pygame.Surface):
         raise NotImplementedError
 
+    def is_animating(self) -> bool:
+        # True while the scene changes on screen without input (fades, timers, moving entities);
+        # blocks idle frame skipping
+        dialog = getattr(self, "dialog", None)
+        if dialog is not None and dialog.is_animating():
+            return True
+        # Scheduled NPCs walking between spots (or waiting on a path search); walks are short
+        # and NPCs few, so they count wherever they are
+        for agent in self.npcs.values():
+            if agent.record.active and agent.path:
+                return True
+        # Only movers inside the camera view count, so off-screen crowds don't keep frames coming
+        view = self.camera.rect
+        for arch in self.entities.query("Transform", "Velocity"):
+            pos = arch.column("Transform")
+            if "Collider" in arch.signature:
+                far = pos + arch.column("Collider")
+            else:
+                far = pos
+            shown = ((far[:, 0] > view.left) & (pos[:, 0] < view.right)
+                     & (far[:, 1] > view.top) & (pos[:, 1] < view.bottom))
+            if (shown & (arch.column("Velocity") != 0.0).any(axis=1)).any():
+                return True
+        return False
+
+    def input_context(self) -> str:
+        # Input context while this scene has focus; scenes with a DialogueUI switch to "dialog"
+        dialog = getattr(self, "dialog", None)
+        if dialog is not None and dialog.is_active():
+            return "dialog"
+        return "gameplay"
+
+    def wake_in_ms(self) -> Optional[float]:
+        # How soon the scene will change on its own while idle (None: only on input)
+        return None
+
+    def handle_event(self, event: pygame.event.Event):
+        pass
+
+    # Dirty-rect rendering (Config.DIRTY_RECTS). Scenes that opt in split draw() into a
+    # static layer cached by DirtyRectRenderer, a dynamic layer drawn under the day/night
+    # tint and an overlay layer drawn above it, and report the screen rects they cover.
+    supports_dirty_rects = False
+
+    def static_key(self):
+        # Anything that changes the cached static layer must change this key
+        return (self.camera.rect.topleft, self.geometry_version, self.npc_version)
+
+    def draw_static(self, surface: pygame.Surface):
+        raise NotImplementedError
+
+    def draw_dynamic(self, surface: pygame.Surface):
+        raise NotImplementedError
+
+    def draw_overlay(self, surface: pygame.Surface):
+        pass
+
+    def dirty_rects(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        return []
+
     def unload(self):
         pass
 
+    def dispose(self):
+        # Called by SceneManager after unload(); releases resources subclasses don't manage
+        if self.nav is not None:
+            self.nav.close()
+
 
 class SceneManager:
     def __init__(self, events: "EventBus"):
         self.events = events
         self._registry: Dict[str, Callable[["SceneManager"], BaseScene]] = {}
         self._stack: List[BaseScene] = []
+        # Bumped by reset(): the world was replaced wholesale (new game, load) rather than
+        # reached through gameplay
+        self.generation = 0
         self.events.subscribe("scene.change", self._on_scene_change)
 
     def register(self, name: str, scene_cls: Callable[["SceneManager"], BaseScene]):
@@ -49,6 +299,11 @@ class SceneManager:
 
     def push(self, name: str, payload: Optional[Dict[str, Any]] = None):
         scene = self._create_scene(name)
+        if scene.is_overlay:
+            # Freeze the last presented frame so the overlay never repaints the world
+            display = pygame.display.get_surface()
+            if display is not None:
+                scene.backdrop = display.copy()
         scene.load()
         scene.enter(payload)
         self._stack.append(scene)
@@ -57,12 +312,23 @@ class SceneManager:
         if self._stack:
             old = self._stack.pop()
             old.unload()
+            old.dispose()
         self.push(name, payload)
 
     def pop(self):
         if self._stack:
             old = self._stack.pop()
             old.unload()
+            old.dispose()
+
+    def reset(self, name: str, payload: Optional[Dict[str, Any]] = None):
+        # Unload the whole stack (world and menus) and start over with a single scene
+        while self._stack:
+            old = self._stack.pop()
+            old.unload()
+            old.dispose()
+        self.generation += 1
+        self.push(name, payload)
 
     def _create_scene(self, name: str) -> BaseScene:
         if name not in self._registry:
@@ -81,6 +347,25 @@ class SceneManager:
         if self._stack:
             self._stack[-1].draw(surface)
 
+    def is_animating(self) -> bool:
+        return bool(self._stack) and self._stack[-1].is_animating()
+
+    def handle_event(self, event: pygame.event.Event):
+        if self._stack:
+            self._stack[-1].handle_event(event)
+
     @property
     def current(self) -> Optional[BaseScene]:
         return self._stack[-1] if self._stack else None
+
+    @property
+    def menu_active(self) -> bool:
+        return bool(self._stack) and self._stack[-1].is_menu
+
+    @property
+    def world(self) -> Optional[BaseScene]:
+        # Topmost gameplay scene, even while menus are stacked above it
+        for scene in reversed(self._stack):
+            if not scene.is_menu:
+                return scene
+        return None
@@ -0,0 +1,121 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from game.config import Config
+from game.util.exploration import update_exploration
+from game.systems.quests import quests
+from game.systems.schedules import schedules
+from game.systems.world_sim import world_sim
+from game.util.save import delete_save
+from game.util.state import GameState
+from game.util.time_of_day import TimeOfDay
+
+
+# Save/load/new-game helpers and the world step, shared by the menus, the main loop and replays
+
+
+def register_world_scenes(scene_manager):
+    from game.scenes.town import TownScene
+    from game.scenes.home_interior import HomeInteriorScene
+    from game.scenes.farmland import FarmlandScene
+    from game.scenes.shop_interior import ShopInteriorScene
+    scene_manager.register("town", TownScene)
+    scene_manager.register("home_interior", HomeInteriorScene)
+    scene_manager.register("farmland", FarmlandScene)
+    scene_manager.register("shop_interior", ShopInteriorScene)
+
+
+def step_world(scene_manager, input_sys, events, dt: float):
+    """Advance the world by one frame from the current Input state."""
+    # Debug: time skip by 8 hours when F5 pressed
+    if input_sys.was_pressed("TIME_SKIP"):
+        TimeOfDay.add_minutes(8 * 60)
+    # Debug: add +100 coins when F6 pressed
+    if input_sys.was_pressed("COINS_PLUS"):
+        try:
+            GameState.coins += 100
+            events.publish("ui.notify", {"text": "+100 Coins"})
+        except Exception:
+            pass
+    # Debug: give Wooden Sword when F9 pressed
+    if input_sys.was_pressed("GIVE_SWORD"):
+        try:
+            GameState.add_item("wooden_sword", 1)
+            events.publish("ui.notify", {"text": "+1 Wooden Sword"})
+        except Exception:
+            pass
+
+    # Advance time-of-day by the whole frame, then update scene (and its scheduled NPCs; others
+    # on coarse ticks) with a clamped step so the frame after an idle wait can't tunnel movers
+    TimeOfDay.advance_ms(dt)
+    step = min(dt, Config.MAX_STEP_MS)
+    scene_manager.update(step, input_sys)
+    schedules.tick(TimeOfDay.minutes)
+    if scene_manager.current is not None:
+        scene_manager.current.update_npcs(step, TimeOfDay.minutes)
+    # Persistent state of the scenes that aren't loaded (growth, restocks, ...)
+    world = scene_manager.world
+    world_sim.advance(TimeOfDay.minutes, world.scene_key if world is not None else None, scene_manager.generation)
+    # Re-evaluate quests whose flags/items changed this frame ("quest.updated" for the UI)
+    quests.flush(events)
+    update_exploration(scene_manager.current)
+
+
+def current_scene_name(scene_manager) -> str:
+    curr = scene_manager.world
+    if curr is None:
+        return "town"
+    return curr.data.get("name", curr.name.lower()) if getattr(curr, "data", None) else curr.name.lower()
+
+
+def default_save_name(scene_manager) -> str:
+    return f"{current_scene_name(scene_manager)} {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+
+
+def build_save_dict(scene_manager) -> Dict[str, Any]:
+    # Compose full state for v1.0 save. We don't persist a spawn name for arbitrary positions.
+    curr = scene_manager.world
+    player_pos = None
+    if curr and curr.player:
+        pr = curr.player["rect"]
+        player_pos = [pr.x, pr.y]
+    return {
+        "scene": current_scene_name(scene_manager) if curr else "town",
+        "spawn": None if curr else "start",
+        "player_pos": player_pos,
+        "time_minutes": TimeOfDay.minutes,
+        "day": getattr(TimeOfDay, 'day', 1),
+        "game_state": GameState.to_dict(),
+    }
+
+
+def apply_save(scene_manager, save: Optional[Dict[str, Any]]):
+    """Restore GameState/TimeOfDay from a loaded save and replace the whole scene stack."""
+    save = save or {}
+    if save.get("game_state"):
+        GameState.from_dict(save.get("game_state"))
+    if save.get("time_minutes") is not None:
+        TimeOfDay.minutes = float(save.get("time_minutes", TimeOfDay.minutes))
+    if save.get("day") is not None:
+        try:
+            TimeOfDay.day = int(save.get("day", getattr(TimeOfDay, 'day', 1)))
+        except Exception:
+            TimeOfDay.day = 1
+    scene_manager.reset(save.get("scene") or "town", payload={
+        "spawn": save.get("spawn", "start"),
+        "player_pos": save.get("player_pos"),
+    })
+
+
+def start_new_game(scene_manager, player_name: str, race: str):
+    GameState.reset_defaults()
+    GameState.player_name = player_name.strip()
+    GameState.apply_race(race)
+    try:
+        # Reset day to start at Day 1 after set_morning()
+        TimeOfDay.day = 0
+    except Exception:
+        pass
+    TimeOfDay.set_morning()
+    delete_save()
+    scene_manager.reset("town", payload={"spawn": "start"})
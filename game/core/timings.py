@@ -1,4 +1,7 @@
 import pygame
+from typing import List, Optional
+
+from game.config import Config
 
 
 class Clock:
@@ -6,6 +9,60 @@ class Clock:
         self.clock = pygame.time.Clock()
         self.target_fps = target_fps
 
-    def tick(self) -> float:
-        ms = self.clock.tick(self.target_fps)
+    def tick(self, target_fps: Optional[int] = None) -> float:
+        ms = self.clock.tick(self.target_fps if target_fps is None else target_fps)
         return max(1, ms)  # milliseconds elapsed (avoid zero)
+
+
+# Window events that invalidate what is on screen
+_EXPOSE_EVENTS = tuple(
+    getattr(pygame, name) for name in ("VIDEOEXPOSE", "WINDOWEXPOSED", "WINDOWRESTORED", "WINDOWSHOWN", "WINDOWFOCUSGAINED")
+    if hasattr(pygame, name)
+)
+
+
+class FramePacer:
+    """
+    Tracks window focus/minimize state and lets loops block instead of spinning
+    when nothing needs to be drawn.
+      - Unfocused windows run at Config.UNFOCUSED_FPS.
+      - Minimized windows skip rendering and wake every Config.MINIMIZED_WAIT_MS.
+      - wait(timeout) blocks on pygame.event.wait and returns the pending events.
+    """
+    def __init__(self, target_fps: int = 60):
+        self.target_fps = target_fps
+        self.focused = True
+        self.minimized = False
+        # Set by expose/restore events; cleared by the caller after it redraws
+        self.needs_redraw = True
+
+    def fps(self) -> int:
+        if self.minimized or not self.focused:
+            return int(getattr(Config, "UNFOCUSED_FPS", 10))
+        return self.target_fps
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """Update focus state from a window event. Returns True if the event was consumed."""
+        t = event.type
+        if t == getattr(pygame, "WINDOWFOCUSLOST", -1):
+            self.focused = False
+        elif t == getattr(pygame, "WINDOWFOCUSGAINED", -1):
+            self.focused = True
+        elif t == getattr(pygame, "WINDOWMINIMIZED", -1):
+            self.minimized = True
+        elif t in (getattr(pygame, "WINDOWRESTORED", -1), getattr(pygame, "WINDOWSHOWN", -1)):
+            self.minimized = False
+        elif t not in _EXPOSE_EVENTS:
+            return False
+        if t in _EXPOSE_EVENTS:
+            self.needs_redraw = True
+        return True
+
+    def wait(self, timeout_ms: float) -> List[pygame.event.Event]:
+        """Block until an event arrives or timeout_ms elapses; return all pending events."""
+        if self.minimized:
+            timeout_ms = max(timeout_ms, float(getattr(Config, "MINIMIZED_WAIT_MS", 250)))
+        ev = pygame.event.wait(max(1, int(timeout_ms)))
+        events = [] if ev.type == pygame.NOEVENT else [ev]
+        events.extend(pygame.event.get())
+        return events
@@ -2,6 +2,7 @@ import pygame
 from typing import Optional
 
 from game.config import Config
+from game.systems.notifications import NotificationFeed
 
 
 class DebugUI:
@@ -12,7 +13,7 @@ class DebugUI:
         self.journal_visible = False
         self.character_visible = False
         self.help_visible = False
-        self.notifications = []  # list of {text:str, t0:int}
+        self.notifications = NotificationFeed()
         events.subscribe("ui.debug.toggle", self._toggle)
         events.subscribe("ui.minimap.toggle", self._toggle_minimap)
         events.subscribe("ui.inventory.toggle", self._toggle_inventory)
@@ -26,11 +27,19 @@ class DebugUI:
         self._inv_font = None
         # Inventory navigation state
         self._inv_selection = 0
-        # Subscribe to simple navigation events (published by Input)
+        # Minimap caches: baked static layer per scene and resolved quest waypoint
+        self._minimap_cache = None  # {scene, key, surface, rect, sx, sy, plots}
+        self._minimap_waypoint = None  # {scene, key, rect}
+        self._minimap_fog = None  # {map, cache, surface, applied (reveal cursor)}
+        # Journal rows rendered from the quest log, rebuilt on quest.updated
+        self._journal_rows = None  # {width, rows: [(surface, gap)]}
+        events.subscribe("quest.updated", self._on_quest_updated)
+        # Navigation events, published by Input only while a panel is open
         events.subscribe("ui.nav.up", self._on_nav_up)
         events.subscribe("ui.nav.down", self._on_nav_down)
         events.subscribe("ui.nav.confirm", self._on_nav_confirm)
         events.subscribe("ui.nav.alt", self._on_nav_alt)
+        events.subscribe("ui.panel.close", self._close_panels)
         self._events = events
 
     def _toggle(self, _):
@@ -79,12 +88,27 @@ class DebugUI:
             self.character_visible = False
             self.visible = False
 
+    def _close_panels(self, _):
+        self.inventory_visible = False
+        self.journal_visible = False
+        self.character_visible = False
+        self.help_visible = False
+
+    def _on_quest_updated(self, payload):
+        # Journal text and the waypoint target follow quest stages
+        self._journal_rows = None
+        self._minimap_waypoint = None
+
+    def panel_open(self) -> bool:
+        # A full-screen panel has keyboard focus (input "panel" context)
+        return self.inventory_visible or self.journal_visible or self.character_visible or self.help_visible
+
     def _on_notify(self, payload):
         # payload: {text: str}
         try:
             text = str(payload.get("text", "")).strip()
             if text:
-                self.notifications.append({"text": text, "t0": pygame.time.get_ticks()})
+                self.notifications.push(text, pygame.time.get_ticks())
         except Exception:
             pass
 
@@ -117,12 +141,32 @@ class DebugUI:
             for r in curr.world_colliders:
                 pygame.draw.rect(screen, Config.COLORS.get("collider", (0,255,0)), curr.camera.apply(r), 1)
             for t in curr.triggers:
-                pygame.draw.rect(screen, Config.COLORS.get("trigger", (255,0,0)), curr.camera.apply(t["rect"]), 1)
+                pygame.draw.rect(screen, Config.COLORS.get("trigger", (255,0,0)), curr.camera.apply(t.rect), 1)
         
         # Minimap overlay
         if self.minimap_visible and curr:
             self._draw_minimap(screen, curr)
 
+    def is_animating(self) -> bool:
+        # Notifications expire over time and the debug panel shows a live FPS readout
+        return bool(self.notifications) or self.visible
+
+    def dirty_rects(self, screen: pygame.Surface, scene_manager):
+        """
+        Screen areas draw() will touch this frame, for dirty-rect presentation.
+        Returns None when a full-screen panel is open and the whole frame must be redrawn.
+        """
+        if self.visible or self.panel_open():
+            return None
+        rects = [pygame.Rect(0, 0, screen.get_width(), 44)]
+        if self.notifications:
+            count = len(self.notifications.visible())
+            rects.append(pygame.Rect(0, 50, screen.get_width(), count * (self.notifications.row_height() + 1)))
+        curr = scene_manager.current
+        if self.minimap_visible and curr:
+            rects.append(self._minimap_layout(screen, curr))
+        return rects
+
     def _inventory_entries(self):
         try:
             from game.util.state import GameState
@@ -285,24 +329,8 @@ class DebugUI:
         screen.blit(r_surf, (rx, ry))
 
     def _draw_notifications(self, screen: pygame.Surface):
-        # Draw recent notifications at top-center stacking downward
-        now = pygame.time.get_ticks()
-        duration_ms = 2000
-        # prune expired
-        self.notifications = [n for n in self.notifications if now - n.get('t0', 0) <= duration_ms]
-        if not self.notifications:
-            return
-        if self._hud_font is None:
-            self._hud_font = pygame.font.SysFont("arial", 18)
-        y = 50
-        for n in self.notifications[-4:]:  # show up to last 4
-            msg = str(n.get("text", ""))
-            txt = self._hud_font.render(msg, True, (255, 255, 180))
-            sh = self._hud_font.render(msg, True, (0, 0, 0))
-            x = (screen.get_width() - txt.get_width()) // 2
-            screen.blit(sh, (x + 1, y + 1))
-            screen.blit(txt, (x, y))
-            y += txt.get_height() + 4
+        # Cached per-message surfaces, coalesced and faded by the feed
+        self.notifications.draw(screen, pygame.time.get_ticks())
 
     def _draw_inventory(self, screen: pygame.Surface):
         # Centered large panel with selectable items and equip/unequip actions
@@ -387,17 +415,26 @@ class DebugUI:
         title = self._inv_font.render("Journal", True, (255, 255, 255))
         screen.blit(title, (x + margin_x, y + margin_y))
 
-        # Fetch quest state
-        try:
-            from game.util.state import GameState
-            started = bool(GameState.flags.get("quest_started", False))
-            completed = bool(GameState.flags.get("quest_completed", False))
-        except Exception:
-            started = False
-            completed = False
-
-        # Word-wrap helper
-        def wrap_text(text: str, font: pygame.font.Font, max_width: int):
+        max_width = panel_w - margin_x * 2
+        cached = self._journal_rows
+        if cached is None or cached["width"] != max_width:
+            cached = self._journal_rows = {"width": max_width, "rows": self._build_journal_rows(max_width, text_color, header_color)}
+        y_text = y + margin_y + title.get_height() + 6
+        # Keep 10px bottom margin
+        max_text_y = y + panel_h - 10
+        for surf, gap in cached["rows"]:
+            y_text += gap
+            if y_text + surf.get_height() > max_text_y:
+                break
+            screen.blit(surf, (x + margin_x, y_text))
+            y_text += surf.get_height() + 2
+
+    def _build_journal_rows(self, max_width: int, text_color, header_color):
+        # Word-wrapped, pre-rendered journal lines for every quest with journal text
+        from game.systems.quests import quests
+        font = self._inv_font
+
+        def wrap_text(text: str, max_width: int):
             words = text.split(" ")
             lines = []
             cur = ""
@@ -427,51 +464,26 @@ class DebugUI:
                 lines.append(cur)
             return lines
 
-        y_text = y + margin_y + title.get_height() + 6
-
-        # Header
-        header = self._inv_font.render("Farmer's Request", True, header_color)
-        screen.blit(header, (x + margin_x, y_text))
-        y_text += header.get_height() + 4
-
-        # Content lines based on quest state
-        if not started:
-            base_lines = [
-                "- Talk to the Farmer in town.",
-                "- He needs a bag of seeds from the shop.",
-            ]
-            status = "Status: Not started"
-        elif not completed:
-            base_lines = [
-                "- Bring 1x seeds to the Farmer.",
-                "- Reward: Boots, 5 coins, 50 XP",
-            ]
-            status = "Status: In progress"
-        else:
-            base_lines = [
-                "- Quest completed.",
-            ]
-            status = "Status: Completed ✓"
-
-        # Available vertical space before the status area (keep 26px for status/margin)
-        max_text_y = y + panel_h - 26
-        max_width = panel_w - margin_x * 2
-        for src in base_lines:
-            for wrapped in wrap_text(src, self._inv_font, max_width):
-                if y_text + self._inv_font.get_height() > max_text_y:
-                    break
-                ln = self._inv_font.render(wrapped, True, text_color)
-                screen.blit(ln, (x + margin_x, y_text))
-                y_text += ln.get_height() + 2
-
-        # Status at the bottom (wrap if needed)
-        status_lines = wrap_text(status, self._inv_font, max_width)
-        total_h = sum(self._inv_font.size(s)[1] + 2 for s in status_lines) - 2
-        y_status = y + panel_h - total_h - 10
-        for s in status_lines:
-            st = self._inv_font.render(s, True, (180, 220, 180) if completed else text_color)
-            screen.blit(st, (x + margin_x, y_status))
-            y_status += st.get_height() + 2
+        rows = []
+        try:
+            entries = quests.journal()
+        except Exception:
+            entries = []
+        for n, (quest, stage) in enumerate(entries):
+            rows.append((font.render(quest.title, True, header_color), 12 if n else 0))
+            gap = 2
+            for src in stage.journal:
+                for wrapped in wrap_text(src, max_width):
+                    rows.append((font.render(wrapped, True, text_color), gap))
+                    gap = 0
+            status_color = (180, 220, 180) if stage.done else text_color
+            gap = 4
+            for wrapped in wrap_text(f"Status: {stage.status}", max_width):
+                rows.append((font.render(wrapped, True, status_color), gap))
+                gap = 0
+        if not rows:
+            rows.append((font.render("No quests yet.", True, text_color), 0))
+        return rows
 
     def _draw_character(self, screen: pygame.Surface):
         # Centered large character panel
@@ -608,7 +620,9 @@ class DebugUI:
             "Debug — Toggle Overlay: F1",
             "Debug — Time Skip +8h: F5",
             "Debug — +100 Coins: F6",
+            "Debug — Rewind 5s: F7",
             "Debug — Give Wooden Sword: F9",
+            "Record clip (start/stop): F10",
         ]
 
         y_text = y + margin_y + title.get_height() + 10
@@ -736,94 +750,182 @@ class DebugUI:
                 screen.blit(ln, (x + margin_x, y_text))
                 y_text += ln.get_height() + 6
 
-    def _draw_minimap(self, screen: pygame.Surface, curr):
-        # Config
+    def _minimap_layout(self, screen: pygame.Surface, curr):
+        # Minimap size keeps the aspect ratio of world bounds
         mini_w = 180
-        # keep aspect ratio of world bounds
         bounds = curr.bounds
-        if bounds.width <= 0 or bounds.height <= 0:
-            return
         aspect = bounds.height / max(1, bounds.width)
         mini_h = int(mini_w * aspect)
         mini_h = max(90, min(mini_h, 140))
         margin = 8
-        x0 = margin
-        y0 = screen.get_height() - mini_h - margin
+        return pygame.Rect(margin, screen.get_height() - mini_h - margin, mini_w, mini_h)
 
-        # Background panel
-        panel = pygame.Surface((mini_w, mini_h), pygame.SRCALPHA)
-        panel.fill((0, 0, 0, 140))
-        screen.blit(panel, (x0, y0))
+    def _bake_minimap(self, screen: pygame.Surface, curr):
+        # Render the static part of the minimap (panel, roads, buildings, label) once per scene/geometry
+        area = self._minimap_layout(screen, curr)
+        bounds = curr.bounds
+        sx = area.width / float(bounds.width)
+        sy = area.height / float(bounds.height)
 
-        # Scale factors
-        sx = mini_w / float(bounds.width)
-        sy = mini_h / float(bounds.height)
+        def world_to_local(rect: pygame.Rect) -> pygame.Rect:
+            mx = int((rect.x - bounds.x) * sx)
+            my = int((rect.y - bounds.y) * sy)
+            mw = max(1, int(rect.width * sx))
+            mh = max(1, int(rect.height * sy))
+            return pygame.Rect(mx, my, mw, mh)
+
+        surf = pygame.Surface(area.size, pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 140))
+        # Roads (if any)
+        for r in getattr(curr, 'roads', []) or []:
+            pygame.draw.rect(surf, (160, 160, 160), world_to_local(r))
+        # Buildings (if any), otherwise colliders
+        for b in getattr(curr, 'buildings', []) or curr.world_colliders:
+            pygame.draw.rect(surf, (120, 120, 180), world_to_local(b))
+        # Label
+        if self._mini_font is None:
+            self._mini_font = pygame.font.SysFont("consolas", 12)
+        name = getattr(curr, 'data', {}).get('name') if getattr(curr, 'data', None) else curr.name.lower()
+        label = self._mini_font.render(str(name), True, (220, 220, 220))
+        surf.blit(label, (4, 4))
+        # Plot geometry is static; only its state colour changes per frame
+        plots = []
+        for p in getattr(curr, 'plots', None) or []:
+            rect = getattr(p, 'rect', None)
+            if rect is not None:
+                plots.append((p, world_to_local(rect).move(area.x, area.y)))
+        return {
+            "scene": curr,
+            "key": (curr.geometry_version, screen.get_size()),
+            "surface": surf,
+            "rect": area,
+            "sx": sx,
+            "sy": sy,
+            "origin": bounds.topleft,
+            "plots": plots,
+        }
+
+    def _update_minimap_fog(self, curr, cache):
+        # Fog surface masking unexplored cells; cleared incrementally from the exploration log
+        try:
+            from game.util.state import GameState
+            name = curr.data.get("name") if getattr(curr, "data", None) else curr.name.lower()
+            GameState.ensure_loaded("exploration")
+            emap = GameState.exploration.get(name)
+        except Exception:
+            emap = None
+        if emap is None:
+            return None
+        fog = self._minimap_fog
+        if fog is None or fog["map"] is not emap or fog["cache"] is not cache:
+            surf = pygame.Surface(cache["rect"].size, pygame.SRCALPHA)
+            surf.fill((0, 0, 0, 200))
+            fog = self._minimap_fog = {"map": emap, "cache": cache, "surface": surf, "applied": emap.revealed}
+            for cx, cy in emap.iter_explored():
+                self._clear_fog_cell(fog, cx, cy)
+        if fog["applied"] < emap.revealed:
+            new = emap.reveals_since(fog["applied"])
+            if new is None:
+                # Log was dropped while the minimap was hidden: rebuild from the bits
+                self._minimap_fog = None
+                return self._update_minimap_fog(curr, cache)
+            cols = emap.cols
+            for i in new:
+                self._clear_fog_cell(fog, i % cols, i // cols)
+            fog["applied"] = emap.revealed
+        emap.trim(fog["applied"])
+        return fog["surface"]
+
+    def _clear_fog_cell(self, fog, cx: int, cy: int):
+        cache = fog["cache"]
+        emap = fog["map"]
+        cs = emap.cell_size
+        sx, sy = cache["sx"], cache["sy"]
+        # Map cells start at the map origin; the minimap starts at the scene bounds origin
+        ox, oy = emap.x - cache["origin"][0], emap.y - cache["origin"][1]
+        x0 = int((ox + cx * cs) * sx)
+        y0 = int((oy + cy * cs) * sy)
+        x1 = int((ox + (cx + 1) * cs) * sx + 0.999)
+        y1 = int((oy + (cy + 1) * cs) * sy + 0.999)
+        fog["surface"].fill((0, 0, 0, 0), pygame.Rect(x0, y0, max(1, x1 - x0), max(1, y1 - y0)))
+
+    def _minimap_target_tag(self) -> Optional[str]:
+        # Quest waypoint: the tracked quest's current stage target (see game/data/quests.json)
+        from game.systems.quests import quests
+        return quests.target()
+
+    def _resolve_waypoint(self, curr) -> Optional[pygame.Rect]:
+        # Resolve the target only when the scene, quest state or the target's scene changes;
+        # targets in other scenes point at the exit that starts the route there
+        from game.systems.scene_graph import scene_graph
+        try:
+            tag = self._minimap_target_tag()
+        except Exception:
+            tag = None
+        cached = self._minimap_waypoint
+        if cached is None or cached["scene"] is not curr:
+            scene_graph.refresh()  # scene data may have changed (checked per scene, not per frame)
+        where = scene_graph.locate(tag) if tag else None
+        key = (tag, where, scene_graph.version)
+        if cached is not None and cached["scene"] is curr and cached["key"] == key:
+            return cached["rect"]
+        tgt_rect = None
+        if tag:
+            try:
+                tgt_rect = scene_graph.waypoint(curr, tag)
+            except Exception:
+                tgt_rect = None
+        if not isinstance(tgt_rect, pygame.Rect):
+            tgt_rect = None
+        self._minimap_waypoint = {"scene": curr, "key": key, "rect": tgt_rect}
+        return tgt_rect
+
+    def _draw_minimap(self, screen: pygame.Surface, curr):
+        bounds = curr.bounds
+        if bounds.width <= 0 or bounds.height <= 0:
+            return
+        cache = self._minimap_cache
+        if cache is None or cache["scene"] is not curr or cache["key"] != (curr.geometry_version, screen.get_size()):
+            cache = self._minimap_cache = self._bake_minimap(screen, curr)
+        area: pygame.Rect = cache["rect"]
+        sx, sy = cache["sx"], cache["sy"]
+        screen.blit(cache["surface"], area.topleft)
 
         def world_to_mini_rect(rect: pygame.Rect) -> pygame.Rect:
-            # map world-space rect to minimap local space
+            # map world-space rect to minimap screen space
             mx = int((rect.x - bounds.x) * sx)
             my = int((rect.y - bounds.y) * sy)
             mw = max(1, int(rect.width * sx))
             mh = max(1, int(rect.height * sy))
-            return pygame.Rect(x0 + mx, y0 + my, mw, mh)
-
-        # Draw roads (if any)
-        roads = getattr(curr, 'roads', []) or []
-        for r in roads:
-            pygame.draw.rect(screen, (160, 160, 160), world_to_mini_rect(r))
-        # Draw buildings (if any)
-        buildings = getattr(curr, 'buildings', []) or curr.world_colliders
-        for b in buildings:
-            pygame.draw.rect(screen, (120, 120, 180), world_to_mini_rect(b))
-        # Farmland plots (distinct color) if present on scene
-        plots = getattr(curr, 'plots', None)
-        if plots:
-            for p in plots:
-                rect = p.get('rect') if isinstance(p, dict) else None
-                if rect is None:
-                    continue
-                pygame.draw.rect(screen, (180, 140, 60), world_to_mini_rect(rect))
-                pygame.draw.rect(screen, (50, 35, 15), world_to_mini_rect(rect), 1)
+            return pygame.Rect(area.x + mx, area.y + my, mw, mh)
+
+        # Farmland plots, coloured by current state
+        if cache["plots"]:
+            colors = {
+                "untilled": Config.COLORS.get("soil_untilled", (130, 105, 70)),
+                "tilled": Config.COLORS.get("soil_tilled", (110, 85, 55)),
+                "planted": Config.COLORS.get("soil_planted", (60, 130, 60)),
+                "ready": Config.COLORS.get("soil_ready", (200, 170, 60)),
+            }
+            for p, mr in cache["plots"]:
+                pygame.draw.rect(screen, colors.get(p.state, (180, 140, 60)), mr)
+                pygame.draw.rect(screen, (50, 35, 15), mr, 1)
+        # Fog of war over unexplored cells
+        if getattr(Config, "FOG_OF_WAR", True):
+            fog = self._update_minimap_fog(curr, cache)
+            if fog is not None:
+                screen.blit(fog, area.topleft)
         # Player dot
         if curr.player:
             pr: pygame.Rect = curr.player["rect"]
             pdot = pygame.Rect(pr.centerx - 2, pr.centery - 2, 4, 4)
             pygame.draw.rect(screen, (255, 235, 120), world_to_mini_rect(pdot))
 
-        # Quest waypoint marker (MVP): Farmer quest guidance in Town
-        try:
-            from game.util.state import GameState
-            # Decide current target tag
-            target_tag = None
-            if not GameState.flags.get("quest_completed", False):
-                if not GameState.flags.get("quest_started", False):
-                    target_tag = "npc.farmer"
-                else:
-                    # Quest started
-                    if GameState.has_item("seeds", 1):
-                        target_tag = "npc.farmer"
-                    else:
-                        target_tag = "door.shop"
-            if target_tag:
-                # Find matching interactable on current scene
-                tgt_rect = None
-                for it in getattr(curr, 'interactables', []) or []:
-                    if str(it.get('tag', '')) == target_tag:
-                        tgt_rect = it.get('rect')
-                        break
-                if isinstance(tgt_rect, pygame.Rect):
-                    # Draw a small red marker centered on target
-                    cx, cy = tgt_rect.centerx, tgt_rect.centery
-                    marker_world = pygame.Rect(cx - 3, cy - 3, 6, 6)
-                    mr = world_to_mini_rect(marker_world)
-                    pygame.draw.rect(screen, (255, 80, 80), mr)
-                    pygame.draw.rect(screen, (0, 0, 0), mr, 1)
-        except Exception:
-            pass
-
-        # Optional label
-        if self._mini_font is None:
-            self._mini_font = pygame.font.SysFont("consolas", 12)
-        name = getattr(curr, 'data', {}).get('name') if getattr(curr, 'data', None) else curr.name.lower()
-        label = self._mini_font.render(str(name), True, (220, 220, 220))
-        screen.blit(label, (x0 + 4, y0 + 4))
+        # Quest waypoint marker
+        tgt_rect = self._resolve_waypoint(curr)
+        if tgt_rect is not None:
+            # Draw a small red marker centered on target
+            marker_world = pygame.Rect(tgt_rect.centerx - 3, tgt_rect.centery - 3, 6, 6)
+            mr = world_to_mini_rect(marker_world)
+            pygame.draw.rect(screen, (255, 80, 80), mr)
+            pygame.draw.rect(screen, (0, 0, 0), mr, 1)
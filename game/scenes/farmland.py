@@ -6,8 +6,12 @@ from game.core.scene import BaseScene
 from game.scripts_common import spawn_player_from_json
 from game.systems.movement import move_player
 from game.systems.interaction import handle_interaction
-from game.systems.render import draw_world, draw_prompt, draw_day_night_tint, draw_clock
+from game.systems.render import (
+    LAYER_DECOR, LAYER_GROUND, RenderQueue, draw_clock, draw_day_night_tint, draw_prompt, submit_entities,
+    submit_world,
+)
 from game.util.serialization import load_json
+from game.core.records import Plot, load_records
 
 
 class FarmlandScene(BaseScene):
@@ -16,10 +20,11 @@ class FarmlandScene(BaseScene):
         self.data = None
         self.fences = []
         # Farming
-        self.plots = []  # list of dicts: {id, rect, state, planted_minutes}
+        self.plots = []  # Plot records
         self._closest_plot = None
         # configurable via Config, fallback to previous default (5h)
         self._growth_minutes_required = getattr(Config, "FARM_GROWTH_MINUTES", 300.0)
+        self.render_queue = RenderQueue()
 
     def load(self):
         self.data = load_json(f"{Config.SCENES_DIR}/farmland.json")
@@ -30,33 +35,30 @@ class FarmlandScene(BaseScene):
         self.world_colliders = [pygame.Rect(*c["rect"]) for c in self.data.get("colliders", [])]
         self.fences = [pygame.Rect(*c["rect"]) for c in self.data.get("colliders", [])]
         # Interactables (none for MVP)
-        self.interactables = [{**i, "rect": pygame.Rect(*i["rect"])} for i in self.data.get("interactables", [])]
-        # Triggers (south edge back to town)
-        self.triggers = [{**t, "rect": pygame.Rect(*t["rect"])} for t in self.data.get("triggers", [])]
+        # Interactables (none for MVP) and triggers (south edge back to town)
+        self.load_interactables(self.data)
+        self.load_entities(self.data)
         # Plots
-        self.plots = []
-        for p in self.data.get("plots", []):
-            self.plots.append({
-                "id": p.get("id"),
-                "rect": pygame.Rect(*p["rect"]),
-                "state": "untilled",  # untilled|tilled|planted|ready
-                "planted_minutes": None,
-            })
-        # Restore persisted plot states if available
+        self.plots = load_records(Plot, self.data.get("plots", []))
+        # Restore persisted plot states if available (caught up to now first)
         try:
+            from game.systems.world_sim import world_sim
             from game.util.state import GameState
+            GameState.ensure_loaded("farming_plots")
+            world_sim.catch_up("farmland")
             persisted = getattr(GameState, 'farming_plots', {}) or {}
             for plot in self.plots:
-                pid = plot.get('id')
+                pid = plot.id
                 if pid and pid in persisted:
                     entry = persisted[pid] or {}
                     # Only apply known fields safely
                     st = entry.get('state')
                     if st in ("untilled", "tilled", "planted", "ready"):
-                        plot["state"] = st
-                    plot["planted_minutes"] = entry.get('planted_minutes', plot["planted_minutes"])
+                        plot.state = st
+                    plot.planted_minutes = entry.get('planted_minutes', plot.planted_minutes)
         except Exception:
             pass
+        self.set_drawables(plots=self.plots, fences=self.fences)
 
     def enter(self, payload: Dict[str, Any] | None = None):
         spawns = self.data.get("spawns", {})
@@ -70,16 +72,17 @@ class FarmlandScene(BaseScene):
                 pass
 
     def _update_growth(self):
+        # Full-detail growth while the farm is loaded (world_sim.FarmSim applies the same rule otherwise)
         try:
+            from game.systems.world_sim import growth_left
             from game.util.time_of_day import TimeOfDay
         except Exception:
             return
         now = TimeOfDay.minutes
         for plot in self.plots:
-            if plot["state"] == "planted" and plot["planted_minutes"] is not None:
-                elapsed = (now - plot["planted_minutes"]) % (24 * 60)
-                if elapsed >= self._growth_minutes_required:
-                    plot["state"] = "ready"
+            if plot.state == "planted" and plot.planted_minutes is not None:
+                if growth_left(plot.planted_minutes, now, self._growth_minutes_required) <= 0:
+                    plot.state = "ready"
                     # Persist state transition so it survives scene changes
                     self._persist_plot(plot)
 
@@ -88,7 +91,7 @@ class FarmlandScene(BaseScene):
         closest = None
         best_d2 = (64 + 1) ** 2
         for plot in self.plots:
-            r = plot["rect"]
+            r = plot.rect
             # proximity by center distance
             dx = r.centerx - pr.centerx
             dy = r.centery - pr.centery
@@ -101,12 +104,13 @@ class FarmlandScene(BaseScene):
 
     def update(self, dt: float, input_sys):
         move_player(self.player, input_sys, dt, self.world_colliders)
+        self.step_entities(dt)
 
         # Scene transitions
         for t in self.triggers:
-            if self.player["rect"].colliderect(t["rect"]):
-                on_enter = t.get("on_enter")
-                if on_enter and on_enter.get("type") == "scene_change":
+            if self.player["rect"].colliderect(t.rect):
+                on_enter = t.on_enter
+                if on_enter.get("type") == "scene_change":
                     self.events.publish("scene.change", {
                         "target": on_enter.get("target"),
                         "spawn": on_enter.get("spawn")
@@ -118,7 +122,7 @@ class FarmlandScene(BaseScene):
         plot = self._find_player_plot()
         self.prompt_text = None
         if plot is not None:
-            state = plot["state"]
+            state = plot.state
             # Set contextual prompt and handle inputs
             try:
                 from game.util.state import GameState
@@ -128,7 +132,7 @@ class FarmlandScene(BaseScene):
             if state == "untilled":
                 self.prompt_text = "E: Till soil"
                 if input_sys.was_pressed("TILL"):
-                    plot["state"] = "tilled"
+                    plot.state = "tilled"
                     self._persist_plot(plot)
             elif state == "tilled":
                 have_seeds = (GameState is None) or (GameState.has_item("seeds", 1))
@@ -138,8 +142,8 @@ class FarmlandScene(BaseScene):
                         if GameState is None or GameState.remove_item("seeds", 1):
                             # record in-game time at planting
                             from game.util.time_of_day import TimeOfDay
-                            plot["state"] = "planted"
-                            plot["planted_minutes"] = TimeOfDay.minutes
+                            plot.state = "planted"
+                            plot.planted_minutes = TimeOfDay.minutes
                             self._persist_plot(plot)
                             # Notify seed consumption
                             try:
@@ -161,8 +165,8 @@ class FarmlandScene(BaseScene):
                             self.events.publish("ui.notify", {"text": "+1 Carrot"})
                         except Exception:
                             pass
-                    plot["state"] = "tilled"
-                    plot["planted_minutes"] = None
+                    plot.state = "tilled"
+                    plot.planted_minutes = None
                     self._persist_plot(plot)
 
         # Basic interactables (none for now)
@@ -173,16 +177,17 @@ class FarmlandScene(BaseScene):
 
         input_sys.end_frame()
 
-    def _persist_plot(self, plot: Dict[str, Any]):
+    def _persist_plot(self, plot: Plot):
         # Save a single plot's state into GameState (session-persistent)
         try:
             from game.util.state import GameState
-            pid = plot.get("id")
+            pid = plot.id
             if not pid:
                 return
+            GameState.ensure_loaded("farming_plots")
             entry = GameState.farming_plots.setdefault(pid, {})
-            entry["state"] = plot.get("state")
-            entry["planted_minutes"] = plot.get("planted_minutes")
+            entry["state"] = plot.state
+            entry["planted_minutes"] = plot.planted_minutes
         except Exception:
             pass
 
@@ -194,15 +199,15 @@ class FarmlandScene(BaseScene):
         except Exception:
             pass
 
-    def _draw_plots(self, surface: pygame.Surface):
+    def _submit_plots(self, rq: RenderQueue):
         # Colors fetched via Config with safe fallbacks
         soil = Config.COLORS.get("soil_untilled", (130, 105, 70))
         tilled = Config.COLORS.get("soil_tilled", (110, 85, 55))
         planted = Config.COLORS.get("soil_planted", (60, 130, 60))
         ready = Config.COLORS.get("soil_ready", (200, 170, 60))
-        for plot in self.plots:
-            r = self.camera.apply(plot["rect"])
-            state = plot["state"]
+        for plot in self.visible("plots"):
+            r = plot.rect
+            state = plot.state
             if state == "untilled":
                 color = soil
             elif state == "tilled":
@@ -211,30 +216,29 @@ class FarmlandScene(BaseScene):
                 color = planted
             else:
                 color = ready
-            pygame.draw.rect(surface, color, r)
-            pygame.draw.rect(surface, (0, 0, 0), r, 1)
+            rq.box(LAYER_GROUND, r, color)
             # Growth bar for planted
             if state == "planted":
                 try:
                     from game.util.time_of_day import TimeOfDay
                     # Ensure UI reflects catch-up even if growth already met
-                    planted_at = plot.get("planted_minutes") or 0
+                    planted_at = plot.planted_minutes or 0
                     elapsed = (TimeOfDay.minutes - planted_at) % (24 * 60)
                 except Exception:
                     elapsed = 0
                 pct = max(0.0, min(1.0, float(elapsed) / float(self._growth_minutes_required)))
                 bar_w = max(2, int(r.width * pct))
-                bar = pygame.Rect(r.left, r.top - 6, bar_w, 4)
-                pygame.draw.rect(surface, (50, 200, 50), bar)
-                pygame.draw.rect(surface, (0, 0, 0), pygame.Rect(r.left, r.top - 6, r.width, 4), 1)
+                rq.rect(LAYER_DECOR, pygame.Rect(r.left, r.top - 6, bar_w, 4), (50, 200, 50))
+                rq.rect(LAYER_DECOR, pygame.Rect(r.left, r.top - 6, r.width, 4), (0, 0, 0), 1)
 
     def draw(self, surface: pygame.Surface):
-        # Draw ground and player, but not fences yet
-        draw_world(surface, self.camera, Config.COLORS["ground_farm"], [], [], [], self.player)
-        # Draw plots on top of ground, then fences, then UI
-        self._draw_plots(surface)
-        # Draw fences on top of plots
-        for f in self.fences:
-            pygame.draw.rect(surface, Config.COLORS["fence"], self.camera.apply(f))
+        surface.fill(Config.COLORS["ground_farm"])
+        rq = self.render_queue
+        rq.begin(self.camera)
+        # Plots on the ground, fences and growth bars above them, the player on top
+        self._submit_plots(rq)
+        submit_world(rq, [], [], self.visible("fences"), self.player)
+        submit_entities(rq, self.entities)
+        rq.flush(surface)
         draw_prompt(surface, self.prompt_text)
         draw_day_night_tint(surface)
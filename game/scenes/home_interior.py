@@ -5,13 +5,18 @@ from game.config import Config
 from game.core.scene import BaseScene
 from game.scripts_common import spawn_player_from_json
 from game.systems.movement import move_player
-from game.systems.interaction import handle_interaction
-from game.systems.render import draw_world, draw_prompt, draw_day_night_tint, draw_clock
+from game.systems.interaction import get_closest_interactable, handle_interaction
+from game.systems.render import (
+    LAYER_DECOR, RenderQueue, draw_clock, draw_day_night_tint, draw_player, draw_prompt, prompt_rect, submit_world,
+)
 from game.util.serialization import load_json
+from game.core.records import Kind
 from game.util.state import GameState
 
 
 class HomeInteriorScene(BaseScene):
+    supports_dirty_rects = True
+
     def __init__(self, manager):
         super().__init__(manager)
         self.data = None
@@ -22,6 +27,7 @@ class HomeInteriorScene(BaseScene):
         self._sleep_alpha = 0
         self._sleep_saved = False
         self._font = None
+        self.render_queue = RenderQueue()
 
     def load(self):
         self.data = load_json(f"{Config.SCENES_DIR}/home_interior.json")
@@ -32,9 +38,9 @@ class HomeInteriorScene(BaseScene):
         self.world_colliders = [pygame.Rect(*c["rect"]) for c in self.data.get("colliders", [])]
         self.furniture = [pygame.Rect(*c["rect"]) for c in self.data.get("colliders", [])]
         # Interactables (door back)
-        self.interactables = [{**i, "rect": pygame.Rect(*i["rect"])} for i in self.data.get("interactables", [])]
-        # Triggers (not needed beyond door)
-        self.triggers = [{**t, "rect": pygame.Rect(*t["rect"])} for t in self.data.get("triggers", [])]
+        # Interactables (door back, bed) and triggers (not needed beyond door)
+        self.load_interactables(self.data)
+        self.set_drawables(furniture=self.furniture, interactables=self.interactables)
 
     def enter(self, payload: Dict[str, Any] | None = None):
         spawns = self.data.get("spawns", {})
@@ -54,6 +60,9 @@ class HomeInteriorScene(BaseScene):
             self._sleep_alpha = 0
             self._sleep_saved = False
 
+    def is_animating(self) -> bool:
+        return self._sleep_phase is not None
+
     def update(self, dt: float, input_sys):
         # If sleeping, run sequence and block movement/interactions
         if self._sleep_phase is not None:
@@ -103,20 +112,7 @@ class HomeInteriorScene(BaseScene):
 
         # Bed interaction: if Space near a bed, start sleep
         if input_sys.was_pressed("INTERACT"):
-            pr = self.player["rect"]
-            closest = None
-            best_d2 = (48 + 1) ** 2
-            for it in self.interactables:
-                if str(it.get("tag", "")) != "bed.sleep":
-                    continue
-                ir = it["rect"]
-                dx = ir.centerx - pr.centerx
-                dy = ir.centery - pr.centery
-                d2 = dx*dx + dy*dy
-                if d2 < best_d2:
-                    best_d2 = d2
-                    closest = it
-            if closest is not None:
+            if get_closest_interactable(self.player, self.kinds[Kind.BED]) is not None:
                 self._start_sleep()
 
         # Camera follow
@@ -124,22 +120,26 @@ class HomeInteriorScene(BaseScene):
 
         input_sys.end_frame()
 
-    def draw(self, surface: pygame.Surface):
-        draw_world(surface, self.camera, Config.COLORS["ground_home"], [], self.furniture, [], self.player)
+    def draw_static(self, surface: pygame.Surface):
+        surface.fill(Config.COLORS["ground_home"])
+        rq = self.render_queue
+        rq.begin(self.camera)
+        submit_world(rq, [], self.visible("furniture"), [], None)
         # Draw visual exit door and bed inside the home
         door_color = Config.COLORS.get("door", (200, 80, 40))
         bed_color = Config.COLORS.get("bed", (180, 60, 180))
-        for it in self.interactables:
-            tag = it.get("tag")
-            if tag == "door.exit":
-                pygame.draw.rect(surface, door_color, self.camera.apply(it["rect"]))
-                pygame.draw.rect(surface, (0, 0, 0), self.camera.apply(it["rect"]), 1)
-            if tag == "bed.sleep":
-                pygame.draw.rect(surface, bed_color, self.camera.apply(it["rect"]))
-                pygame.draw.rect(surface, (0, 0, 0), self.camera.apply(it["rect"]), 1)
+        for it in self.visible("interactables"):
+            if it.kind == Kind.DOOR:
+                rq.box(LAYER_DECOR, it.rect, door_color)
+            elif it.kind == Kind.BED:
+                rq.box(LAYER_DECOR, it.rect, bed_color)
+        rq.flush(surface)
+
+    def draw_dynamic(self, surface: pygame.Surface):
+        draw_player(surface, self.camera, self.player)
         draw_prompt(surface, self.prompt_text)
-        draw_day_night_tint(surface)
 
+    def draw_overlay(self, surface: pygame.Surface):
         # Sleep overlay and message
         if self._sleep_phase is not None:
             overlay = pygame.Surface((surface.get_width(), surface.get_height()), pygame.SRCALPHA)
@@ -150,3 +150,18 @@ class HomeInteriorScene(BaseScene):
                     self._font = pygame.font.SysFont("arial", 22)
                 msg = self._font.render("A new day!", True, (255, 255, 255))
                 surface.blit(msg, ((surface.get_width() - msg.get_width()) // 2, (surface.get_height() - msg.get_height()) // 2))
+
+    def dirty_rects(self, surface: pygame.Surface):
+        if self._sleep_phase is not None:
+            return [surface.get_rect()]
+        rects = [self.camera.apply(self.player["rect"])] if self.player else []
+        pr = prompt_rect(surface, self.prompt_text)
+        if pr is not None:
+            rects.append(pr)
+        return rects
+
+    def draw(self, surface: pygame.Surface):
+        self.draw_static(surface)
+        self.draw_dynamic(surface)
+        draw_day_night_tint(surface)
+        self.draw_overlay(surface)
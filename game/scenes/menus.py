@@ -0,0 +1,449 @@
+import os
+
+import pygame
+from typing import Dict, Any, List, Optional, Tuple
+
+from game.config import Config
+from game.core.scene import BaseScene
+from game.core import session
+from game.core.input import keymap
+from game.util.capture import capture
+from game.util.save import delete_named_save, list_save_slots, load_save_file, has_any_saves, write_named_save
+from game.util.state import GameState
+
+
+_fonts: Dict[int, pygame.font.Font] = {}
+
+
+def _font(size: int) -> pygame.font.Font:
+    f = _fonts.get(size)
+    if f is None:
+        f = _fonts[size] = pygame.font.SysFont("arial", size)
+    return f
+
+
+def _blit_centered(surface: pygame.Surface, text_surf: pygame.Surface, y: int):
+    surface.blit(text_surf, ((surface.get_width() - text_surf.get_width()) // 2, y))
+
+
+class MenuScene(BaseScene):
+    """
+    Base for menus living on the SceneManager stack. Menus get raw pygame events through
+    handle_event(); results are reported through callbacks passed in the enter() payload.
+    """
+    is_menu = True
+
+    def __init__(self, manager):
+        super().__init__(manager)
+        self.payload: Dict[str, Any] = {}
+
+    def load(self):
+        pass
+
+    def enter(self, payload: Optional[Dict[str, Any]] = None):
+        self.payload = dict(payload or {})
+
+    def update(self, dt: float, input_sys):
+        pass
+
+    def input_context(self) -> str:
+        return "menu"
+
+    def on_quit_request(self):
+        # Window close while this menu is on top: default is to back out
+        self.manager.pop()
+
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == pygame.QUIT:
+            self.on_quit_request()
+        elif event.type == pygame.KEYDOWN:
+            self.on_key(event)
+
+    def on_key(self, event: pygame.event.Event):
+        pass
+
+    def _callback(self, name: str, *args):
+        cb = self.payload.get(name)
+        if cb:
+            cb(*args)
+
+
+class ListMenuScene(MenuScene):
+    """Vertical list driven by the "menu" key bindings (Up/Down or W/S, Enter/Space, Esc)."""
+    title = ""
+    title_y = 80
+    list_y = 160
+    row_h = 34
+    hint = ""
+
+    def __init__(self, manager):
+        super().__init__(manager)
+        self.sel = 0
+
+    def options(self) -> List[Tuple[str, bool]]:
+        # (label, selectable)
+        return []
+
+    def on_confirm(self, index: int):
+        pass
+
+    def on_cancel(self):
+        self.manager.pop()
+
+    def on_delete(self, index: int):
+        pass
+
+    def on_key(self, event: pygame.event.Event):
+        acts = keymap.lookup("menu", event.key)
+        opts = self.options()
+        if "CANCEL" in acts:
+            self.on_cancel()
+        elif "NAV_UP" in acts and opts:
+            self.sel = (self.sel - 1) % len(opts)
+        elif "NAV_DOWN" in acts and opts:
+            self.sel = (self.sel + 1) % len(opts)
+        elif "CONFIRM" in acts and opts:
+            if opts[self.sel][1]:
+                self.on_confirm(self.sel)
+        elif "DELETE" in acts and opts:
+            if opts[self.sel][1]:
+                self.on_delete(self.sel)
+
+    def draw_background(self, surface: pygame.Surface):
+        surface.fill(Config.COLORS["bg"])
+
+    def draw_row(self, surface: pygame.Surface, index: int, label: str, selected: bool, y: int):
+        txt = _font(22).render(label, True, (255, 255, 0) if selected else (220, 220, 220))
+        _blit_centered(surface, txt, y)
+
+    def draw(self, surface: pygame.Surface):
+        self.draw_background(surface)
+        if self.title:
+            _blit_centered(surface, _font(28).render(self.title, True, (255, 255, 255)), self.title_y)
+        y = self.list_y
+        for i, (label, selectable) in enumerate(self.options()):
+            self.draw_row(surface, i, label, i == self.sel and selectable, y)
+            y += self.row_h
+        if self.hint:
+            hint = _font(18).render(self.hint, True, (200, 200, 200))
+            _blit_centered(surface, hint, surface.get_height() - 80)
+
+
+class StartMenuScene(ListMenuScene):
+    title = "Simple RPG"
+    title_y = 120
+    list_y = 200
+
+    def enter(self, payload: Optional[Dict[str, Any]] = None):
+        super().enter(payload)
+        self._has_save = has_any_saves()
+
+    def options(self):
+        load_label = "Load Game" if self._has_save else "Load Game (no saves)"
+        return [("New Game", True), (load_label, self._has_save), ("Quit", True)]
+
+    def on_confirm(self, index: int):
+        if index == 0:
+            self.manager.push("menu.text_input", {
+                "title": "New Game",
+                "prompt": "Enter your name:",
+                "default": "Hero",
+                "on_submit": self._on_name,
+            })
+        elif index == 1:
+            self.manager.push("menu.load")
+        else:
+            self.events.publish("app.quit", {})
+
+    def _on_name(self, name: str):
+        self.manager.pop()
+        if not name.strip():
+            return
+        self.manager.push("menu.race_select", {
+            "on_select": lambda race: session.start_new_game(self.manager, name, race),
+        })
+
+    def on_cancel(self):
+        self.events.publish("app.quit", {})
+
+    def on_quit_request(self):
+        self.events.publish("app.quit", {})
+
+
+
+class LoadMenuScene(ListMenuScene):
+    title = "Load Game"
+    row_h = 56
+    hint = "Enter: Load | Del: Delete | Esc: Back"
+
+    def enter(self, payload: Optional[Dict[str, Any]] = None):
+        super().enter(payload)
+        self._refresh()
+
+    def _refresh(self):
+        # Slot descriptors carry the player summary (save headers only, no full loads)
+        self.saves = list_save_slots()
+        self.sel = min(self.sel, max(0, len(self.saves) - 1))
+        self._pending_delete: Optional[int] = None
+        self._thumbs: Dict[str, pygame.Surface] = {}
+        self.summaries = []
+        for slot in self.saves:
+            pname = slot.get('player_name') or ""
+            prace = slot.get('player_race') or ""
+            summary = f"Player: {pname} ({prace})  Lvl {slot.get('level') or 1}" if (pname or prace) else ""
+            self.summaries.append(summary)
+
+    def on_key(self, event: pygame.event.Event):
+        before = self._pending_delete
+        super().on_key(event)
+        if self._pending_delete == before:
+            # Any other key (or moving the selection) cancels a pending delete
+            self._pending_delete = None
+
+    def on_confirm(self, index: int):
+        save = load_save_file(self.saves[index].get('path')) or {}
+        session.apply_save(self.manager, save)
+
+    def on_delete(self, index: int):
+        # Del twice on the same row: the first press only asks for confirmation
+        if self._pending_delete != index:
+            self._pending_delete = index
+            return
+        delete_named_save(self.saves[index].get('path'))
+        self._refresh()
+
+    def options(self):
+        if not self.saves:
+            return [("No saves found", False)]
+        opts = [(slot.get('name') or 'Save', True) for slot in self.saves]
+        if self._pending_delete is not None:
+            label = opts[self._pending_delete][0]
+            opts[self._pending_delete] = (f"{label}  - press Del again to delete", True)
+        return opts
+
+    def _thumb(self, path: Optional[str]) -> Optional[pygame.Surface]:
+        # Loaded on first draw; a missing file is retried (the capture worker may still be writing it)
+        if not path:
+            return None
+        thumb = self._thumbs.get(path)
+        if thumb is None and os.path.exists(path):
+            try:
+                img = pygame.image.load(path)
+                h = self.row_h - 6
+                thumb = self._thumbs[path] = pygame.transform.smoothscale(img, (img.get_width() * h // img.get_height(), h))
+            except Exception:
+                return None
+        return thumb
+
+    def draw_row(self, surface: pygame.Surface, index: int, label: str, selected: bool, y: int):
+        super().draw_row(surface, index, label, selected, y)
+        if not self.saves:
+            return
+        slot = self.saves[index]
+        thumb = self._thumb(slot.get('thumbnail'))
+        if thumb is not None:
+            x = surface.get_width() // 2 - 320
+            surface.blit(thumb, (x, y))
+            if selected:
+                pygame.draw.rect(surface, (255, 255, 0), thumb.get_rect(topleft=(x, y)), 2)
+        meta = []
+        if slot.get('is_autosave'):
+            meta.append("Autosave")
+        if slot.get('created_at'):
+            meta.append(slot.get('created_at'))
+        meta_line = " - ".join(meta)
+        y2 = y + 22
+        if self.summaries[index]:
+            _blit_centered(surface, _font(18).render(self.summaries[index], True, (180, 220, 180)), y2)
+            y2 += 18
+        if meta_line:
+            _blit_centered(surface, _font(18).render(meta_line, True, (180, 180, 180)), y2)
+
+
+class RaceSelectScene(ListMenuScene):
+    title = "Choose Race"
+    row_h = 36
+    hint = "Enter: Select  |  Esc: Cancel"
+
+    def enter(self, payload: Optional[Dict[str, Any]] = None):
+        super().enter(payload)
+        self.races = list(GameState.RACES.keys())
+
+    def options(self):
+        opts = []
+        for race in self.races:
+            base = GameState.RACES[race]
+            opts.append((f"{race}   HP {base['HP']}  ATK {base['ATK']}  DEF {base['DEF']}  SPD {base['SPD']}", True))
+        return opts
+
+    def on_confirm(self, index: int):
+        self._callback("on_select", self.races[index])
+
+
+class TextInputScene(MenuScene):
+    """Single-line text entry. payload: title, prompt, default, on_submit(str), on_cancel()."""
+    CARET_MS = 500
+
+    def enter(self, payload: Optional[Dict[str, Any]] = None):
+        super().enter(payload)
+        self.buf = list(self.payload.get("default", ""))
+        self.caret_visible = True
+        self._caret_timer = 0.0
+        self._blinked = False
+
+    def update(self, dt: float, input_sys):
+        self._caret_timer += dt
+        self._blinked = self._caret_timer >= self.CARET_MS
+        if self._blinked:
+            self._caret_timer = 0.0
+            self.caret_visible = not self.caret_visible
+
+    def is_animating(self) -> bool:
+        return self._blinked
+
+    def wake_in_ms(self) -> Optional[float]:
+        return max(1.0, self.CARET_MS - self._caret_timer)
+
+    def _cancel(self):
+        if self.payload.get("on_cancel"):
+            self._callback("on_cancel")
+        else:
+            self.manager.pop()
+
+    def on_quit_request(self):
+        self._cancel()
+
+    def on_key(self, event: pygame.event.Event):
+        if event.key == pygame.K_ESCAPE:
+            self._cancel()
+        elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            self._callback("on_submit", ''.join(self.buf).strip())
+        elif event.key == pygame.K_BACKSPACE:
+            if self.buf:
+                self.buf.pop()
+        else:
+            # Simple text input: printable ASCII
+            ch = event.unicode
+            if ch and 32 <= ord(ch) < 127:
+                self.buf.append(ch)
+
+    def draw(self, surface: pygame.Surface):
+        surface.fill(Config.COLORS["bg"])
+        _blit_centered(surface, _font(28).render(str(self.payload.get("title", "")), True, (255, 255, 255)), 120)
+        _blit_centered(surface, _font(22).render(str(self.payload.get("prompt", "")), True, (220, 220, 220)), 200)
+        display_text = ''.join(self.buf) + ("|" if self.caret_visible else "")
+        _blit_centered(surface, _font(22).render(display_text, True, (255, 255, 0)), 240)
+        _blit_centered(surface, _font(18).render("Enter: Confirm | Esc: Cancel", True, (200, 200, 200)), 320)
+
+
+class OverlayMenuScene(ListMenuScene):
+    """Menu drawn over a frozen, pre-darkened copy of the game frame."""
+    is_overlay = True
+
+    def enter(self, payload: Optional[Dict[str, Any]] = None):
+        super().enter(payload)
+        # A caller may hand over the game frame it was itself drawn over
+        if self.payload.get("backdrop") is not None:
+            self.backdrop = self.payload["backdrop"]
+        self._dimmed = None
+
+    def draw_background(self, surface: pygame.Surface):
+        if self._dimmed is None or self._dimmed.get_size() != surface.get_size():
+            self._dimmed = pygame.Surface(surface.get_size())
+            if self.backdrop is not None:
+                self._dimmed.blit(self.backdrop, (0, 0))
+            else:
+                self._dimmed.fill(Config.COLORS["bg"])
+            shade = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+            shade.fill((0, 0, 0, 180))
+            self._dimmed.blit(shade, (0, 0))
+        surface.blit(self._dimmed, (0, 0))
+
+    def _write_save(self, name: str):
+        # The undimmed game frame becomes the save's thumbnail (encoded off the main thread)
+        frame = capture.grab(self.backdrop) if self.backdrop is not None else None
+        write_named_save(name, session.build_save_dict(self.manager), thumbnail=frame)
+
+
+class PauseMenuScene(OverlayMenuScene):
+    title = "Paused"
+    title_y = 100
+    list_y = 180
+    hint = "Enter: Confirm  |  Esc/P: Resume"
+    OPTIONS = ["Resume", "Save", "Load", "Quit to Start Menu"]
+
+    def options(self):
+        return [(o, True) for o in self.OPTIONS]
+
+    def on_key(self, event: pygame.event.Event):
+        if event.key == pygame.K_p:
+            self.manager.pop()
+            return
+        super().on_key(event)
+
+    def on_quit_request(self):
+        # Window close from pause opens the quit prompt over the same game frame
+        backdrop = self.backdrop
+        self.manager.pop()
+        self.manager.push("menu.quit", {"backdrop": backdrop})
+
+    def on_confirm(self, index: int):
+        chosen = self.OPTIONS[index]
+        if chosen == "Resume":
+            self.manager.pop()
+        elif chosen == "Save":
+            self.manager.push("menu.text_input", {
+                "title": "Save Game",
+                "prompt": "Enter a name for your save:",
+                "default": session.default_save_name(self.manager),
+                "on_submit": self._on_save_name,
+            })
+        elif chosen == "Load":
+            self.manager.push("menu.load")
+        elif chosen == "Quit to Start Menu":
+            # Return to start menu without forcing a save
+            self.manager.reset("menu.start")
+
+    def _on_save_name(self, name: str):
+        self._write_save(name)
+        self.manager.pop()
+
+
+class QuitPromptScene(OverlayMenuScene):
+    LINES = [
+        "Quit Game?",
+        "Y/Enter/S: Save and Quit",
+        "N/Q: Quit without Saving",
+        "Esc: Cancel",
+    ]
+
+    def on_key(self, event: pygame.event.Event):
+        if event.key == pygame.K_ESCAPE:
+            self.manager.pop()
+        elif event.key in (pygame.K_y, pygame.K_RETURN, pygame.K_s):
+            # Save (named); canceling the name returns to this prompt
+            self.manager.push("menu.text_input", {
+                "title": "Save Game",
+                "prompt": "Enter a name for your save:",
+                "default": session.default_save_name(self.manager),
+                "on_submit": self._on_save_name,
+            })
+        elif event.key in (pygame.K_n, pygame.K_q):
+            # Quit without saving
+            self.events.publish("app.quit", {})
+
+    def on_quit_request(self):
+        # Already in quit prompt; ignore duplicate
+        pass
+
+    def _on_save_name(self, name: str):
+        self._write_save(name)
+        # After saving, return to the start menu instead of quitting immediately
+        self.manager.reset("menu.start")
+
+    def draw(self, surface: pygame.Surface):
+        self.draw_background(surface)
+        y = surface.get_height() // 2 - 60
+        for line in self.LINES:
+            _blit_centered(surface, _font(20).render(line, True, (255, 255, 255)), y)
+            y += 30
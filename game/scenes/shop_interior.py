@@ -5,17 +5,26 @@ from game.config import Config
 from game.core.scene import BaseScene
 from game.scripts_common import spawn_player_from_json
 from game.systems.movement import move_player
-from game.systems.interaction import handle_interaction
-from game.systems.render import draw_world, draw_prompt, draw_day_night_tint, draw_clock
+from game.systems.interaction import get_closest_interactable, handle_interaction
+from game.systems.render import (
+    LAYER_ACTORS, LAYER_DECOR, RenderQueue, draw_clock, draw_day_night_tint, draw_player, draw_prompt, prompt_rect,
+    submit_world,
+)
 from game.util.serialization import load_json
+from game.core.records import Kind
 from game.systems.dialogue import DialogueUI
+from game.systems.dialogue_graph import dialogue_graph
+from game.systems.world_sim import ShopSim, world_sim
 
 
 class ShopInteriorScene(BaseScene):
+    supports_dirty_rects = True
+
     def __init__(self, manager):
         super().__init__(manager)
         self.data = None
         self.furniture = []
+        self.render_queue = RenderQueue()
         # Shared dialogue/choice UI
         self.dialog = DialogueUI(self.events)
 
@@ -26,8 +35,8 @@ class ShopInteriorScene(BaseScene):
         self.camera.set_bounds(self.bounds)
         self.world_colliders = [pygame.Rect(*c["rect"]) for c in self.data.get("colliders", [])]
         self.furniture = [pygame.Rect(*c["rect"]) for c in self.data.get("colliders", [])]
-        self.interactables = [{**i, "rect": pygame.Rect(*i["rect"])} for i in self.data.get("interactables", [])]
-        self.triggers = [{**t, "rect": pygame.Rect(*t["rect"])} for t in self.data.get("triggers", [])]
+        self.load_interactables(self.data)
+        self.set_drawables(furniture=self.furniture, interactables=self.static_interactables)
 
     def enter(self, payload: Dict[str, Any] | None = None):
         spawns = self.data.get("spawns", {})
@@ -39,124 +48,42 @@ class ShopInteriorScene(BaseScene):
         except Exception:
             pass
 
-    def _shop_state(self) -> Dict[str, Any]:
-        # Persist minimal shop state in GameState.flags so it survives saves
-        try:
-            from game.util.state import GameState
-            st = GameState.flags.setdefault("shop_state", {})
-            if not isinstance(st, dict):
-                GameState.flags["shop_state"] = {}
-                st = GameState.flags["shop_state"]
-            return st
-        except Exception:
-            return {}
-
     def _ensure_shop_day_state(self):
-        from game.util.time_of_day import TimeOfDay
-        st = self._shop_state()
-        cur_day = int(getattr(TimeOfDay, 'day', 1))
-        if st.get('day') != cur_day:
-            import random
-            st['day'] = cur_day
-            # Daily stock and price
-            st['seeds_stock'] = 8  # daily seed stock
-            st['carrot_price'] = int(random.randint(2, 5))
-
-    def _start_dialog(self, lines, on_complete=None, on_confirm_alt=None):
-        # Delegate to shared dialogue UI
-        self.dialog.start_dialog(lines, on_complete=on_complete, on_confirm_alt=on_confirm_alt)
-
-    def _advance_dialog(self):
-        # Advancement handled by DialogueUI.update
-        return
-
-    def _cancel_dialog(self):
-        # Delegate cancellation to DialogueUI
-        self.dialog.cancel_dialog()
-
-    def _handle_shopkeeper(self):
+        # Daily stock and price are rolled by the (lazy) shop simulator
+        world_sim.catch_up("shop_interior")
+
+    def _handle_shopkeeper(self, closest):
+        # Selling crops and buying seeds come from game/data/dialogue/shop_interior.json
+        graph = dialogue_graph(self.scene_key)
+        if graph is not None:
+            self.dialog.start_graph(graph, graph.entry(closest.tag), self)
+
+    def dialogue_vars(self) -> Dict[str, Any]:
         from game.util.state import GameState
-        from game.util.time_of_day import TimeOfDay
+        st = ShopSim.state()
+        price = int(st.get('carrot_price', 3))
+        carrots = int(GameState.inventory.get("carrot", 0))
+        return {
+            "price": price,
+            "seeds_stock": int(st.get('seeds_stock', 0)),
+            "carrots": carrots,
+            "sale_total": carrots * price,
+        }
+
+    def dialogue_refresh_stock(self):
         # Ensure daily state is up to date
         try:
             self._ensure_shop_day_state()
         except Exception:
             pass
-        st = self._shop_state()
-        price = int(st.get('carrot_price', 3))
-        seeds_stock = int(st.get('seeds_stock', 0))
-        if not TimeOfDay.is_shop_open():
-            self._start_dialog(["Shopkeeper: Sorry, we're closed. Please come back during the day."], on_complete=None)
-            return
-        # If player has carrots, offer a repeated sell loop: Space sells one, A sells all, Esc cancels
-        if GameState.has_item("carrot", 1):
-            def _sell_once():
-                nonlocal price
-                if GameState.remove_item("carrot", 1):
-                    GameState.coins += price
-                    # Notifications
-                    try:
-                        self.events.publish("ui.notify", {"text": "-1 Carrot"})
-                        self.events.publish("ui.notify", {"text": f"+{price} Coins"})
-                    except Exception:
-                        pass
-                    # Continue offering if more remain
-                    if GameState.has_item("carrot", 1):
-                        self._start_dialog([f"Sell crops: +{price} coins each. Space: one  |  A: all  |  Esc: cancel"], on_complete=_sell_once, on_confirm_alt=_sell_all)
-                    else:
-                        self._start_dialog(["Shopkeeper: You have no crops."])
-                else:
-                    self._start_dialog(["Shopkeeper: You have no crops."])
-            def _sell_all():
-                nonlocal price
-                have = int(GameState.inventory.get("carrot", 0))
-                if have > 0:
-                    coins = have * price
-                    # remove all carrots
-                    GameState.remove_item("carrot", have)
-                    GameState.coins += coins
-                    try:
-                        self.events.publish("ui.notify", {"text": f"-{have} Carrot(s)"})
-                        self.events.publish("ui.notify", {"text": f"+{coins} Coins"})
-                    except Exception:
-                        pass
-                    self._start_dialog(["Shopkeeper: Thanks for the crops!"], on_complete=None)
-                else:
-                    self._start_dialog(["Shopkeeper: You have no crops."], on_complete=None)
-            self._start_dialog([f"Sell crops: +{price} coins each. Space: one  |  A: all  |  Esc: cancel"], on_complete=_sell_once, on_confirm_alt=_sell_all)
-            return
-        # Otherwise offer Seeds for 5 coins with daily stock
-        def _buy():
-            st_local = self._shop_state()
-            if int(st_local.get('seeds_stock', 0)) <= 0:
-                self._start_dialog(["Shopkeeper: Seeds are sold out today. Come back tomorrow."], on_complete=None)
-                return
-            if GameState.coins >= 5:
-                GameState.coins -= 5
-                GameState.add_item("seeds", 1)
-                st_local['seeds_stock'] = int(st_local.get('seeds_stock', 0)) - 1
-                # Notifications
-                try:
-                    self.events.publish("ui.notify", {"text": "-5 Coins"})
-                    self.events.publish("ui.notify", {"text": "+1 Seeds"})
-                except Exception:
-                    pass
-                # After purchase, show updated stock or sold-out message
-                remaining = int(st_local.get('seeds_stock', 0))
-                if remaining > 0:
-                    self._start_dialog([f"Shopkeeper: Here you go! Seeds left today: {remaining}"], on_complete=None)
-                else:
-                    self._start_dialog(["Shopkeeper: That was the last one for today!"], on_complete=None)
-            else:
-                self._start_dialog(["Shopkeeper: Sorry, you don't have enough coins."], on_complete=None)
-        if seeds_stock > 0:
-            self._start_dialog([f"Shopkeeper: Seeds cost 5 coins. Stock today: {seeds_stock}. Press Space to buy."], on_complete=_buy)
-        else:
-            self._start_dialog(["Shopkeeper: Seeds are sold out today. Come back tomorrow."], on_complete=None)
+
+    def dialogue_take_seed_stock(self):
+        st = ShopSim.state()
+        st['seeds_stock'] = int(st.get('seeds_stock', 0)) - 1
 
     def update(self, dt: float, input_sys):
         # Delegate dialogue/choice handling to shared DialogueUI
-        if self.dialog.update(input_sys, self.camera, self.player["rect"]):
+        if self.dialog.update(input_sys, self.camera, self.player["rect"], dt):
             return
 
         move_player(self.player, input_sys, dt, self.world_colliders)
@@ -166,40 +93,45 @@ class ShopInteriorScene(BaseScene):
 
         # Shopkeeper proximity check
         if input_sys.was_pressed("INTERACT"):
-            pr = self.player["rect"]
-            closest = None
-            best_d2 = (48 + 1) ** 2
-            for item in self.interactables:
-                if str(item.get("tag", "")) != "npc.shopkeeper":
-                    continue
-                ir = item["rect"]
-                dx = ir.centerx - pr.centerx
-                dy = ir.centery - pr.centery
-                d2 = dx * dx + dy * dy
-                if d2 < best_d2:
-                    best_d2 = d2
-                    closest = item
+            closest = get_closest_interactable(self.player, self.kinds[Kind.NPC])
             if closest is not None:
-                self._handle_shopkeeper()
+                self._handle_shopkeeper(closest)
 
         self.camera.follow(self.player["rect"]) 
         input_sys.end_frame()
 
-    def draw(self, surface: pygame.Surface):
-        draw_world(surface, self.camera, Config.COLORS["ground_home"], [], self.furniture, [], self.player)
-        # Draw door visual
+    def draw_static(self, surface: pygame.Surface):
+        surface.fill(Config.COLORS["ground_home"])
+        rq = self.render_queue
+        rq.begin(self.camera)
+        submit_world(rq, [], self.visible("furniture"), [], None)
+        # Door visual and shopkeeper marker
         door_color = Config.COLORS.get("door", (200, 80, 40))
-        for it in self.interactables:
-            if it.get("tag") == "door.exit":
-                pygame.draw.rect(surface, door_color, self.camera.apply(it["rect"]))
-                pygame.draw.rect(surface, (0, 0, 0), self.camera.apply(it["rect"]), 1)
-        # Draw shopkeeper marker
-        for it in self.interactables:
-            if it.get("tag") == "npc.shopkeeper":
-                pygame.draw.rect(surface, (90, 160, 255), self.camera.apply(it["rect"]))
-                pygame.draw.rect(surface, (0, 0, 0), self.camera.apply(it["rect"]), 1)
+        for it in self.visible("interactables") + self.active_npcs():
+            if it.kind == Kind.DOOR:
+                rq.box(LAYER_DECOR, it.rect, door_color)
+            elif it.kind == Kind.NPC:
+                rq.box(LAYER_ACTORS, it.rect, (90, 160, 255))
+        rq.flush(surface)
+
+    def draw_dynamic(self, surface: pygame.Surface):
+        draw_player(surface, self.camera, self.player)
         draw_prompt(surface, self.prompt_text)
-        draw_day_night_tint(surface)
 
+    def draw_overlay(self, surface: pygame.Surface):
         # Draw dialog/choice via shared helper
         self.dialog.draw(surface)
+
+    def dirty_rects(self, surface: pygame.Surface):
+        rects = [self.camera.apply(self.player["rect"])] if self.player else []
+        pr = prompt_rect(surface, self.prompt_text)
+        if pr is not None:
+            rects.append(pr)
+        rects.extend(self.dialog.panel_rects(surface))
+        return rects
+
+    def draw(self, surface: pygame.Surface):
+        self.draw_static(surface)
+        self.draw_dynamic(surface)
+        draw_day_night_tint(surface)
+        self.draw_overlay(surface)
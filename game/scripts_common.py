@@ -1,5 +1,6 @@
+import numpy as np
 import pygame
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 
 def spawn_player_from_json(spawns: Dict[str, Any], spawn_name: str) -> dict:
@@ -8,3 +9,39 @@ def spawn_player_from_json(spawns: Dict[str, Any], spawn_name: str) -> dict:
     # Use a small rectangle for player
     rect = pygame.Rect(int(x) - 8, int(y) - 8, 16, 16)
     return {"rect": rect, "components": {"PlayerControl": True}}
+
+
+def spawn_crowds_from_json(entities, crowds: List[Dict[str, Any]], blocked: List[pygame.Rect], gen) -> int:
+    """
+    Spawn wandering groups from scene JSON "crowds":
+    [{"tag": "villager", "count": 40, "area": [x, y, w, h], "size": [14, 14], "color": [r, g, b], "speed": 45}]
+    With "roam": true members walk navigation paths between random spots instead of wandering.
+    Positions are drawn from `gen` (a NumPy Generator) inside `area`, avoiding `blocked` rects.
+    """
+    from game.systems.movement import collider_edges
+    edges = collider_edges(blocked)
+    spawned = 0
+    for c in crowds:
+        count = int(c.get("count", 0))
+        if count <= 0:
+            continue
+        x, y, w, h = c["area"]
+        size = np.array(c.get("size", [14, 14]), dtype=np.float64)
+        # Oversample, drop candidates that overlap a blocked rect, keep the first `count`
+        cand = np.column_stack((gen.uniform(x, x + w - size[0], count * 4), gen.uniform(y, y + h - size[1], count * 4)))
+        if len(edges):
+            hit = ((cand[:, 0:1] < edges[:, 2]) & (cand[:, 0:1] + size[0] > edges[:, 0])
+                   & (cand[:, 1:2] < edges[:, 3]) & (cand[:, 1:2] + size[1] > edges[:, 1])).any(axis=1)
+            cand = cand[~hit]
+        tag = str(c.get("tag", "crowd"))
+        color = c.get("color", [200, 200, 200])
+        speed = float(c.get("speed", 40))
+        roam = bool(c.get("roam", False))
+        timers = gen.uniform(0.0, 2000.0, len(cand))
+        for (px, py), t in zip(cand[:count], timers):
+            comps = dict(Transform=(px, py), Velocity=(0.0, 0.0), Collider=size, Renderable=color, Wander=(t, speed), Tag=tag)
+            if roam:
+                comps["Path"] = []
+            entities.spawn(**comps)
+            spawned += 1
+    return spawned
@@ -1,7 +1,8 @@
 import pygame
-from typing import List, Tuple, Callable, Optional
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from game.config import Config
+from game.systems.dialogue_graph import NO_NODE, fill, scene_vars
 
 
 class DialogueUI:
@@ -10,8 +11,9 @@ class DialogueUI:
     Usage from a Scene:
       self.dialog = DialogueUI(self.events)
       self.dialog.start_dialog([...], on_complete=cb, on_confirm_alt=alt)
-      self.dialog.start_choice("Prompt", [("Yes", cb1), ("No", cb2)])
-      if self.dialog.update(input_sys, self.camera, self.player["rect"]):
+      self.dialog.start_choice("Prompt", [("Yes", cb1), ("No", cb2), ...])
+      self.dialog.start_graph(dialogue_graph(scene_key), node, scene)  # data-driven
+      if self.dialog.update(input_sys, self.camera, self.player["rect"], dt):
           return  # consumed this frame
       ... later in draw(): self.dialog.draw(surface)
     """
@@ -21,10 +23,21 @@ class DialogueUI:
         self._dialog_lines: Optional[List[str]] = None
         self._on_complete: Optional[Callable[[], None]] = None
         self._on_alt: Optional[Callable[[], None]] = None
-        # choice state
-        self._choice: Optional[dict] = None  # {prompt:str, options: List[(label, cb)]}
-        # font cache
+        # choice state; an option's action is a callback or a graph node index
+        self._choice: Optional[dict] = None  # {prompt:str, options: List[(label, cb|node)], selected:int}
+        # dialogue graph state (see dialogue_graph.py): node whose lines are showing
+        self._graph = None
+        self._scene = None
+        self._graph_node = NO_NODE
+        # Render caches: panel backgrounds per size, text surfaces, the shown line and choice rows.
+        # _line_serial changes whenever a different line is shown, so each line renders once
         self._font: Optional[pygame.font.Font] = None
+        self._panels: Dict[Tuple[int, int], pygame.Surface] = {}
+        self._texts: Dict[Tuple[str, Tuple[int, ...]], pygame.Surface] = {}
+        self._line_serial = 0
+        self._line = None  # {serial, text, surface, shown, drawn}
+        self._choice_rows = None  # {choice, selected, rows}
+        self._typewriter = bool(getattr(Config, "DIALOG_TYPEWRITER", False))
 
     # API
     def start_dialog(self, lines: List[str], on_complete: Callable[[], None] | None = None,
@@ -33,8 +46,10 @@ class DialogueUI:
             self._dialog_lines = list(lines or [])
         except Exception:
             self._dialog_lines = []
+        self._line_serial += 1
         self._on_complete = on_complete
         self._on_alt = on_confirm_alt
+        self._graph_node = NO_NODE
         # closing any active choice when starting a dialog
         self._choice = None
 
@@ -42,48 +57,147 @@ class DialogueUI:
         self._dialog_lines = None
         self._on_complete = None
         self._on_alt = None
+        self._graph_node = NO_NODE
 
-    def start_choice(self, prompt: str, options: List[Tuple[str, Optional[Callable[[], None]]]]):
-        # take only first two options; rest ignored for MVP
+    def start_choice(self, prompt: str, options: List[Tuple[str, Union[Callable[[], None], int, None]]]):
         opts = []
         try:
             opts = list(options or [])
         except Exception:
             pass
-        self._choice = {"prompt": str(prompt or ""), "options": opts[:2]}
+        self._choice = {"prompt": str(prompt or ""), "options": opts, "selected": 0}
         # close any ongoing dialog
         self._dialog_lines = None
         self._on_complete = None
         self._on_alt = None
+        self._graph_node = NO_NODE
+
+    def start_graph(self, graph, node: int, scene) -> bool:
+        """Run a compiled dialogue graph from `node` (an entry index); False if there is none."""
+        if graph is None or node == NO_NODE:
+            return False
+        self._graph = graph
+        self._scene = scene
+        self._run(node)
+        return True
+
+    def _run(self, idx: int):
+        # Follow actions/branches/next until a node shows lines or choices (or the graph ends)
+        nodes = self._graph.nodes
+        scene = self._scene
+        steps = 0
+        while idx != NO_NODE and steps < 256:
+            steps += 1
+            node = nodes[idx]
+            variables = scene_vars(scene) if node.templated else None
+            for act in node.actions:
+                act(scene, variables)
+            if node.branch:
+                goto = NO_NODE
+                for cond, target in node.branch:
+                    if cond is None or cond(scene):
+                        goto = target
+                        break
+                idx = goto
+                continue
+            if node.lines:
+                self.start_dialog([fill(s, variables) for s in node.lines] if variables is not None else list(node.lines))
+                self._graph_node = idx
+                return
+            if node.choices:
+                self._show_choices(node, variables)
+                return
+            idx = node.next
+
+    def _show_choices(self, node, variables):
+        scene = self._scene
+        if variables is None and node.templated:
+            variables = scene_vars(scene)
+        opts = []
+        for label, cond, target in node.choices:
+            if cond is None or cond(scene):
+                opts.append((fill(label, variables) if variables is not None else label, target))
+        self.start_choice(fill(node.prompt or "", variables) if variables is not None else (node.prompt or ""), opts)
+
+    def _after_lines(self, alt: bool = False):
+        # Lines of a graph node finished (or A pressed on a node with "alt")
+        node = self._graph.nodes[self._graph_node]
+        self._graph_node = NO_NODE
+        self._dialog_lines = None
+        if alt:
+            self._run(node.alt)
+        elif node.choices:
+            self._show_choices(node, None)
+        else:
+            self._run(node.next)
+
+    def _pick(self, option):
+        self._choice = None
+        _label, act = option
+        if isinstance(act, int):
+            self._run(act)
+        elif act:
+            act()
+
+    def is_active(self) -> bool:
+        return self._choice is not None or self._dialog_lines is not None
+
+    def is_animating(self) -> bool:
+        # A typewriter line is still being revealed
+        return self._revealing()
+
+    def _line_state(self) -> Optional[dict]:
+        # State of the line currently shown, reset when another line comes up
+        if not self._dialog_lines:
+            return None
+        line = self._line
+        if line is None or line["serial"] != self._line_serial:
+            line = self._line = {"serial": self._line_serial, "text": str(self._dialog_lines[0]),
+                                 "surface": None, "shown": 0.0, "drawn": 0}
+        return line
+
+    def _revealing(self) -> bool:
+        line = self._line_state()
+        return self._typewriter and line is not None and int(line["shown"]) < len(line["text"])
 
     # Update returns True if it handled the frame (scene should early-return)
-    def update(self, input_sys, camera, follow_rect: pygame.Rect) -> bool:
+    def update(self, input_sys, camera, follow_rect: pygame.Rect, dt: float = 0.0) -> bool:
         # Choice mode has precedence
         if self._choice is not None:
+            opts = self._choice.get("options", [])
             if input_sys.was_pressed("CANCEL"):
                 self._choice = None
+            elif input_sys.was_pressed("CHOICE_UP") and opts:
+                self._choice["selected"] = (self._choice["selected"] - 1) % len(opts)
+            elif input_sys.was_pressed("CHOICE_DOWN") and opts:
+                self._choice["selected"] = (self._choice["selected"] + 1) % len(opts)
             elif input_sys.was_pressed("INTERACT"):
-                try:
-                    _label, cb = self._choice.get("options", [])[0]
-                except Exception:
-                    cb = None
-                self._choice = None
-                if cb:
-                    cb()
+                if opts:
+                    self._pick(opts[self._choice["selected"]])
+                else:
+                    self._choice = None
             elif input_sys.was_pressed("CONFIRM_ALT"):
-                opts = self._choice.get("options", [])
+                # A still picks the second option directly
                 if len(opts) > 1:
-                    _label, cb = opts[1]
-                    self._choice = None
-                    if cb:
-                        cb()
+                    self._pick(opts[1])
             camera.follow(follow_rect)
             input_sys.end_frame()
             return True
         # Dialog mode
         if self._dialog_lines is not None:
+            graph_node = self._graph.nodes[self._graph_node] if self._graph_node != NO_NODE else None
             if input_sys.was_pressed("CANCEL"):
                 self.cancel_dialog()
+            elif self._revealing():
+                line = self._line
+                if input_sys.was_pressed("INTERACT"):
+                    # Space completes the line before it advances
+                    line["shown"] = float(len(line["text"]))
+                else:
+                    cps = float(getattr(Config, "DIALOG_CHARS_PER_SEC", 45.0))
+                    line["shown"] = min(float(len(line["text"])), line["shown"] + cps * dt / 1000.0)
+            elif input_sys.was_pressed("CONFIRM_ALT") and graph_node is not None and graph_node.alt != NO_NODE:
+                self._after_lines(alt=True)
             elif input_sys.was_pressed("CONFIRM_ALT") and self._on_alt:
                 cb = self._on_alt
                 # clear first to prevent reentry
@@ -95,7 +209,10 @@ class DialogueUI:
                 # advance one line; if finished, run completion
                 if self._dialog_lines:
                     self._dialog_lines.pop(0)
-                if not self._dialog_lines:
+                    self._line_serial += 1
+                if not self._dialog_lines and graph_node is not None:
+                    self._after_lines()
+                elif not self._dialog_lines:
                     cb = self._on_complete
                     self._dialog_lines = None
                     self._on_complete = None
@@ -107,41 +224,101 @@ class DialogueUI:
             return True
         return False
 
+    def panel_rects(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        # Screen areas covered by draw() in the current state (for dirty-rect rendering)
+        rects = []
+        panel_w = int(surface.get_width() * 0.8)
+        px = (surface.get_width() - panel_w) // 2
+        if self._dialog_lines:
+            rects.append(pygame.Rect(px, surface.get_height() - 100 - 40, panel_w, 100))
+        if self._choice is not None:
+            panel_h = self._choice_height()
+            rects.append(pygame.Rect(px, surface.get_height() - panel_h - 40, panel_w, panel_h))
+        return rects
+
+    def _choice_height(self) -> int:
+        # Prompt, one row per option, hint line
+        return max(120, 40 + 22 * len(self._choice.get("options", [])) + 36)
+
+    def _panel(self, w: int, h: int) -> pygame.Surface:
+        panel = self._panels.get((w, h))
+        if panel is None:
+            panel = self._panels[(w, h)] = pygame.Surface((w, h), pygame.SRCALPHA)
+            panel.fill(Config.COLORS.get("dialog_bg", (0, 0, 0, 180)))
+        return panel
+
+    def _text(self, text: str, color) -> pygame.Surface:
+        key = (text, tuple(color))
+        surf = self._texts.get(key)
+        if surf is None:
+            if len(self._texts) > 256:
+                self._texts.clear()
+            surf = self._texts[key] = self._font.render(text, True, color)
+        return surf
+
+    def _line_surface(self) -> pygame.Surface:
+        # Whole line rendered once, or in typewriter mode a persistent surface onto which
+        # only the glyphs revealed since the last draw are blitted
+        line = self._line_state()
+        color = Config.COLORS.get("dialog_text", (255, 255, 255))
+        text = line["text"]
+        if not self._typewriter:
+            if line["surface"] is None:
+                line["surface"] = self._font.render(text, True, color)
+            return line["surface"]
+        if line["surface"] is None:
+            w, h = self._font.size(text)
+            line["surface"] = pygame.Surface((max(1, w), max(1, h)), pygame.SRCALPHA)
+        shown = int(line["shown"])
+        if shown > line["drawn"]:
+            x = self._font.size(text[:line["drawn"]])[0]
+            line["surface"].blit(self._font.render(text[line["drawn"]:shown], True, color), (x, 0))
+            line["drawn"] = shown
+        return line["surface"]
+
+    def _choice_surfaces(self) -> List[pygame.Surface]:
+        # Option rows, re-rendered only when the choice or the highlighted option changes
+        choice = self._choice
+        cached = self._choice_rows
+        if cached is None or cached["choice"] is not choice or cached["selected"] != choice.get("selected", 0):
+            selected = choice.get("selected", 0)
+            rows = []
+            for i, (label, _act) in enumerate(choice.get("options", [])):
+                color = (255, 235, 120) if i == selected else Config.COLORS.get("dialog_text", (255, 255, 255))
+                rows.append(self._text(f"{'>' if i == selected else ' '} {label}", color))
+            cached = self._choice_rows = {"choice": choice, "selected": selected, "rows": rows}
+        return cached["rows"]
+
     def draw(self, surface: pygame.Surface):
-        # draw dialog (single-line) panel
+        # Per frame this only blits cached surfaces; text is rendered when it changes
         if self._font is None:
             self._font = pygame.font.SysFont("arial", 18)
+        text_color = Config.COLORS.get("dialog_text", (255, 255, 255))
         if self._dialog_lines:
             panel_w = int(surface.get_width() * 0.8)
             panel_h = 100
-            panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-            panel.fill(Config.COLORS.get("dialog_bg", (0, 0, 0, 180)))
             px = (surface.get_width() - panel_w) // 2
             py = surface.get_height() - panel_h - 40
-            surface.blit(panel, (px, py))
-            text_line = str(self._dialog_lines[0])
-            txt = self._font.render(text_line, True, Config.COLORS.get("dialog_text", (255, 255, 255)))
-            surface.blit(txt, (px + 12, py + 12))
-            hint = self._font.render("(Space=Next/Confirm, Esc=Cancel)", True, (220, 220, 220))
+            surface.blit(self._panel(panel_w, panel_h), (px, py))
+            surface.blit(self._line_surface(), (px + 12, py + 12))
+            hint = self._text("(Space=Next/Confirm, Esc=Cancel)", (220, 220, 220))
             surface.blit(hint, (px + panel_w - hint.get_width() - 12, py + panel_h - hint.get_height() - 8))
         # draw choice panel
         if self._choice is not None:
             panel_w = int(surface.get_width() * 0.8)
-            panel_h = 120
-            panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-            panel.fill(Config.COLORS.get("dialog_bg", (0, 0, 0, 180)))
+            panel_h = self._choice_height()
             px = (surface.get_width() - panel_w) // 2
             py = surface.get_height() - panel_h - 40
-            surface.blit(panel, (px, py))
-            prompt = str(self._choice.get("prompt", ""))
-            txt = self._font.render(prompt, True, Config.COLORS.get("dialog_text", (255, 255, 255)))
-            surface.blit(txt, (px + 12, py + 12))
-            opts = self._choice.get("options", [])
-            if len(opts) == 0:
+            surface.blit(self._panel(panel_w, panel_h), (px, py))
+            surface.blit(self._text(str(self._choice.get("prompt", "")), text_color), (px + 12, py + 12))
+            rows = self._choice_surfaces()
+            for i, row in enumerate(rows):
+                surface.blit(row, (px + 24, py + 40 + 22 * i))
+            if len(rows) == 0:
                 opt_text = "(Esc: Cancel)"
-            elif len(opts) == 1:
-                opt_text = f"(Space: {opts[0][0]}  |  Esc: Cancel)"
+            elif len(rows) == 1:
+                opt_text = "(Space: Choose  |  Esc: Cancel)"
             else:
-                opt_text = f"(Space: {opts[0][0]}  |  A: {opts[1][0]}  |  Esc: Cancel)"
-            hint = self._font.render(opt_text, True, (220, 220, 220))
+                opt_text = "(W/S: Select  |  Space: Choose  |  Esc: Cancel)"
+            hint = self._text(opt_text, (220, 220, 220))
             surface.blit(hint, (px + panel_w - hint.get_width() - 12, py + panel_h - hint.get_height() - 8))
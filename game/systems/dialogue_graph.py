@@ -0,0 +1,209 @@
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from game.config import Config
+from game.util.serialization import load_json
+
+
+# Data-driven dialogue (game/data/dialogue/<scene>.json), compiled on first use per scene into
+# a flat node table: node ids and goto targets become list indices, conditions and actions
+# become prebuilt callables, and all strings are interned. DialogueUI walks the table
+# (start_graph), so an interaction allocates no closures.
+#
+# A node runs, in order: "do" actions, then "branch" (first {"if", "goto"} whose condition
+# holds; an entry without "if" always does), then "say" lines, then "choices" or "next".
+# A node with "say" can also set "alt": the node to jump to on CONFIRM_ALT (A) instead.
+# "{name}" in lines, prompts, labels and notifications is filled from the node's variables:
+# level and coins, plus whatever the scene returns from dialogue_vars().
+#
+# Conditions: quest conditions ({"flag"}, {"item"}, all/any/not, see quests.py) plus
+#   {"quest": "id", "stage": "stage_id"}  {"shop_open": true}  {"coins": 5} (at least)
+#   {"var": "name", "min": 1}
+# Actions: {"set_flag": name, "value": v} {"add_item"/"remove_item": id, "qty": n}
+#   {"coins": n} {"upgrade": name} {"xp": n} {"notify": text} {"call": name} (scene method
+#   dialogue_<name>); numbers may also name a variable ("qty": "carrots").
+
+Vars = Dict[str, Any]
+Cond = Callable[[Any], bool]  # (scene) -> bool
+Action = Callable[[Any, Vars], None]  # (scene, vars) -> None
+
+NO_NODE = -1
+
+
+def _text(s: Any) -> str:
+    return sys.intern(str(s))
+
+
+def _is_template(s: str) -> bool:
+    return "{" in s
+
+
+def fill(s: str, variables: Vars) -> str:
+    if not _is_template(s):
+        return s
+    try:
+        return s.format(**variables)
+    except (KeyError, IndexError, ValueError):
+        return s
+
+
+def _amount(v: Any) -> Callable[[Vars], int]:
+    # Constant, or the name of a variable
+    if isinstance(v, str):
+        name = _text(v)
+        return lambda variables: int(variables.get(name, 0))
+    n = int(v)
+    return lambda variables: n
+
+
+def compile_dialogue_condition(spec: Optional[Dict[str, Any]]) -> Optional[Cond]:
+    if not spec:
+        return None
+    if "all" in spec or "any" in spec:
+        parts = [compile_dialogue_condition(s) for s in spec.get("all", spec.get("any")) or []]
+        parts = [p for p in parts if p is not None]
+        if "all" in spec:
+            return lambda scene: all(p(scene) for p in parts)
+        return lambda scene: any(p(scene) for p in parts)
+    if "not" in spec:
+        inner = compile_dialogue_condition(spec["not"])
+        return (lambda scene: not inner(scene)) if inner is not None else (lambda scene: False)
+    if "quest" in spec:
+        from game.systems.quests import quests
+        qid, stage = _text(spec["quest"]), spec.get("stage")
+        return lambda scene: quests.stage(qid) == stage
+    if "shop_open" in spec:
+        from game.systems.schedules import shop_open
+        want = bool(spec["shop_open"])
+        return lambda scene: shop_open() == want
+    if "coins" in spec:
+        from game.util.state import GameState
+        need = int(spec["coins"])
+        return lambda scene: GameState.coins >= need
+    if "var" in spec:
+        name, need = _text(spec["var"]), int(spec.get("min", 1))
+        return lambda scene: int(scene_vars(scene).get(name, 0)) >= need
+    from game.systems.quests import compile_condition
+    pred, _keys = compile_condition(spec)
+    return lambda scene: pred()
+
+
+def compile_action(spec: Dict[str, Any]) -> Action:
+    from game.util.state import GameState
+    if "set_flag" in spec:
+        name, value = _text(spec["set_flag"]), spec.get("value", True)
+        return lambda scene, v: GameState.set_flag(name, value)
+    if "add_item" in spec:
+        item_id, qty = _text(spec["add_item"]), _amount(spec.get("qty", 1))
+        return lambda scene, v: GameState.add_item(item_id, qty(v))
+    if "remove_item" in spec:
+        item_id, qty = _text(spec["remove_item"]), _amount(spec.get("qty", 1))
+        return lambda scene, v: GameState.remove_item(item_id, qty(v))
+    if "coins" in spec:
+        amount = _amount(spec["coins"])
+
+        def _coins(scene, v):
+            GameState.coins += amount(v)
+        return _coins
+    if "upgrade" in spec:
+        name = _text(spec["upgrade"])
+
+        def _upgrade(scene, v):
+            GameState.upgrades[name] = True
+        return _upgrade
+    if "xp" in spec:
+        amount = _amount(spec["xp"])
+        return lambda scene, v: GameState.add_xp(amount(v))
+    if "notify" in spec:
+        text = _text(spec["notify"])
+        return lambda scene, v: scene.events.publish("ui.notify", {"text": fill(text, v)})
+    if "call" in spec:
+        method = _text(f"dialogue_{spec['call']}")
+        return lambda scene, v: getattr(scene, method)()
+    raise ValueError(f"Unknown dialogue action: {spec!r}")
+
+
+def scene_vars(scene) -> Vars:
+    """Variables for text and amounts: level and coins plus the scene's dialogue_vars()."""
+    from game.util.state import GameState
+    variables = {"level": GameState.level, "coins": GameState.coins}
+    extra = getattr(scene, "dialogue_vars", None)
+    if extra is not None:
+        variables.update(extra())
+    return variables
+
+
+class Node:
+    __slots__ = ("id", "actions", "branch", "lines", "prompt", "choices", "next", "alt", "templated")
+
+    def __init__(self, node_id: str):
+        self.id = node_id
+        self.actions: Tuple[Action, ...] = ()
+        self.branch: Tuple[Tuple[Optional[Cond], int], ...] = ()
+        self.lines: Tuple[str, ...] = ()
+        self.prompt: Optional[str] = None
+        self.choices: Tuple[Tuple[str, Optional[Cond], int], ...] = ()
+        self.next = NO_NODE
+        self.alt = NO_NODE
+        self.templated = False  # needs variables (templated text or actions)
+
+    def __repr__(self) -> str:
+        return f"Node({self.id!r})"
+
+
+class DialogueGraph:
+    def __init__(self, nodes: List[Node], entries: Dict[str, int]):
+        self.nodes = nodes
+        self.entries = entries  # interactable tag -> start node index
+        self.index = {n.id: i for i, n in enumerate(nodes)}
+
+    def entry(self, tag: str) -> int:
+        return self.entries.get(tag, NO_NODE)
+
+
+def compile_graph(data: Dict[str, Any]) -> DialogueGraph:
+    raw = data.get("nodes") or {}
+    ids = {nid: i for i, nid in enumerate(raw)}
+
+    def target(nid) -> int:
+        if nid is None:
+            return NO_NODE
+        if nid not in ids:
+            raise ValueError(f"Dialogue goto to unknown node {nid!r}")
+        return ids[nid]
+
+    nodes = []
+    for nid, d in raw.items():
+        node = Node(_text(nid))
+        node.actions = tuple(compile_action(a) for a in d.get("do", []))
+        node.branch = tuple((compile_dialogue_condition(b.get("if")), target(b["goto"])) for b in d.get("branch", []))
+        node.lines = tuple(_text(s) for s in d.get("say", []))
+        node.prompt = _text(d["prompt"]) if d.get("prompt") is not None else None
+        node.choices = tuple((_text(c["text"]), compile_dialogue_condition(c.get("if")), target(c.get("goto")))
+                             for c in d.get("choices", []))
+        node.next = target(d.get("next"))
+        node.alt = target(d.get("alt"))
+        texts = list(node.lines) + [c[0] for c in node.choices] + ([node.prompt] if node.prompt else [])
+        node.templated = bool(node.actions) or any(_is_template(s) for s in texts)
+        nodes.append(node)
+    entries = {_text(tag): target(nid) for tag, nid in (data.get("entries") or {}).items()}
+    return DialogueGraph(nodes, entries)
+
+
+# Compiled graphs by scene key, loaded on first interaction in that scene
+_graphs: Dict[str, Optional[DialogueGraph]] = {}
+
+
+def dialogue_graph(scene_key: str) -> Optional[DialogueGraph]:
+    if scene_key not in _graphs:
+        path = os.path.join(Config.DIALOGUE_DIR, f"{scene_key}.json")
+        try:
+            _graphs[scene_key] = compile_graph(load_json(path))
+        except FileNotFoundError:
+            _graphs[scene_key] = None
+    return _graphs[scene_key]
+
+
+def clear_dialogue_cache():
+    _graphs.clear()
@@ -1,15 +1,18 @@
 import pygame
-from typing import List, Dict, Any, Optional
+from typing import List, Optional
 
 from game.config import Config
+from game.core.records import Interactable
 
 
-def get_closest_interactable(player: dict, interactables: List[Dict[str, Any]], max_dist: int = 48) -> Optional[Dict[str, Any]]:
+def get_closest_interactable(player: dict, interactables: List[Interactable], max_dist: int = 48) -> Optional[Interactable]:
     pr: pygame.Rect = player["rect"]
     closest = None
     best_d2 = (max_dist + 1) ** 2
     for item in interactables:
-        ir: pygame.Rect = item["rect"]
+        if not item.active:
+            continue
+        ir: pygame.Rect = item.rect
         dx = ir.centerx - pr.centerx
         dy = ir.centery - pr.centery
         d2 = dx * dx + dy * dy
@@ -19,13 +22,13 @@ def get_closest_interactable(player: dict, interactables: List[Dict[str, Any]],
     return closest
 
 
-def handle_interaction(player: dict, interactables: List[Dict[str, Any]], input_sys, events_bus) -> str:
+def handle_interaction(player: dict, interactables: List[Interactable], input_sys, events_bus) -> str:
     prompt = None
     item = get_closest_interactable(player, interactables)
     if item is not None:
-        prompt = item.get("prompt")
+        prompt = item.prompt
         if input_sys.was_pressed("INTERACT"):
-            action = item.get("action", {})
+            action = item.action
             if action.get("type") == "scene_change":
                 events_bus.publish("scene.change", {
                     "target": action.get("target"),
@@ -1,6 +1,7 @@
 import math
+import numpy as np
 import pygame
-from typing import List
+from typing import List, Optional, Tuple
 
 from game.config import Config
 
@@ -51,3 +52,145 @@ def move_player(player: dict, input_sys, dt_ms: float, world_colliders: List[pyg
                 rect.bottom = col.top
             elif dy < 0:
                 rect.top = col.bottom
+
+
+def collider_edges(rects: List[pygame.Rect]) -> np.ndarray:
+    """Static rects as an (M, 4) float array of left, top, right, bottom for batched tests."""
+    return np.array([(r.left, r.top, r.right, r.bottom) for r in rects], dtype=np.float64).reshape(-1, 4)
+
+
+def integrate_entities(entities, dt_ms: float):
+    # Batched position update for entities with Transform + Velocity but no Collider (effects,
+    # particles); colliding movers go through move_entities instead
+    dt = dt_ms / 1000.0
+    for arch in entities.query("Transform", "Velocity"):
+        if "Collider" not in arch.signature:
+            arch.column("Transform")[:] += arch.column("Velocity") * dt
+
+
+def wander_entities(entities, dt_ms: float, gen: np.random.Generator, idle_chance: float = 0.3):
+    # Entities with Wander pick a new random heading (or stand still) whenever their timer runs out;
+    # those that also have a Path roam along navigation paths instead (see navigation.roam_entities)
+    for arch in entities.query("Velocity", "Wander"):
+        if "Path" in arch.signature:
+            continue
+        wander = arch.column("Wander")
+        wander[:, 0] -= dt_ms
+        due = np.flatnonzero(wander[:, 0] <= 0.0)
+        if not len(due):
+            continue
+        k = len(due)
+        angle = gen.uniform(0.0, 2.0 * math.pi, k)
+        speed = wander[due, 1] * (gen.random(k) >= idle_chance)
+        vel = arch.column("Velocity")
+        vel[due, 0] = np.cos(angle) * speed
+        vel[due, 1] = np.sin(angle) * speed
+        wander[due, 0] = gen.uniform(1000.0, 4000.0, k)
+
+
+# Movers wider than this many colliders are tested in chunks to bound the (N, M) masks
+_CHUNK = 4096
+
+
+def _resolve_static(pos: np.ndarray, size: np.ndarray, step: np.ndarray, vel: np.ndarray, edges: np.ndarray, axis: int):
+    # Same rule as move_player, per axis: after moving, a mover overlapping a collider is
+    # pushed back to the collider's near side (the closest one if it overlaps several)
+    pos[:, axis] += step
+    if not len(edges):
+        return
+    lo, hi = edges[:, axis], edges[:, axis + 2]
+    for s in range(0, len(pos), _CHUNK):
+        p = pos[s:s + _CHUNK]
+        sz = size[s:s + _CHUNK]
+        d = step[s:s + _CHUNK]
+        hit = ((p[:, 0:1] < edges[:, 2]) & (p[:, 0:1] + sz[:, 0:1] > edges[:, 0])
+               & (p[:, 1:2] < edges[:, 3]) & (p[:, 1:2] + sz[:, 1:2] > edges[:, 1]))
+        rows = np.flatnonzero(hit.any(axis=1))
+        if not len(rows):
+            continue
+        hit = hit[rows]
+        fwd = d[rows] > 0
+        back = d[rows] < 0
+        near_lo = np.where(hit, lo, np.inf).min(axis=1) - sz[rows, axis]
+        near_hi = np.where(hit, hi, -np.inf).max(axis=1)
+        idx = rows + s
+        pos[idx[fwd], axis] = near_lo[fwd]
+        pos[idx[back], axis] = near_hi[back]
+        # Blocked movers stop on that axis until they choose a new heading
+        vel[idx[fwd | back], axis] = 0.0
+
+
+def overlapping_pairs(pos: np.ndarray, size: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sweep and prune: boxes sorted by left edge; box i can only overlap the boxes that start
+    before its right edge, found with one searchsorted. Candidates are then filtered on y.
+    Returns index arrays (i, j) into pos of every overlapping pair.
+    """
+    n = len(pos)
+    if n < 2:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    order = np.argsort(pos[:, 0], kind="stable")
+    left = pos[order, 0]
+    right = left + size[order, 0]
+    end = np.searchsorted(left, right, side="left")
+    counts = np.maximum(end - np.arange(n) - 1, 0)
+    total = int(counts.sum())
+    if not total:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    a = np.repeat(np.arange(n), counts)
+    b = a + 1 + (np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts))
+    i, j = order[a], order[b]
+    top_i, top_j = pos[i, 1], pos[j, 1]
+    keep = (top_i < top_j + size[j, 1]) & (top_j < top_i + size[i, 1]) & (pos[j, 0] < pos[i, 0] + size[i, 0])
+    return i[keep], j[keep]
+
+
+def _separation(pos: np.ndarray, size: np.ndarray) -> np.ndarray:
+    # Push each overlapping pair apart along its axis of least penetration, half each
+    push = np.zeros_like(pos)
+    i, j = overlapping_pairs(pos, size)
+    if not len(i):
+        return push
+    lo = np.maximum(pos[i], pos[j])
+    hi = np.minimum(pos[i] + size[i], pos[j] + size[j])
+    pen = hi - lo
+    axis = (pen[:, 1] < pen[:, 0]).astype(np.int64)
+    depth = pen[np.arange(len(i)), axis] * 0.5
+    centre = (pos[i] + size[i] * 0.5) - (pos[j] + size[j] * 0.5)
+    sign = np.where(centre[np.arange(len(i)), axis] >= 0.0, 1.0, -1.0)
+    np.add.at(push, (i, axis), sign * depth)
+    np.add.at(push, (j, axis), -sign * depth)
+    return push
+
+
+def move_entities(entities, dt_ms: float, edges: np.ndarray, bounds: Optional[pygame.Rect] = None, obstacles: Optional[List[pygame.Rect]] = None):
+    """
+    Batched movement for all entities with Transform + Velocity + Collider. Movers are first
+    separated from each other (sweep and prune), then moved along x and y in turn with
+    move_player's axis-separated resolution against `edges` (see collider_edges) plus any
+    per-frame `obstacles` (e.g. the player), and finally kept inside `bounds`.
+    """
+    archs = entities.query("Transform", "Velocity", "Collider")
+    if not archs:
+        return
+    dt = dt_ms / 1000.0
+    pos = np.concatenate([a.column("Transform") for a in archs])
+    vel = np.concatenate([a.column("Velocity") for a in archs])
+    size = np.concatenate([a.column("Collider") for a in archs])
+    if obstacles:
+        edges = np.concatenate((edges, collider_edges(obstacles)))
+    step = vel * dt + _separation(pos, size)
+    _resolve_static(pos, size, step[:, 0], vel, edges, 0)
+    _resolve_static(pos, size, step[:, 1], vel, edges, 1)
+    if bounds is not None:
+        lo = np.array(bounds.topleft, dtype=np.float64)
+        hi = np.array(bounds.bottomright, dtype=np.float64) - size
+        out = (pos < lo) | (pos > hi)
+        np.clip(pos, lo, hi, out=pos)
+        vel[out] = 0.0
+    start = 0
+    for a in archs:
+        end = start + a.count
+        a.column("Transform")[:] = pos[start:end]
+        a.column("Velocity")[:] = vel[start:end]
+        start = end
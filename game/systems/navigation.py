@@ -0,0 +1,417 @@
+import heapq
+import math
+import queue
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from game.config import Config
+
+
+Cell = Tuple[int, int]
+_SQRT2 = math.sqrt(2.0)
+_DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def _octile(ax: int, ay: int, bx: int, by: int) -> float:
+    dx = abs(ax - bx)
+    dy = abs(ay - by)
+    return (dx + dy) + (_SQRT2 - 2.0) * min(dx, dy)
+
+
+class NavGrid:
+    """
+    Walkability grid baked from a scene's colliders (True = blocked). A cell is blocked when
+    any collider overlaps it, so an agent no larger than a cell standing on a free cell's
+    centre never touches a collider. `version` changes whenever cells change.
+    """
+    def __init__(self, bounds: pygame.Rect, cell_size: int = 32):
+        self.cell = max(1, int(cell_size))
+        self.origin = (bounds.left, bounds.top)
+        self.cols = max(1, (bounds.width + self.cell - 1) // self.cell)
+        self.rows = max(1, (bounds.height + self.cell - 1) // self.cell)
+        self.blocked = np.zeros((self.rows, self.cols), dtype=bool)
+        self.version = 0
+        self._walk: Optional[Tuple[bytearray, int]] = None
+
+    @classmethod
+    def bake(cls, bounds: pygame.Rect, colliders: List[pygame.Rect], cell_size: Optional[int] = None) -> "NavGrid":
+        grid = cls(bounds, cell_size or getattr(Config, "NAV_CELL_SIZE", 32))
+        for r in colliders:
+            grid._raster(r)
+        return grid
+
+    def _span(self, rect: pygame.Rect) -> Optional[Tuple[int, int, int, int]]:
+        # Cells overlapped by rect as (c0, r0, c1, r1), exclusive ends; None if off-grid
+        c, (ox, oy) = self.cell, self.origin
+        c0 = max(0, (rect.left - ox) // c)
+        r0 = max(0, (rect.top - oy) // c)
+        c1 = min(self.cols, (rect.right - 1 - ox) // c + 1)
+        r1 = min(self.rows, (rect.bottom - 1 - oy) // c + 1)
+        if c0 >= c1 or r0 >= r1 or rect.width <= 0 or rect.height <= 0:
+            return None
+        return c0, r0, c1, r1
+
+    def _raster(self, rect: pygame.Rect, clip: Optional[Tuple[int, int, int, int]] = None):
+        span = self._span(rect)
+        if span is None:
+            return
+        c0, r0, c1, r1 = span
+        if clip is not None:
+            c0, r0 = max(c0, clip[0]), max(r0, clip[1])
+            c1, r1 = min(c1, clip[2]), min(r1, clip[3])
+            if c0 >= c1 or r0 >= r1:
+                return
+        self.blocked[r0:r1, c0:c1] = True
+
+    def update_area(self, area: pygame.Rect, colliders: List[pygame.Rect]):
+        """Re-bake only the cells under `area` from the current collider list."""
+        span = self._span(area)
+        if span is None:
+            return
+        c0, r0, c1, r1 = span
+        self.blocked[r0:r1, c0:c1] = False
+        cell_area = pygame.Rect(self.origin[0] + c0 * self.cell, self.origin[1] + r0 * self.cell,
+                                (c1 - c0) * self.cell, (r1 - r0) * self.cell)
+        for r in colliders:
+            if r.colliderect(cell_area):
+                self._raster(r, span)
+        self.version += 1
+        self._walk = None
+
+    def walk_map(self) -> Tuple[bytearray, int]:
+        """Flat walkability (1 = free) with a blocked 1-cell border, and its row width."""
+        if self._walk is None:
+            padded = np.pad(~self.blocked, 1, constant_values=False)
+            self._walk = (bytearray(padded.astype(np.uint8).tobytes()), self.cols + 2)
+        return self._walk
+
+    def walkable(self, cx: int, cy: int) -> bool:
+        return 0 <= cx < self.cols and 0 <= cy < self.rows and not self.blocked[cy, cx]
+
+    def cell_at(self, x: float, y: float) -> Cell:
+        return int((x - self.origin[0]) // self.cell), int((y - self.origin[1]) // self.cell)
+
+    def center(self, cell: Cell) -> Tuple[float, float]:
+        c = self.cell
+        return self.origin[0] + cell[0] * c + c / 2.0, self.origin[1] + cell[1] * c + c / 2.0
+
+    def nearest_walkable(self, cell: Cell, radius: int = 4) -> Optional[Cell]:
+        cx, cy = cell
+        if self.walkable(cx, cy):
+            return cell
+        for r in range(1, radius + 1):
+            for dy in range(-r, r + 1):
+                for dx in (-r, r) if abs(dy) != r else range(-r, r + 1):
+                    if self.walkable(cx + dx, cy + dy):
+                        return cx + dx, cy + dy
+        return None
+
+    def random_cell(self, gen: np.random.Generator, tries: int = 16) -> Optional[Cell]:
+        cx = gen.integers(0, self.cols, tries)
+        cy = gen.integers(0, self.rows, tries)
+        free = np.flatnonzero(~self.blocked[cy, cx])
+        if not len(free):
+            return None
+        return int(cx[free[0]]), int(cy[free[0]])
+
+
+def _neighbours(w: bytearray, W: int, n: int, dx: int, dy: int):
+    # Moves out of flat cell n given the direction we arrived in ((0, 0) at the start).
+    # 8-connected; diagonals only when both adjacent orthogonal cells are free (no corner
+    # cutting). With a direction, moves are pruned as in jump-point search.
+    if not dx and not dy:
+        for ex, ey in _DIRS:
+            if ex and ey:
+                if w[n + ex] and w[n + ey * W] and w[n + ex + ey * W]:
+                    yield ex, ey
+            elif w[n + ex + ey * W]:
+                yield ex, ey
+        return
+    if dx and dy:
+        v = w[n + dy * W]
+        h = w[n + dx]
+        if v:
+            yield 0, dy
+        if h:
+            yield dx, 0
+        if v and h and w[n + dx + dy * W]:
+            yield dx, dy
+    elif dx:
+        up = w[n - W]
+        down = w[n + W]
+        if w[n + dx]:
+            yield dx, 0
+            if up and w[n + dx - W]:
+                yield dx, -1
+            if down and w[n + dx + W]:
+                yield dx, 1
+        if up:
+            yield 0, -1
+        if down:
+            yield 0, 1
+    else:
+        left = w[n - 1]
+        right = w[n + 1]
+        if w[n + dy * W]:
+            yield 0, dy
+            if left and w[n - 1 + dy * W]:
+                yield -1, dy
+            if right and w[n + 1 + dy * W]:
+                yield 1, dy
+        if left:
+            yield -1, 0
+        if right:
+            yield 1, 0
+
+
+def _jump(w: bytearray, W: int, n: int, dx: int, dy: int, goal: int) -> int:
+    # Step from n in direction (dx, dy) until reaching the goal, a cell with a forced
+    # neighbour (a jump point) or a wall (-1). Iterative so long corridors don't recurse.
+    step = dx + dy * W
+    while True:
+        m = n + step
+        if not w[m]:
+            return -1
+        if dx and dy and not (w[n + dx] and w[n + dy * W]):
+            return -1
+        n = m
+        if n == goal:
+            return n
+        if dx and dy:
+            if _jump(w, W, n, dx, 0, goal) >= 0 or _jump(w, W, n, 0, dy, goal) >= 0:
+                return n
+        elif dx:
+            if (w[n - W] and not w[n - dx - W]) or (w[n + W] and not w[n - dx + W]):
+                return n
+        else:
+            dyw = dy * W
+            if (w[n - 1] and not w[n - 1 - dyw]) or (w[n + 1] and not w[n + 1 - dyw]):
+                return n
+
+
+def find_path(grid: NavGrid, start: Cell, goal: Cell, jump: bool = True, max_expanded: int = 20000) -> Optional[List[Cell]]:
+    """
+    A* over the grid from start to goal (cells). With jump=True successors are jump points
+    (JPS), which expands far fewer nodes on open ground; the path is the list of turning
+    cells, each reachable from the previous one in a straight or diagonal line.
+    Returns None if there is no path (or the search gives up after max_expanded nodes).
+    """
+    if not grid.walkable(*start) or not grid.walkable(*goal):
+        return None
+    if start == goal:
+        return [start]
+    w, W = grid.walk_map()
+    s = (start[1] + 1) * W + start[0] + 1
+    t = (goal[1] + 1) * W + goal[0] + 1
+    gx, gy = goal[0] + 1, goal[1] + 1
+    g: Dict[int, float] = {s: 0.0}
+    parent: Dict[int, int] = {s: -1}
+    open_heap = [(_octile(start[0] + 1, start[1] + 1, gx, gy), 0, s)]
+    closed = set()
+    tie = 0
+    while open_heap:
+        _f, _t, n = heapq.heappop(open_heap)
+        if n == t:
+            path = []
+            while n >= 0:
+                path.append((n % W - 1, n // W - 1))
+                n = parent[n]
+            path.reverse()
+            return path
+        if n in closed:
+            continue
+        closed.add(n)
+        if len(closed) > max_expanded:
+            return None
+        x, y = n % W, n // W
+        dx = dy = 0
+        p = parent[n]
+        if jump and p >= 0:
+            px, py = p % W, p // W
+            dx = (x > px) - (x < px)
+            dy = (y > py) - (y < py)
+        base = g[n]
+        for ex, ey in _neighbours(w, W, n, dx, dy):
+            if jump:
+                m = _jump(w, W, n, ex, ey, t)
+                if m < 0:
+                    continue
+            else:
+                m = n + ex + ey * W
+            if m in closed:
+                continue
+            mx, my = m % W, m // W
+            ng = base + _octile(x, y, mx, my)
+            if ng < g.get(m, math.inf):
+                g[m] = ng
+                parent[m] = n
+                tie += 1
+                heapq.heappush(open_heap, (ng + _octile(mx, my, gx, gy), tie, m))
+    return None
+
+
+class PathRequest:
+    """Handle for a queued path search; `path` is set (possibly to None) once `done`."""
+    __slots__ = ("start", "goal", "done", "path")
+
+    def __init__(self, start: Cell, goal: Cell):
+        self.start = start
+        self.goal = goal
+        self.done = False
+        self.path: Optional[List[Cell]] = None
+
+
+class Navigator:
+    """
+    Pathfinding for one scene: the NavGrid, an LRU cache of solved paths keyed by
+    (start cell, goal cell) and a request queue. Queued requests are solved by poll() within
+    a per-frame time budget, or by a worker thread when Config.NAV_WORKER is set. Cached
+    paths are dropped whenever the grid changes.
+    """
+    def __init__(self, grid: NavGrid, cache_size: Optional[int] = None):
+        self.grid = grid
+        self.cache_size = int(cache_size or getattr(Config, "NAV_PATH_CACHE", 512))
+        self._cache: "OrderedDict[Tuple[Cell, Cell], Optional[List[Cell]]]" = OrderedDict()
+        self._cache_version = grid.version
+        self._pending: "queue.Queue[PathRequest]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key: Tuple[Cell, Cell]):
+        with self._lock:
+            if self._cache_version != self.grid.version:
+                self._cache.clear()
+                self._cache_version = self.grid.version
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return True, self._cache[key]
+        return False, None
+
+    def _store(self, key: Tuple[Cell, Cell], path: Optional[List[Cell]]):
+        with self._lock:
+            if self._cache_version != self.grid.version:
+                return
+            self._cache[key] = path
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def find(self, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        """Solve now (or from the cache)."""
+        key = (start, goal)
+        hit, path = self._cached(key)
+        if hit:
+            return path
+        self.misses += 1
+        path = find_path(self.grid, start, goal)
+        self._store(key, path)
+        return path
+
+    def request(self, start: Cell, goal: Cell) -> PathRequest:
+        """Queue a search; cached paths complete immediately."""
+        req = PathRequest(start, goal)
+        hit, path = self._cached((start, goal))
+        if hit:
+            req.path, req.done = path, True
+            return req
+        self._pending.put(req)
+        if getattr(Config, "NAV_WORKER", False):
+            self._ensure_worker()
+        return req
+
+    def poll(self, budget_ms: Optional[float] = None) -> int:
+        """Main thread: solve queued requests until the budget is spent; returns how many."""
+        if self._thread is not None:
+            return 0
+        import time
+        budget = (budget_ms if budget_ms is not None else getattr(Config, "NAV_BUDGET_MS", 2.0)) / 1000.0
+        t0 = time.perf_counter()
+        solved = 0
+        while time.perf_counter() - t0 < budget:
+            try:
+                req = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            req.path = self.find(req.start, req.goal)
+            req.done = True
+            solved += 1
+        return solved
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="navigation", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            req = self._pending.get()
+            if req is None:
+                return
+            try:
+                req.path = self.find(req.start, req.goal)
+            except Exception:
+                req.path = None
+            req.done = True
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._pending.put(None)
+            self._thread.join(1.0)
+        self._thread = None
+
+    def waypoints(self, path: List[Cell]) -> List[Tuple[float, float]]:
+        """Cell path -> world points (cell centres), dropping the start cell."""
+        return [self.grid.center(c) for c in path[1:]]
+
+
+def roam_entities(entities, dt_ms: float, gen: np.random.Generator, nav: Navigator, arrive: float = 2.0):
+    """
+    Entities with Wander + Path walk to random reachable cells: when idle and their Wander
+    timer runs out they request a path, then steer along its waypoints at their Wander speed
+    and rest for a while on arrival. Path holds a list of waypoints or a pending PathRequest.
+    """
+    dt = dt_ms / 1000.0
+    grid = nav.grid
+    for arch in entities.query("Transform", "Velocity", "Collider", "Wander", "Path"):
+        pos = arch.column("Transform")
+        vel = arch.column("Velocity")
+        size = arch.column("Collider")
+        wander = arch.column("Wander")
+        paths = arch.column("Path")
+        wander[:, 0] -= dt_ms
+        for i in range(arch.count):
+            path = paths[i]
+            if isinstance(path, PathRequest):
+                if not path.done:
+                    vel[i] = 0.0
+                    continue
+                path = paths[i] = nav.waypoints(path.path) if path.path else []
+            cx = pos[i, 0] + size[i, 0] / 2.0
+            cy = pos[i, 1] + size[i, 1] / 2.0
+            if not path:
+                vel[i] = 0.0
+                if wander[i, 0] <= 0.0:
+                    wander[i, 0] = gen.uniform(1000.0, 4000.0)
+                    start = grid.nearest_walkable(grid.cell_at(cx, cy))
+                    goal = grid.random_cell(gen)
+                    if start is not None and goal is not None:
+                        paths[i] = nav.request(start, goal)
+                continue
+            speed = wander[i, 1]
+            tx, ty = path[0]
+            dx, dy = tx - cx, ty - cy
+            dist = math.hypot(dx, dy)
+            if dist <= max(arrive, speed * dt):
+                path.pop(0)
+                if not path:
+                    wander[i, 0] = gen.uniform(1000.0, 4000.0)
+                    vel[i] = 0.0
+                continue
+            vel[i, 0] = dx / dist * speed
+            vel[i, 1] = dy / dist * speed
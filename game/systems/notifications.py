@@ -0,0 +1,133 @@
+import re
+from collections import OrderedDict, deque
+from typing import Deque, Optional, Tuple
+
+import pygame
+
+from game.config import Config
+
+
+# HUD notification feed ("ui.notify"). Each message is rendered once (text plus drop shadow
+# on one surface, shared between identical messages through a small LRU) and faded by
+# setting that surface's alpha, so a frame with notifications only blits. Notices live in a
+# bounded deque ordered by their last update, so expiry pops from the left.
+#
+# Coalescing: a delta like "+5 Coins" merges into a recent notice for the same unit and
+# sign ("+5 Coins", "+3 Coins" -> "+8 Coins"); a repeated plain message shows a count
+# ("Quest started! x2"). Either refreshes the notice's timer and moves it to the end.
+
+_DELTA = re.compile(r"^([+-])(\d+)\s+(.+)$")
+
+
+def parse_delta(text: str) -> Optional[Tuple[int, str]]:
+    """("+5 Coins") -> (5, "Coins"); None if the message is not a delta."""
+    m = _DELTA.match(text)
+    if m is None:
+        return None
+    amount = int(m.group(2))
+    return (amount if m.group(1) == "+" else -amount), m.group(3)
+
+
+class Notice:
+    __slots__ = ("key", "text", "amount", "unit", "count", "t0", "surface")
+
+    def __init__(self, text: str, now: int):
+        delta = parse_delta(text)
+        if delta is not None:
+            self.amount, self.unit = delta
+            # "-1 Carrot" and "-2 Carrot(s)" are the same unit; gains and losses stay apart
+            self.key = ("delta", self.unit.replace("(s)", "").rstrip("s"), self.amount > 0)
+        else:
+            self.amount, self.unit = 0, ""
+            self.key = ("text", text)
+        self.text = text
+        self.count = 1
+        self.t0 = now
+        self.surface: Optional[pygame.Surface] = None
+
+    def merge(self, other: "Notice"):
+        if self.key[0] == "delta":
+            self.amount += other.amount
+            if "(s)" in other.unit:
+                self.unit = other.unit  # keep the plural-friendly spelling
+            self.text = f"{'+' if self.amount > 0 else '-'}{abs(self.amount)} {self.unit}"
+        else:
+            self.count += 1
+            self.text = f"{other.text} x{self.count}"
+        self.t0 = other.t0
+        self.surface = None
+
+
+class NotificationFeed:
+    def __init__(self):
+        self.notices: Deque[Notice] = deque(maxlen=int(getattr(Config, "NOTIFY_CAPACITY", 16)))
+        self._surfaces: "OrderedDict[str, pygame.Surface]" = OrderedDict()
+        self._font: Optional[pygame.font.Font] = None
+
+    def __len__(self) -> int:
+        return len(self.notices)
+
+    def push(self, text: str, now: int):
+        notice = Notice(text, now)
+        window = int(getattr(Config, "NOTIFY_COALESCE_MS", 1500))
+        for old in reversed(self.notices):
+            if now - old.t0 > window:
+                break
+            if old.key == notice.key:
+                old.merge(notice)
+                self.notices.remove(old)
+                self.notices.append(old)
+                return
+        self.notices.append(notice)
+
+    def prune(self, now: int):
+        duration = int(getattr(Config, "NOTIFY_DURATION_MS", 2000))
+        notices = self.notices
+        while notices and now - notices[0].t0 > duration:
+            notices.popleft()
+
+    def visible(self):
+        n = int(getattr(Config, "NOTIFY_MAX_VISIBLE", 4))
+        notices = self.notices
+        return list(notices)[-n:] if len(notices) > n else notices
+
+    def row_height(self) -> int:
+        return self.font().get_height() + 4
+
+    def font(self) -> pygame.font.Font:
+        if self._font is None:
+            self._font = pygame.font.SysFont("arial", 18)
+        return self._font
+
+    def _surface(self, text: str) -> pygame.Surface:
+        surf = self._surfaces.get(text)
+        if surf is not None:
+            self._surfaces.move_to_end(text)
+            return surf
+        font = self.font()
+        txt = font.render(text, True, (255, 255, 180))
+        sh = font.render(text, True, (0, 0, 0))
+        surf = pygame.Surface((txt.get_width() + 1, txt.get_height() + 1), pygame.SRCALPHA)
+        surf.blit(sh, (1, 1))
+        surf.blit(txt, (0, 0))
+        self._surfaces[text] = surf
+        if len(self._surfaces) > 64:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def draw(self, screen: pygame.Surface, now: int, y: int = 50):
+        # Recent notifications at top-center stacking downward, fading out before expiry
+        self.prune(now)
+        if not self.notices:
+            return
+        duration = int(getattr(Config, "NOTIFY_DURATION_MS", 2000))
+        fade = max(1, int(getattr(Config, "NOTIFY_FADE_MS", 400)))
+        step = self.row_height()
+        for notice in self.visible():
+            if notice.surface is None:
+                notice.surface = self._surface(notice.text)
+            surf = notice.surface
+            left = duration - (now - notice.t0)
+            surf.set_alpha(255 if left >= fade else max(0, int(255 * left / fade)))
+            screen.blit(surf, ((screen.get_width() - surf.get_width()) // 2, y))
+            y += step
@@ -0,0 +1,187 @@
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from game.config import Config
+from game.util.serialization import load_json
+
+
+# Data-driven quests (game/data/quests.json). A quest is a list of stages, most advanced
+# first; its current stage is the first one whose "when" condition holds (a stage without
+# a condition always holds). Conditions are compiled once into predicates over GameState
+# plus the state keys they read ("flag:<name>", "item:<id>"), and quests are indexed by those
+# keys: GameState change notifications only mark the quests that depend on the changed key,
+# and flush() (once per frame) re-evaluates just those and publishes "quest.updated".
+#
+# Condition forms:
+#   {"flag": "name"}                   flag is truthy ({"flag": "name", "is": value} to compare)
+#   {"item": "id", "min": 1}           at least `min` in the inventory
+#   {"all": [...]} / {"any": [...]} / {"not": {...}}
+
+Predicate = Callable[[], bool]
+
+
+def _always() -> bool:
+    return True
+
+
+def compile_condition(spec: Optional[Dict[str, Any]]) -> Tuple[Predicate, Set[str]]:
+    """Return (predicate, state keys it depends on) for a condition spec."""
+    from game.util.state import GameState
+    if not spec:
+        return _always, set()
+    if "flag" in spec:
+        name = str(spec["flag"])
+        if "is" in spec:
+            want = spec["is"]
+            return (lambda: GameState.flags.get(name) == want), {f"flag:{name}"}
+        return (lambda: bool(GameState.flags.get(name))), {f"flag:{name}"}
+    if "item" in spec:
+        item_id = str(spec["item"])
+        qty = int(spec.get("min", 1))
+        return (lambda: GameState.inventory.get(item_id, 0) >= qty), {f"item:{item_id}"}
+    if "all" in spec or "any" in spec:
+        parts = [compile_condition(s) for s in spec.get("all", spec.get("any")) or []]
+        preds = [p for p, _ in parts]
+        keys = set().union(*(k for _, k in parts)) if parts else set()
+        if "all" in spec:
+            return (lambda: all(p() for p in preds)), keys
+        return (lambda: any(p() for p in preds)), keys
+    if "not" in spec:
+        pred, keys = compile_condition(spec["not"])
+        return (lambda: not pred()), keys
+    raise ValueError(f"Unknown quest condition: {spec!r}")
+
+
+class Stage:
+    __slots__ = ("id", "when", "keys", "status", "journal", "target", "done")
+
+    def __init__(self, d: Dict[str, Any]):
+        self.id = str(d["id"])
+        self.when, self.keys = compile_condition(d.get("when"))
+        self.status = str(d.get("status", ""))
+        self.journal: List[str] = [str(s) for s in d.get("journal", [])]
+        self.target: Optional[str] = d.get("target")
+        self.done = bool(d.get("done", False))
+
+    def __repr__(self) -> str:
+        return f"Stage({self.id!r})"
+
+
+class Quest:
+    __slots__ = ("id", "title", "stages", "keys")
+
+    def __init__(self, d: Dict[str, Any]):
+        self.id = str(d["id"])
+        self.title = str(d.get("title", self.id))
+        self.stages = [Stage(s) for s in d.get("stages", [])]
+        self.keys: Set[str] = set().union(*(s.keys for s in self.stages))
+
+    def evaluate(self) -> Optional[Stage]:
+        for stage in self.stages:
+            if stage.when():
+                return stage
+        return None
+
+
+class QuestLog:
+    def __init__(self):
+        self.quests: Dict[str, Quest] = {}
+        self.order: List[str] = []
+        self.index: Dict[str, List[str]] = {}  # state key -> quests that read it
+        self.current: Dict[str, Optional[Stage]] = {}
+        self.tracked: Optional[str] = None  # quest the minimap waypoint follows
+        self.revision = 0  # bumped whenever any quest changes stage
+        self._dirty: Set[str] = set()
+        self._journal: Optional[List[Tuple[Quest, Stage]]] = None
+        self._events = None
+        self._loaded = False
+
+    def load(self, data: Optional[Dict[str, Any]] = None):
+        if data is None:
+            try:
+                data = load_json(Config.QUESTS_FILE)
+            except Exception:
+                data = {}
+        self.quests = {}
+        self.order = []
+        self.index = {}
+        for d in data.get("quests", []):
+            q = Quest(d)
+            self.quests[q.id] = q
+            self.order.append(q.id)
+            for key in q.keys:
+                self.index.setdefault(key, []).append(q.id)
+        self.tracked = data.get("tracked") or (self.order[0] if self.order else None)
+        self.current = {}
+        self._dirty = set(self.order)
+        self._journal = None
+        self._loaded = True
+        from game.util.state import GameState
+        GameState.listen(self.on_state_changed)
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def on_state_changed(self, key: str):
+        if key == "*":
+            self._dirty.update(self.order)
+        else:
+            self._dirty.update(self.index.get(key, ()))
+
+    def flush(self, events=None) -> int:
+        """Re-evaluate quests whose inputs changed; returns how many changed stage."""
+        self._ensure_loaded()
+        if events is not None:
+            self._events = events
+        if not self._dirty:
+            return 0
+        dirty, self._dirty = self._dirty, set()
+        changed = 0
+        for qid in sorted(dirty):
+            quest = self.quests.get(qid)
+            if quest is None:
+                continue
+            prev = self.current.get(qid)
+            stage = quest.evaluate()
+            if stage is prev and qid in self.current:
+                continue
+            self.current[qid] = stage
+            changed += 1
+            if self._events is not None:
+                self._events.publish("quest.updated", {
+                    "quest": qid,
+                    "stage": stage.id if stage is not None else None,
+                    "prev": prev.id if prev is not None else None,
+                })
+        if changed:
+            self.revision += 1
+            self._journal = None
+        return changed
+
+    def stage(self, quest_id: str) -> Optional[str]:
+        """Current stage id of a quest (pending changes are applied first)."""
+        self.flush()
+        stage = self.current.get(quest_id)
+        return stage.id if stage is not None else None
+
+    def target(self) -> Optional[str]:
+        """Interactable tag the tracked quest currently points at."""
+        self.flush()
+        stage = self.current.get(self.tracked) if self.tracked else None
+        return stage.target if stage is not None else None
+
+    def journal(self) -> List[Tuple[Quest, Stage]]:
+        """(quest, stage) for every quest with journal text, in file order; rebuilt on change."""
+        self.flush()
+        if self._journal is None:
+            out = []
+            for qid in self.order:
+                stage = self.current.get(qid)
+                if stage is not None and stage.journal:
+                    out.append((self.quests[qid], stage))
+            self._journal = out
+        return self._journal
+
+
+# Shared quest log
+quests = QuestLog()
@@ -1,13 +1,34 @@
+import numpy as np
 import pygame
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 
 from game.config import Config
 
 
+_prompt_font: Optional[pygame.font.Font] = None
+_tint_cache: Dict[Tuple, pygame.Surface] = {}
+
+
+def _get_prompt_font() -> pygame.font.Font:
+    global _prompt_font
+    if _prompt_font is None:
+        _prompt_font = pygame.font.SysFont("arial", 18)
+    return _prompt_font
+
+
+def prompt_rect(screen: pygame.Surface, text: str) -> Optional[pygame.Rect]:
+    # Screen area covered by draw_prompt() for this text (None when nothing is drawn)
+    if not text:
+        return None
+    tw, th = _get_prompt_font().size(text)
+    w, h = tw + 12, th + 8
+    return pygame.Rect((screen.get_width() - w) // 2, screen.get_height() - h - 12, w, h)
+
+
 def draw_prompt(screen: pygame.Surface, text: str):
     if not text:
         return
-    font = pygame.font.SysFont("arial", 18)
+    font = _get_prompt_font()
     surf = font.render(text, True, Config.COLORS["prompt_text"]) 
     bg = pygame.Surface((surf.get_width() + 12, surf.get_height() + 8), pygame.SRCALPHA)
     bg.fill((0, 0, 0, 160))
@@ -17,39 +38,182 @@ def draw_prompt(screen: pygame.Surface, text: str):
     screen.blit(surf, (x + 6, y + 4))
 
 
-def draw_world(surface: pygame.Surface, camera, ground_color, roads: List[pygame.Rect], buildings: List[pygame.Rect], fences: List[pygame.Rect], player: Dict[str, Any]):
-    surface.fill(ground_color)
-    # roads/paths first
+# Render queue layers, drawn in this order. Only LAYER_ACTORS is y-sorted (by rect bottom),
+# so things lower on screen overlap things behind them; other layers keep submission order.
+LAYER_GROUND = 0  # roads, soil plots
+LAYER_BUILDINGS = 1
+LAYER_DECOR = 2  # doors, fences, growth bars
+LAYER_ACTORS = 3  # player, NPCs, signs, landmarks
+LAYER_MARKERS = 4  # outlines and labels above the world
+
+_FILL, _RECT, _ELLIPSE, _BLIT = range(4)
+_box_cache: Dict[Tuple, pygame.Surface] = {}
+
+
+def _box_sprite(size: Tuple[int, int], color, border) -> pygame.Surface:
+    # Filled rect with a 1px border, pre-rendered once so boxes go through the batched blit path
+    key = (size, tuple(color), tuple(border))
+    spr = _box_cache.get(key)
+    if spr is None:
+        if len(_box_cache) > 512:
+            _box_cache.clear()
+        spr = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            spr = spr.convert()  # match the display format for fast blits
+        spr.fill(color)
+        pygame.draw.rect(spr, border, spr.get_rect(), 1)
+        _box_cache[key] = spr
+    return spr
+
+
+def _blits(surface: pygame.Surface, batch: List[Tuple[pygame.Surface, pygame.Rect]]):
+    # fblits (pygame 2.1.4+) skips building the list of result rects that blits() returns
+    if hasattr(surface, "fblits"):
+        surface.fblits(batch)
+    else:
+        surface.blits(batch, False)
+
+
+class RenderQueue:
+    """
+    Per-frame list of world-space draw commands. Scenes submit commands with a layer
+    (and optionally a sort y), then flush() culls them against the camera view, sorts
+    by (layer, y, submission order) and executes them in one pass: runs of consecutive
+    blits/boxes go to Surface.fblits (Surface.blits on older pygame), plain filled rects
+    use Surface.fill. HUD elements (prompt, tint, dialog) are still drawn directly.
+    """
+    def __init__(self):
+        self._cmds: List[Tuple] = []
+        self._seq = 0
+        self._ox = 0
+        self._oy = 0
+        self._view = pygame.Rect(0, 0, 0, 0)
+        self.drawn = 0
+        self.culled = 0
+
+    def begin(self, camera):
+        self._cmds = []
+        self._seq = 0
+        self._ox, self._oy = camera.rect.topleft
+        self._view = camera.rect.copy()
+        self.culled = 0
+
+    def _push(self, layer: int, rect: pygame.Rect, y, op: int, a, b, c=0):
+        if not self._view.colliderect(rect):
+            self.culled += 1
+            return
+        if layer == LAYER_ACTORS:
+            y = rect.bottom if y is None else y
+        else:
+            y = 0
+        self._seq += 1
+        self._cmds.append(((layer, y, self._seq), op, a, b.move(-self._ox, -self._oy), c))
+
+    def rect(self, layer: int, rect: pygame.Rect, color, width: int = 0, y=None):
+        self._push(layer, rect, y, _FILL if width == 0 else _RECT, color, rect, width)
+
+    def box(self, layer: int, rect: pygame.Rect, color, border=(0, 0, 0), y=None):
+        """Filled rect with a 1px border (doors, NPC markers, plots)."""
+        self._push(layer, rect, y, _BLIT, _box_sprite(rect.size, color, border), rect)
+
+    def ellipse(self, layer: int, rect: pygame.Rect, color, width: int = 0, y=None):
+        self._push(layer, rect, y, _ELLIPSE, color, rect, width)
+
+    def blit(self, layer: int, image: pygame.Surface, pos: Tuple[int, int], y=None):
+        rect = pygame.Rect(pos, image.get_size())
+        self._push(layer, rect, y, _BLIT, image, rect)
+
+    def flush(self, surface: pygame.Surface) -> int:
+        """Execute and clear the queued commands; returns how many were drawn."""
+        cmds = self._cmds
+        self._cmds = []
+        cmds.sort(key=lambda cmd: cmd[0])
+        batch: List[Tuple[pygame.Surface, pygame.Rect]] = []
+        for _key, op, a, b, c in cmds:
+            if op == _BLIT:
+                batch.append((a, b))
+                continue
+            if batch:
+                _blits(surface, batch)
+                batch = []
+            if op == _FILL:
+                surface.fill(a, b)
+            elif op == _RECT:
+                pygame.draw.rect(surface, a, b, c)
+            else:
+                pygame.draw.ellipse(surface, a, b, c)
+        if batch:
+            _blits(surface, batch)
+        self.drawn = len(cmds)
+        return self.drawn
+
+
+def submit_world(queue: RenderQueue, roads: List[pygame.Rect], buildings: List[pygame.Rect], fences: List[pygame.Rect], player: Optional[Dict[str, Any]]):
     for r in roads:
-        pygame.draw.rect(surface, Config.COLORS["road"], camera.apply(r))
-    # buildings/static props
+        queue.rect(LAYER_GROUND, r, Config.COLORS["road"])
     for b in buildings:
-        pygame.draw.rect(surface, Config.COLORS["building"], camera.apply(b))
-    # fences/field props
+        queue.rect(LAYER_BUILDINGS, b, Config.COLORS["building"])
     for f in fences:
-        pygame.draw.rect(surface, Config.COLORS["fence"], camera.apply(f))
+        queue.rect(LAYER_DECOR, f, Config.COLORS["fence"])
+    if player:
+        queue.rect(LAYER_ACTORS, player["rect"], Config.COLORS["player"])
 
-    # player
+
+def submit_entities(queue: RenderQueue, entities, layer: int = LAYER_ACTORS):
+    # Entities with Transform + Collider + Renderable as bordered boxes; culled per archetype
+    # with one NumPy mask so off-screen crowds cost nothing per entity
+    view = queue._view
+    for arch in entities.query("Transform", "Collider", "Renderable"):
+        pos = arch.column("Transform")
+        size = arch.column("Collider")
+        right = pos[:, 0] + size[:, 0]
+        bottom = pos[:, 1] + size[:, 1]
+        mask = (right > view.left) & (pos[:, 0] < view.right) & (bottom > view.top) & (pos[:, 1] < view.bottom)
+        idx = np.flatnonzero(mask)
+        queue.culled += arch.count - len(idx)
+        if not len(idx):
+            continue
+        boxes = np.concatenate((np.floor(pos[idx]), size[idx]), axis=1).astype(np.int64).tolist()
+        colors = arch.column("Renderable")[idx].tolist()
+        for box, color in zip(boxes, colors):
+            queue.box(layer, pygame.Rect(box), color)
+
+
+def draw_player(surface: pygame.Surface, camera, player: Dict[str, Any]):
     if player:
         pygame.draw.rect(surface, Config.COLORS["player"], camera.apply(player["rect"]))
 
 
-def draw_day_night_tint(surface: pygame.Surface):
+def day_night_tint_color() -> Optional[Tuple[int, int, int, int]]:
     # Import lazily to avoid cycles
     try:
         from game.util.time_of_day import TimeOfDay
     except Exception:
-        return
+        return None
     # Choose tint based on time
     if TimeOfDay.is_night():
-        color = (0, 0, 40, 140)
-    elif TimeOfDay.is_evening():
-        color = (20, 10, 0, 80)
-    else:
+        return (0, 0, 40, 140)
+    if TimeOfDay.is_evening():
+        return (20, 10, 0, 80)
+    return None
+
+
+def draw_day_night_tint(surface: pygame.Surface, area: Optional[pygame.Rect] = None):
+    color = day_night_tint_color()
+    if color is None:
         return
-    overlay = pygame.Surface((surface.get_width(), surface.get_height()), pygame.SRCALPHA)
-    overlay.fill(color)
-    surface.blit(overlay, (0, 0))
+    # Cache the full-screen overlay per colour/size; `area` limits the blit to one region
+    key = (color, surface.get_size())
+    overlay = _tint_cache.get(key)
+    if overlay is None:
+        _tint_cache.clear()
+        overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        overlay.fill(color)
+        _tint_cache[key] = overlay
+    if area is None:
+        surface.blit(overlay, (0, 0))
+    else:
+        surface.blit(overlay, area.topleft, area)
 
 
 def draw_clock(surface: pygame.Surface):
@@ -66,3 +230,78 @@ def draw_clock(surface: pygame.Surface):
     y = 8
     surface.blit(bg, (x, y))
     surface.blit(label, (x + 5, y + 4))
+
+
+def _merge_rects(rects: List[pygame.Rect], bounds: pygame.Rect) -> List[pygame.Rect]:
+    # Clip to the screen and union overlapping rects so each pixel is restored/tinted once
+    out: List[pygame.Rect] = []
+    for r in rects:
+        r = r.clip(bounds)
+        if r.width <= 0 or r.height <= 0:
+            continue
+        merged = True
+        while merged:
+            merged = False
+            for i, o in enumerate(out):
+                if r.colliderect(o):
+                    r = r.union(out.pop(i))
+                    merged = True
+                    break
+        out.append(r)
+    return out
+
+
+class DirtyRectRenderer:
+    """
+    Optional presentation mode (Config.DIRTY_RECTS). Scenes that set
+    supports_dirty_rects keep their static layer in a cached background; each frame
+    only the regions reported by the scene and UI (plus last frame's regions) are
+    restored, redrawn, tinted and presented with pygame.display.update(rects).
+    Anything else (scene change, camera scroll, tint change, full-screen panels)
+    falls back to a full redraw and flip.
+    """
+    def __init__(self):
+        self._background: Optional[pygame.Surface] = None
+        self._key = None
+        self._prev: List[pygame.Rect] = []
+
+    def invalidate(self):
+        self._key = None
+        self._prev = []
+
+    def _full_frame(self, screen: pygame.Surface, scene, debug_ui, dt: float, scene_manager):
+        screen.fill(Config.COLORS["bg"])
+        if scene is not None:
+            scene.draw(screen)
+        debug_ui.draw(screen, dt, scene_manager)
+        pygame.display.flip()
+
+    def render(self, screen: pygame.Surface, scene_manager, debug_ui, dt: float):
+        scene = scene_manager.current
+        ui_rects = debug_ui.dirty_rects(screen, scene_manager)
+        if scene is None or not getattr(scene, "supports_dirty_rects", False) or ui_rects is None:
+            self.invalidate()
+            self._full_frame(screen, scene, debug_ui, dt, scene_manager)
+            return
+        rects = scene.dirty_rects(screen) + ui_rects
+        key = (scene, scene.static_key(), day_night_tint_color(), screen.get_size())
+        if key != self._key or self._background is None:
+            # Rebuild the cached static layer, then present a full frame
+            if self._background is None or self._background.get_size() != screen.get_size():
+                self._background = pygame.Surface(screen.get_size()).convert()
+            self._background.fill(Config.COLORS["bg"])
+            scene.draw_static(self._background)
+            self._key = key
+            self._prev = rects
+            self._full_frame(screen, scene, debug_ui, dt, scene_manager)
+            return
+        dirty = _merge_rects(self._prev + rects, screen.get_rect())
+        self._prev = rects
+        for r in dirty:
+            screen.blit(self._background, r, r)
+        scene.draw_dynamic(screen)
+        for r in dirty:
+            draw_day_night_tint(screen, r)
+        scene.draw_overlay(screen)
+        debug_ui.draw(screen, dt, scene_manager)
+        pygame.display.update(dirty)
@@ -0,0 +1,178 @@
+import glob
+import os
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from game.config import Config
+from game.util.serialization import load_json
+
+
+# Scene connectivity built from every scene JSON: each scene_change trigger or door action
+# is an exit leading to a target scene (and spawn point there). Routes between all pairs of
+# scenes are precomputed once (BFS from every scene, fewest transitions) into a next-exit
+# table, so asking "which exit of this scene leads towards that scene" is a dict lookup.
+# The tables are rebuilt when a scene file changes (checked on refresh(), not per frame).
+
+
+class Exit:
+    __slots__ = ("scene", "tag", "rect", "target", "spawn")
+
+    def __init__(self, scene: str, tag: str, rect: pygame.Rect, target: str, spawn: Optional[str]):
+        self.scene = scene
+        self.tag = tag
+        self.rect = rect
+        self.target = target
+        self.spawn = spawn
+
+    def __repr__(self) -> str:
+        return f"Exit({self.scene}:{self.tag} -> {self.target}:{self.spawn})"
+
+
+class SceneGraph:
+    def __init__(self, scenes_dir: Optional[str] = None):
+        self.scenes_dir = scenes_dir
+        self.exits: Dict[str, List[Exit]] = {}
+        self.spawns: Dict[str, Dict[str, List[int]]] = {}
+        self.tags: Dict[str, str] = {}  # interactable tag -> scene that defines it
+        self._next: Dict[Tuple[str, str], Exit] = {}
+        self._hops: Dict[Tuple[str, str], int] = {}
+        self._signature = None
+        self.version = 0
+
+    def _files(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.scenes_dir or Config.SCENES_DIR, "*.json")))
+
+    def _file_signature(self):
+        sig = []
+        for path in self._files():
+            try:
+                sig.append((path, os.path.getmtime(path)))
+            except OSError:
+                pass
+        return tuple(sig)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild if any scene file was added, removed or changed; returns True if rebuilt."""
+        sig = self._file_signature()
+        if not force and sig == self._signature:
+            return False
+        self._signature = sig
+        self._build()
+        return True
+
+    def invalidate(self):
+        self._signature = None
+
+    def _ensure(self):
+        if self._signature is None:
+            self.refresh()
+
+    def _build(self):
+        exits: Dict[str, List[Exit]] = {}
+        spawns: Dict[str, Dict[str, List[int]]] = {}
+        tags: Dict[str, str] = {}
+        for path in self._files():
+            try:
+                data = load_json(path)
+            except Exception:
+                continue
+            name = data.get("name") or os.path.splitext(os.path.basename(path))[0]
+            spawns[name] = dict(data.get("spawns", {}))
+            out = exits.setdefault(name, [])
+            for t in data.get("triggers", []):
+                on_enter = t.get("on_enter") or {}
+                if on_enter.get("type") == "scene_change" and on_enter.get("target"):
+                    out.append(Exit(name, str(t.get("tag", "")), pygame.Rect(*t["rect"]), on_enter["target"], on_enter.get("spawn")))
+            for it in data.get("interactables", []):
+                tag = str(it.get("tag", ""))
+                tags.setdefault(tag, name)
+                action = it.get("action") or {}
+                if action.get("type") == "scene_change" and action.get("target"):
+                    out.append(Exit(name, tag, pygame.Rect(*it["rect"]), action["target"], action.get("spawn")))
+        # Drop exits into unknown scenes or spawns
+        for name, out in exits.items():
+            exits[name] = [e for e in out if e.target in spawns and (e.spawn is None or e.spawn in spawns[e.target])]
+        # All-pairs routes: BFS from every scene, remembering the first exit taken
+        nxt: Dict[Tuple[str, str], Exit] = {}
+        hops: Dict[Tuple[str, str], int] = {}
+        for src in exits:
+            hops[(src, src)] = 0
+            queue = deque()
+            for e in exits[src]:
+                if (src, e.target) not in hops:
+                    hops[(src, e.target)] = 1
+                    nxt[(src, e.target)] = e
+                    queue.append(e.target)
+            while queue:
+                here = queue.popleft()
+                first = nxt[(src, here)]
+                for e in exits.get(here, []):
+                    if (src, e.target) not in hops:
+                        hops[(src, e.target)] = hops[(src, here)] + 1
+                        nxt[(src, e.target)] = first
+                        queue.append(e.target)
+        self.exits, self.spawns, self.tags = exits, spawns, tags
+        self._next, self._hops = nxt, hops
+        self.version += 1
+
+    def next_exit(self, src: str, dst: str) -> Optional[Exit]:
+        """First exit to take from `src` on a shortest route to `dst` (None if here or unreachable)."""
+        self._ensure()
+        return self._next.get((src, dst))
+
+    def hops(self, src: str, dst: str) -> Optional[int]:
+        self._ensure()
+        return self._hops.get((src, dst))
+
+    def route(self, src: str, dst: str) -> List[str]:
+        """Scenes visited from src to dst, inclusive ([] if unreachable)."""
+        self._ensure()
+        if (src, dst) not in self._hops:
+            return []
+        path = [src]
+        while path[-1] != dst:
+            path.append(self._next[(path[-1], dst)].target)
+        return path
+
+    def locate(self, tag: str) -> Optional[str]:
+        """Scene an interactable tag lives in; scheduled NPCs are wherever their schedule puts them."""
+        self._ensure()
+        if tag.startswith("npc."):
+            from game.systems.schedules import schedules
+            npc_id = tag.split(".", 1)[1]
+            if schedules.has(npc_id):
+                blk = schedules.current.get(npc_id)
+                if blk is None:
+                    from game.util.time_of_day import TimeOfDay
+                    blk = schedules.block_at(npc_id, TimeOfDay.minutes)
+                return blk.scene
+        return self.tags.get(tag)
+
+    def waypoint(self, scene, tag: str) -> Optional[pygame.Rect]:
+        """
+        World rect in the loaded `scene` to guide the player towards `tag`: the target itself
+        when it is here, otherwise the exit that starts the shortest route to it.
+        """
+        self._ensure()
+        target = self.locate(tag)
+        if target is None:
+            return None
+        here = scene.scene_key
+        if target == here:
+            it = scene.tagged.get(tag)
+            return it.rect if it is not None and it.active else None
+        ex = self.next_exit(here, target)
+        if ex is None:
+            return None
+        # Prefer the loaded record (triggers/doors may have been adjusted at load)
+        for t in scene.triggers:
+            if t.tag == ex.tag:
+                return t.rect
+        it = scene.tagged.get(ex.tag)
+        return it.rect if it is not None else ex.rect
+
+
+# Shared scene graph
+scene_graph = SceneGraph()
@@ -0,0 +1,196 @@
+import math
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+from game.config import Config
+from game.util.serialization import load_json
+
+
+# NPC daily schedules (game/data/schedules.json). Each NPC has time blocks starting at a
+# clock time ("08:00") with a scene, an optional named spot in that scene and an activity;
+# a block lasts until the next one starts and the last block wraps past midnight. Lookups
+# are a binary search on the block start minutes.
+#
+# Simulation level of detail: NPCs in the active scene are looked up every frame and walk
+# between spots (BaseScene.update_npcs); everyone else only has their block re-evaluated on
+# coarse ticks (Config.SCHEDULE_TICK_MINUTES) into ScheduleDirector.current.
+
+DAY_MINUTES = 24 * 60
+
+
+def parse_clock(text: str) -> float:
+    h, m = str(text).split(":", 1)
+    return (int(h) % 24) * 60.0 + int(m)
+
+
+def clock_label(minutes: float) -> str:
+    # Same 12h format as TimeOfDay.clock_text()
+    total = int(minutes) % DAY_MINUTES
+    h24, m = total // 60, total % 60
+    h12 = h24 % 12 or 12
+    return f"{h12}:{m:02d} {'AM' if h24 < 12 else 'PM'}"
+
+
+class Block:
+    __slots__ = ("start", "end", "scene", "spot", "activity")
+
+    def __init__(self, start: float, scene: Optional[str], spot: Optional[str], activity: str):
+        self.start = start
+        self.end = start  # set by NpcSchedule once all blocks are known
+        self.scene = scene
+        self.spot = spot
+        self.activity = activity
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "Block":
+        return cls(parse_clock(d["at"]), d.get("scene"), d.get("spot"), str(d.get("activity", "idle")))
+
+    def __repr__(self) -> str:
+        return f"Block({clock_label(self.start)}-{clock_label(self.end)}, {self.scene!r}, {self.activity!r})"
+
+
+class NpcSchedule:
+    def __init__(self, npc_id: str, blocks: List[Block]):
+        self.id = npc_id
+        self.blocks = sorted(blocks, key=lambda b: b.start)
+        self.starts = [b.start for b in self.blocks]
+        for i, b in enumerate(self.blocks):
+            b.end = self.blocks[(i + 1) % len(self.blocks)].start
+
+    def index_at(self, minutes: float) -> int:
+        # Before the first start we are still in the previous day's last block
+        return (bisect_right(self.starts, minutes % DAY_MINUTES) - 1) % len(self.blocks)
+
+    def block_at(self, minutes: float) -> Block:
+        return self.blocks[self.index_at(minutes)]
+
+    def window(self, activity: str) -> Optional[Tuple[float, float]]:
+        """(start, end) minutes of the first block with this activity."""
+        for b in self.blocks:
+            if b.activity == activity:
+                return b.start, b.end
+        return None
+
+
+class ScheduleDirector:
+    """All NPC schedules plus everyone's block as of the last coarse tick."""
+    def __init__(self):
+        self.schedules: Dict[str, NpcSchedule] = {}
+        self.current: Dict[str, Block] = {}
+        self._loaded = False
+        self._tick = None
+
+    def load(self, data: Optional[Dict[str, Any]] = None):
+        if data is None:
+            try:
+                data = load_json(Config.SCHEDULES_FILE)
+            except Exception:
+                data = {}
+        self.schedules = {}
+        for npc_id, blocks in (data.get("npcs") or {}).items():
+            if blocks:
+                self.schedules[npc_id] = NpcSchedule(npc_id, [Block.from_json(b) for b in blocks])
+        self.current = {}
+        self._tick = None
+        self._loaded = True
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def has(self, npc_id: str) -> bool:
+        self._ensure_loaded()
+        return npc_id in self.schedules
+
+    def block_at(self, npc_id: str, minutes: float) -> Optional[Block]:
+        """Exact lookup (used for the active scene and for rules like shop hours)."""
+        self._ensure_loaded()
+        sched = self.schedules.get(npc_id)
+        return sched.block_at(minutes) if sched is not None else None
+
+    def tick(self, minutes: float) -> bool:
+        """Coarse update of every NPC's block; does nothing until the next tick is due."""
+        self._ensure_loaded()
+        step = max(1, int(getattr(Config, "SCHEDULE_TICK_MINUTES", 5)))
+        tick = int(minutes // step)
+        if tick == self._tick:
+            return False
+        self._tick = tick
+        for npc_id, sched in self.schedules.items():
+            self.current[npc_id] = sched.block_at(minutes)
+        return True
+
+    def window(self, npc_id: str, activity: str) -> Optional[Tuple[float, float]]:
+        self._ensure_loaded()
+        sched = self.schedules.get(npc_id)
+        return sched.window(activity) if sched is not None else None
+
+
+# Shared schedules
+schedules = ScheduleDirector()
+
+
+def shop_open(minutes: Optional[float] = None) -> bool:
+    """The shop is open while the shopkeeper's current block is "work"."""
+    if minutes is None:
+        from game.util.time_of_day import TimeOfDay
+        minutes = TimeOfDay.minutes
+    blk = schedules.block_at("shopkeeper", minutes)
+    return blk is not None and blk.activity == "work"
+
+
+def shop_hours_text() -> str:
+    win = schedules.window("shopkeeper", "work")
+    if win is None:
+        return "during the day"
+    return f"{clock_label(win[0])}–{clock_label(win[1])}"
+
+
+class NpcAgent:
+    """
+    A scheduled NPC in the active scene: its interactable record is shown and walked
+    to the current block's spot, or hidden while the schedule puts it elsewhere.
+    """
+    __slots__ = ("id", "record", "home", "block", "pos", "path", "target")
+
+    def __init__(self, npc_id: str, record):
+        self.id = npc_id
+        self.record = record
+        self.home = record.rect.center  # spot used by blocks without a named spot
+        self.block: Optional[Block] = None
+        self.pos = [float(record.rect.centerx), float(record.rect.centery)]
+        self.path: Any = []  # waypoints or a pending navigation PathRequest
+        self.target: Optional[Tuple[float, float]] = None
+
+    def place(self, point: Tuple[float, float]):
+        self.pos = [float(point[0]), float(point[1])]
+        self.record.rect.center = (int(round(self.pos[0])), int(round(self.pos[1])))
+        self.path = []
+        self.target = None
+
+    def walk(self, dt_ms: float, speed: float, nav) -> bool:
+        """Advance along the path; returns True if the NPC moved."""
+        path = self.path
+        if not isinstance(path, list):
+            if not path.done:
+                return False
+            # Cell centres, then the exact spot (no grid path: walk straight there)
+            path = self.path = (nav.waypoints(path.path) if path.path else []) + [self.target]
+        budget = speed * dt_ms / 1000.0
+        moved = False
+        while path and budget > 0:
+            tx, ty = path[0]
+            dx, dy = tx - self.pos[0], ty - self.pos[1]
+            dist = math.hypot(dx, dy)
+            if dist <= budget:
+                self.pos = [tx, ty]
+                budget -= dist
+                path.pop(0)
+            else:
+                self.pos[0] += dx / dist * budget
+                self.pos[1] += dy / dist * budget
+                budget = 0
+            moved = True
+        if moved:
+            self.record.rect.center = (int(round(self.pos[0])), int(round(self.pos[1])))
+        return moved
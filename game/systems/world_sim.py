@@ -0,0 +1,173 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from game.config import Config
+
+
+# Background simulation of persistent scene state (GameState) for scenes that are not
+# loaded. Each simulator catches its state up to "now" in one step and says how many game
+# minutes remain until its next change; WorldSim keeps those due times in a heap keyed on a
+# monotonic game-minute clock, so a frame where nothing is due costs one comparison no
+# matter how many scenes are registered. Lazy simulators are never scheduled and only
+# catch up on demand (catch_up(name)), e.g. when their scene is entered.
+#
+# The active scene simulates itself at full detail; its simulator is skipped while it is
+# active and re-run once the player leaves.
+
+DAY_MINUTES = 24 * 60
+
+
+def growth_left(planted_minutes: float, now_minutes: float, required: Optional[float] = None) -> float:
+    """Game minutes until a crop planted at clock minute `planted_minutes` is ready (<= 0: ready)."""
+    if required is None:
+        required = getattr(Config, "FARM_GROWTH_MINUTES", 300.0)
+    elapsed = (now_minutes - planted_minutes) % DAY_MINUTES
+    return float(required) - elapsed
+
+
+class SceneSim:
+    """Base simulator: catch_up() applies everything due by `minutes` (clock minute of the day)."""
+    lazy = False
+
+    def catch_up(self, minutes: float) -> Optional[float]:
+        """Advance to now; return game minutes until the next change (None: nothing pending)."""
+        return None
+
+
+class FarmSim(SceneSim):
+    # Planted plots in GameState.farming_plots turn "ready" after FARM_GROWTH_MINUTES.
+    # While a loaded save still holds the plots undecoded, peek at a throwaway copy to stay
+    # scheduled (growth_left only sees clock minutes, so a missed due time would lose whole
+    # days); the section is decoded once a crop is actually due
+    def catch_up(self, minutes: float) -> Optional[float]:
+        from game.util.state import GameState
+        pending = GameState.pending_section("farming_plots")
+        if pending is not None:
+            try:
+                peek = pending.get() or {}
+            except Exception:
+                peek = {}
+            left = self._soonest(peek, minutes)
+            if left is None or left > 0:
+                return left
+            GameState.ensure_loaded("farming_plots")
+        return self._soonest(GameState.farming_plots or {}, minutes, apply=True)
+
+    @staticmethod
+    def _soonest(plots: Dict, minutes: float, apply: bool = False) -> Optional[float]:
+        # Minutes until the next planted crop is ready (<= 0 if one already is, unless
+        # `apply` marks those ready)
+        soonest = None
+        for entry in plots.values():
+            if entry.get("state") != "planted" or entry.get("planted_minutes") is None:
+                continue
+            left = growth_left(entry["planted_minutes"], minutes)
+            if left <= 0 and apply:
+                entry["state"] = "ready"
+            elif soonest is None or left < soonest:
+                soonest = left
+        return soonest
+
+
+class ShopSim(SceneSim):
+    # Daily restock and carrot price, rolled once for the current day whenever the shop is
+    # next visited (however many days passed), so RNG draws match one per visited day
+    lazy = True
+
+    @staticmethod
+    def state() -> Dict:
+        # Shop state lives in GameState.flags["shop_state"] so it survives saves
+        from game.util.state import GameState
+        st = GameState.flags.get("shop_state")
+        if not isinstance(st, dict):
+            st = GameState.flags["shop_state"] = {}
+        return st
+
+    def catch_up(self, minutes: float) -> Optional[float]:
+        from game.util.time_of_day import TimeOfDay
+        st = self.state()
+        cur_day = int(getattr(TimeOfDay, 'day', 1))
+        if st.get('day') != cur_day:
+            from game.util.rng import rng
+            st['day'] = cur_day
+            st['seeds_stock'] = 8  # daily seed stock
+            st['carrot_price'] = int(rng.randint(2, 5))
+        return None
+
+
+class WorldSim:
+    def __init__(self):
+        self.sims: Dict[str, SceneSim] = {}
+        self.now = 0.0  # monotonic game minutes since start (not saved)
+        self._last_minutes: Optional[float] = None
+        self._heap: List[Tuple[float, int, str]] = []
+        self._due: Dict[str, Tuple[float, int]] = {}
+        self._seq = 0
+        self._active: Optional[str] = None
+        self._generation = None
+        self.runs = 0
+
+    def register(self, name: str, sim: SceneSim):
+        self.sims[name] = sim
+        self._schedule(name, 0.0)
+
+    def _schedule(self, name: str, in_minutes: Optional[float]):
+        if in_minutes is None or self.sims[name].lazy:
+            self._due.pop(name, None)
+            return
+        self._seq += 1
+        due = (self.now + max(0.0, in_minutes), self._seq)
+        self._due[name] = due
+        heapq.heappush(self._heap, (due[0], due[1], name))
+
+    def _run(self, name: str, minutes: float):
+        self.runs += 1
+        try:
+            left = self.sims[name].catch_up(minutes)
+        except Exception:
+            left = None
+        self._schedule(name, left)
+
+    def catch_up(self, name: str, minutes: Optional[float] = None):
+        """Bring one scene's state up to date now (lazy simulators, scene entry)."""
+        if name not in self.sims:
+            return
+        if minutes is None:
+            from game.util.time_of_day import TimeOfDay
+            minutes = TimeOfDay.minutes
+        self._run(name, minutes)
+
+    def wake_all(self):
+        # Everything may have changed (new game, load): re-run every eager simulator
+        for name, sim in self.sims.items():
+            if not sim.lazy:
+                self._schedule(name, 0.0)
+
+    def advance(self, minutes: float, active: Optional[str] = None, generation=None):
+        """Per frame, after TimeOfDay.advance_ms: run the simulators that are due."""
+        if self._last_minutes is not None:
+            # Clock minutes wrap at midnight and jump on sleep/time skip; both move forward
+            self.now += (minutes - self._last_minutes) % DAY_MINUTES
+        self._last_minutes = minutes
+        if generation != self._generation:
+            self._generation = generation
+            self.wake_all()
+        if active != self._active:
+            left, self._active = self._active, active
+            if left in self.sims:
+                self._schedule(left, 0.0)
+        heap = self._heap
+        while heap and heap[0][0] <= self.now:
+            due, seq, name = heapq.heappop(heap)
+            if self._due.get(name) != (due, seq):
+                continue  # superseded by a later _schedule
+            del self._due[name]
+            if name == self._active:
+                continue  # the loaded scene simulates itself; rescheduled when it is left
+            self._run(name, minutes)
+
+
+# Shared world simulation
+world_sim = WorldSim()
+world_sim.register("farmland", FarmSim())
+world_sim.register("shop_interior", ShopSim())
@@ -0,0 +1,153 @@
+import os
+import queue
+import struct
+import threading
+import zlib
+from datetime import datetime
+from typing import Optional, Tuple
+
+import pygame
+
+from game.config import Config
+
+
+# Frame capture off the main thread. The main thread only copies the frame's pixels
+# (Surface.copy, ~1 ms at 720p); a worker thread scales and PNG-encodes it. Encoding uses
+# zlib directly because zlib releases the GIL while compressing (pygame.image.save holds
+# it for the whole encode, which stalls the game loop for tens of ms).
+
+# Project root (../../.. from this file)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+THUMB_SUFFIX = ".png"
+
+
+def encode_png(surface: pygame.Surface) -> bytes:
+    """Minimal RGB PNG encoder (filter type 0 on every row)."""
+    w, h = surface.get_size()
+    raw = pygame.image.tobytes(surface, "RGB")
+    stride = w * 3
+    rows = b"".join(b"\x00" + raw[y * stride:(y + 1) * stride] for y in range(h))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows, 6))
+            + chunk(b"IEND", b""))
+
+
+def thumbnail_path(save_path: str) -> str:
+    return os.path.splitext(save_path)[0] + THUMB_SUFFIX
+
+
+def _fit(size: Tuple[int, int], box: Tuple[int, int]) -> Tuple[int, int]:
+    scale = min(box[0] / size[0], box[1] / size[1])
+    return max(1, int(size[0] * scale)), max(1, int(size[1] * scale))
+
+
+class CaptureService:
+    """
+    Background frame writer: save thumbnails and clip (burst) recording. Jobs are
+    (frame, path, box) tuples; clip frames are dropped rather than queued when the worker
+    falls behind (see CAPTURE_QUEUE_MAX), thumbnails are always kept.
+    """
+    def __init__(self):
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.clip_dir: Optional[str] = None
+        self.clip_frames = 0
+        self.clip_dropped = 0
+        self._clip_elapsed = 0.0
+
+    # --- worker ---
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="capture", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            frame, path, box = job
+            try:
+                if box is not None and frame.get_size() != box:
+                    frame = pygame.transform.smoothscale(frame, _fit(frame.get_size(), box))
+                data = encode_png(frame)
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except Exception:
+                # Non-fatal: a missing thumbnail/frame is fine
+                pass
+
+    def _submit(self, frame: pygame.Surface, path: str, box: Optional[Tuple[int, int]]):
+        self._ensure_worker()
+        self._jobs.put((frame, path, box))
+
+    # --- thumbnails ---
+    def grab(self, surface: pygame.Surface) -> pygame.Surface:
+        """Main thread: copy the frame's pixels for a later write (no scaling or encoding)."""
+        return surface.copy()
+
+    def write_thumbnail(self, frame: pygame.Surface, save_path: str):
+        """Queue a thumbnail (CAPTURE_THUMB_SIZE) for a save; written next to it as <name>.png."""
+        self._submit(frame, thumbnail_path(save_path), tuple(Config.CAPTURE_THUMB_SIZE))
+
+    # --- clips ---
+    @property
+    def recording(self) -> bool:
+        return self.clip_dir is not None
+
+    def start_clip(self) -> str:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.clip_dir = os.path.join(PROJECT_ROOT, Config.CAPTURE_DIR, f"clip_{stamp}")
+        os.makedirs(self.clip_dir, exist_ok=True)
+        self.clip_frames = 0
+        self.clip_dropped = 0
+        self._clip_elapsed = 0.0
+        return self.clip_dir
+
+    def stop_clip(self) -> Optional[str]:
+        clip_dir, self.clip_dir = self.clip_dir, None
+        return clip_dir
+
+    def toggle_clip(self) -> bool:
+        """Start or stop clip recording; returns True if now recording."""
+        if self.recording:
+            self.stop_clip()
+            return False
+        self.start_clip()
+        return True
+
+    def on_frame(self, surface: pygame.Surface, dt: float):
+        """Call after presenting a frame; grabs one every 1/CAPTURE_CLIP_FPS s while recording."""
+        if self.clip_dir is None:
+            return
+        self._clip_elapsed += dt
+        if self._clip_elapsed < 1000.0 / max(1, Config.CAPTURE_CLIP_FPS):
+            return
+        self._clip_elapsed = 0.0
+        if self._jobs.qsize() >= Config.CAPTURE_QUEUE_MAX:
+            self.clip_dropped += 1
+            return
+        w, h = surface.get_size()
+        scale = Config.CAPTURE_CLIP_SCALE
+        path = os.path.join(self.clip_dir, f"frame_{self.clip_frames:05d}.png")
+        self.clip_frames += 1
+        self._submit(self.grab(surface), path, (max(1, int(w * scale)), max(1, int(h * scale))))
+
+    def close(self, timeout: float = 5.0):
+        """Stop recording and let the worker finish queued writes (bounded wait)."""
+        self.stop_clip()
+        if self._thread is not None and self._thread.is_alive():
+            self._jobs.put(None)
+            self._thread.join(timeout)
+        self._thread = None
+
+
+# Shared capture service
+capture = CaptureService()
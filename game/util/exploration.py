@@ -0,0 +1,213 @@
+import base64
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from game.config import Config
+
+
+def _disc_offsets(radius: int) -> List[Tuple[int, int]]:
+    r2 = radius * radius
+    return [(dx, dy) for dy in range(-radius, radius + 1) for dx in range(-radius, radius + 1) if dx * dx + dy * dy <= r2]
+
+
+def _write_varint(out: bytearray, value: int):
+    while True:
+        b = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        value |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return value, pos
+        shift += 7
+
+
+class ExplorationMap:
+    """
+    Per-scene bit array of explored cells (1 bit per cell of Config.EXPLORE_CELL_SIZE px),
+    with cell (0, 0) at the scene bounds' top-left (x, y).
+    Cells are revealed incrementally: when the player's cell changes by one step only the
+    leading edge of the view disc is tested, and newly revealed cell indices are appended
+    to `log` so a consumer (minimap fog) can catch up without rescanning the whole map.
+    `revealed` counts every reveal and doubles as the map's version. The consumer reads
+    from a cursor in that count (reveals_since) and trims what it has applied; past
+    Config.EXPLORE_LOG_CAP entries the log is dropped and the consumer rebuilds from bits.
+    """
+    # (radius, dx, dy) -> offsets inside the new disc but not the previous one
+    _EDGE_CACHE: Dict[Tuple[int, int, int], List[Tuple[int, int]]] = {}
+
+    def __init__(self, cols: int, rows: int, cell_size: int, x: int = 0, y: int = 0):
+        self.cols = max(1, int(cols))
+        self.rows = max(1, int(rows))
+        self.cell_size = max(1, int(cell_size))
+        self.x = int(x)
+        self.y = int(y)
+        self.bits = bytearray((self.cols * self.rows + 7) // 8)
+        self.log = array('I')  # cell indices of the most recent reveals
+        self.log_start = 0  # value of `revealed` at log[0]
+        self.revealed = 0  # reveals since this map was created/decoded
+        self._last_cell: Optional[Tuple[int, int]] = None
+
+    @classmethod
+    def for_bounds(cls, width: int, height: int, cell_size: int | None = None, x: int = 0, y: int = 0) -> "ExplorationMap":
+        cs = int(cell_size or getattr(Config, "EXPLORE_CELL_SIZE", 32))
+        return cls((int(width) + cs - 1) // cs, (int(height) + cs - 1) // cs, cs, x, y)
+
+    def is_explored(self, cx: int, cy: int) -> bool:
+        if not (0 <= cx < self.cols and 0 <= cy < self.rows):
+            return False
+        i = cy * self.cols + cx
+        return bool(self.bits[i >> 3] & (1 << (i & 7)))
+
+    def _reveal_offsets(self, cx: int, cy: int, offsets) -> int:
+        bits = self.bits
+        cols, rows = self.cols, self.rows
+        added = 0
+        for dx, dy in offsets:
+            x = cx + dx
+            y = cy + dy
+            if 0 <= x < cols and 0 <= y < rows:
+                i = y * cols + x
+                mask = 1 << (i & 7)
+                if not bits[i >> 3] & mask:
+                    bits[i >> 3] |= mask
+                    self.log.append(i)
+                    added += 1
+        self.revealed += added
+        if len(self.log) > getattr(Config, "EXPLORE_LOG_CAP", 4096):
+            # Nobody is draining it: drop it (reveals_since() then asks for a rebuild)
+            self.log = array('I')
+            self.log_start = self.revealed
+        return added
+
+    def reveals_since(self, cursor: int) -> Optional[array]:
+        """Cell indices revealed after `cursor` (a past `revealed`), or None if trimmed away."""
+        if cursor < self.log_start:
+            return None
+        return self.log[cursor - self.log_start:]
+
+    def trim(self, cursor: int):
+        """Forget log entries before `cursor` (the consumer has applied them)."""
+        n = min(len(self.log), cursor - self.log_start)
+        if n > 0:
+            del self.log[:n]
+            self.log_start += n
+
+    def reveal_around(self, x: float, y: float, radius_px: float) -> int:
+        """Reveal cells within radius_px of world point (x, y). Returns count of new cells."""
+        cs = self.cell_size
+        cell = ((int(x) - self.x) // cs, (int(y) - self.y) // cs)
+        last = self._last_cell
+        if cell == last:
+            return 0
+        radius = max(0, int(radius_px) // cs)
+        self._last_cell = cell
+        if last is not None and abs(cell[0] - last[0]) <= 1 and abs(cell[1] - last[1]) <= 1:
+            key = (radius, cell[0] - last[0], cell[1] - last[1])
+            offsets = self._EDGE_CACHE.get(key)
+            if offsets is None:
+                # Offset o from the new cell was already in view if o + step is in the disc
+                prev = set((dx - key[1], dy - key[2]) for dx, dy in _disc_offsets(radius))
+                offsets = [o for o in _disc_offsets(radius) if o not in prev]
+                self._EDGE_CACHE[key] = offsets
+        else:
+            key = (radius, 0, 0)
+            offsets = self._EDGE_CACHE.get(key)
+            if offsets is None:
+                offsets = self._EDGE_CACHE[key] = _disc_offsets(radius)
+        return self._reveal_offsets(cell[0], cell[1], offsets)
+
+    def _cells(self) -> np.ndarray:
+        # One uint8 (0/1) per cell, row-major
+        cells = np.unpackbits(np.frombuffer(bytes(self.bits), dtype=np.uint8), bitorder="little")
+        return cells[:self.cols * self.rows]
+
+    def iter_explored(self):
+        cols = self.cols
+        for i in np.flatnonzero(self._cells()).tolist():
+            yield i % cols, i // cols
+
+    # --- Persistence: run-length or raw bitpacked, whichever is smaller ---
+    def _encode_runs(self) -> bytes:
+        # Alternating run lengths starting with unexplored cells (so a leading 0 if the
+        # first cell is explored); run boundaries are where neighbouring cells differ
+        cells = self._cells()
+        edges = np.flatnonzero(np.diff(cells)) + 1
+        runs = np.diff(np.concatenate(([0], edges, [len(cells)])))
+        out = bytearray()
+        if cells[0]:
+            _write_varint(out, 0)
+        for run in runs.tolist():
+            _write_varint(out, run)
+        return bytes(out)
+
+    def to_dict(self) -> Dict:
+        runs = self._encode_runs()
+        if len(runs) < len(self.bits):
+            fmt, payload = "rle", runs
+        else:
+            fmt, payload = "bits", bytes(self.bits)
+        return {
+            "cols": self.cols,
+            "rows": self.rows,
+            "cell": self.cell_size,
+            "x": self.x,
+            "y": self.y,
+            "fmt": fmt,
+            "data": base64.b64encode(payload).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ExplorationMap":
+        m = cls(int(data.get("cols", 1)), int(data.get("rows", 1)), int(data.get("cell", 32)),
+                int(data.get("x", 0)), int(data.get("y", 0)))
+        payload = base64.b64decode(data.get("data", "") or b"")
+        if data.get("fmt") == "bits":
+            n = min(len(payload), len(m.bits))
+            m.bits[:n] = payload[:n]
+        else:
+            total = m.cols * m.rows
+            runs = []
+            pos = 0
+            i = 0
+            while pos < len(payload) and i < total:
+                run, pos = _read_varint(payload, pos)
+                runs.append(min(run, total - i))
+                i += run
+            # Runs alternate unexplored/explored; expand them and pack back into bits
+            cells = np.zeros(total, dtype=np.uint8)
+            filled = np.repeat(np.arange(len(runs), dtype=np.uint8) & 1, runs)
+            cells[:len(filled)] = filled
+            m.bits[:] = np.packbits(cells, bitorder="little").tobytes()
+        return m
+
+
+def update_exploration(scene) -> None:
+    """Reveal cells around the player in the current scene (cheap when the player stays in a cell)."""
+    if scene is None or not scene.player or not getattr(Config, "FOG_OF_WAR", True):
+        return
+    try:
+        from game.util.state import GameState
+        name = scene.data.get("name") if getattr(scene, "data", None) else scene.name.lower()
+        GameState.ensure_loaded("exploration")
+        m = GameState.exploration.get(name)
+        if m is None:
+            b = scene.bounds
+            m = GameState.exploration[name] = ExplorationMap.for_bounds(b.width, b.height, x=b.x, y=b.y)
+        pr = scene.player["rect"]
+        m.reveal_around(pr.centerx, pr.centery, getattr(Config, "EXPLORE_VIEW_RADIUS", 256))
+    except Exception:
+        pass
@@ -0,0 +1,167 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from game.config import Config
+from game.util.save import SAVE_DIR
+from game.util.save_container import json_default
+from game.util.snapshots import StateTracker, sections_to_save
+
+
+JOURNAL_DIR = os.path.join(SAVE_DIR, "journal")
+BASE_FILE = "base.json"
+LOG_FILE = "log.jsonl"
+HEADER_FILE = "header.json"  # load-menu summary, rewritten on every append/compact
+
+# Sections copied into the header (same fields as a container header, see save._summary_fields)
+_HEADER_SECTIONS = ("scene", "day", "player_name", "player_race", "level")
+
+
+def _read_journal(slot_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild a slot's state: the base snapshot plus every complete log record after it.
+    A torn last line (crash mid-append) and records already folded into the base are skipped.
+    Returns {"name", "created_at", "seq", "sections"} or None if there is no base.
+    """
+    try:
+        with open(os.path.join(slot_dir, BASE_FILE), "r") as f:
+            base = json.load(f)
+    except Exception:
+        return None
+    sections = dict(base.get("sections") or {})
+    seq = int(base.get("seq", 0))
+    updated = base.get("created_at") or ""
+    try:
+        with open(os.path.join(slot_dir, LOG_FILE), "r") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    break
+                if int(rec.get("seq", 0)) <= seq:
+                    continue
+                sections.update(rec.get("d") or {})
+                seq = int(rec["seq"])
+                updated = rec.get("at") or updated
+    except FileNotFoundError:
+        pass
+    except Exception:
+        pass
+    return {"name": base.get("name") or "Autosave", "created_at": updated, "seq": seq, "sections": sections}
+
+
+def load_journal(slot_dir: str) -> Optional[Dict[str, Any]]:
+    """Load a journal slot as a regular save dict (see session.apply_save)."""
+    state = _read_journal(slot_dir)
+    if state is None:
+        return None
+    save = sections_to_save(state["sections"])
+    save["name"] = state["name"]
+    save["created_at"] = state["created_at"]
+    return save
+
+
+def read_journal_header(slot_dir: str) -> Optional[Dict[str, Any]]:
+    """Summary fields of a slot for the load menu, without reading the base or the log."""
+    try:
+        with open(os.path.join(slot_dir, HEADER_FILE), "r") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def list_journal_slots() -> List[str]:
+    try:
+        return [os.path.join(JOURNAL_DIR, d) for d in sorted(os.listdir(JOURNAL_DIR))
+                if os.path.exists(os.path.join(JOURNAL_DIR, d, BASE_FILE))]
+    except Exception:
+        return []
+
+
+class SaveJournal:
+    """
+    Incremental autosave slot: a base snapshot plus an append-only log of changed state
+    sections (see StateTracker). Each autosave appends one small record holding only what
+    changed since the previous one; after JOURNAL_COMPACT_RECORDS records the merged state
+    is written as a new base and the log is truncated. A new session (new game, load)
+    always starts from a fresh base. A small header file next to them holds the load-menu
+    summary, so listing slots never replays the log.
+    """
+    def __init__(self, slot: str = "autosave", name: str = "Autosave"):
+        self.dir = os.path.join(JOURNAL_DIR, slot)
+        self.name = name
+        self.compact_after = max(1, int(getattr(Config, "JOURNAL_COMPACT_RECORDS", 64)))
+        self.interval_ms = float(getattr(Config, "JOURNAL_AUTOSAVE_SECONDS", 30.0)) * 1000.0
+        self.tracker = StateTracker()
+        self._sections: Dict[str, Any] = {}
+        self._seq = 0
+        self._records = 0
+        self._generation: Optional[int] = None
+        self._elapsed = 0.0
+
+    def on_frame(self, dt: float, scene_manager):
+        """Call once per stepped world frame; autosaves every JOURNAL_AUTOSAVE_SECONDS of play."""
+        self._elapsed += dt
+        if self._elapsed >= self.interval_ms:
+            self._elapsed = 0.0
+            self.save(scene_manager)
+
+    def save(self, scene_manager) -> int:
+        """Append what changed since the last save (or write a new base). Returns bytes written."""
+        if scene_manager.world is None:
+            return 0
+        try:
+            if scene_manager.generation != self._generation:
+                self._generation = scene_manager.generation
+                self.tracker.reset()
+                self._sections = dict(self.tracker.capture(scene_manager))
+                return self.compact()
+            delta = self.tracker.capture(scene_manager)
+            if not delta:
+                return 0
+            self._sections.update(delta)
+            self._seq += 1
+            now = datetime.now().isoformat(timespec="seconds")
+            line = json.dumps({"seq": self._seq, "at": now, "d": delta}, separators=(",", ":"), default=json_default) + "\n"
+            with open(os.path.join(self.dir, LOG_FILE), "a") as f:
+                f.write(line)
+            self._write_header(now)
+            self._records += 1
+            if self._records >= self.compact_after:
+                return len(line) + self.compact()
+            return len(line)
+        except Exception:
+            # Non-fatal: the next save starts over from a fresh base
+            self._generation = None
+            return 0
+
+    def _write_header(self, updated: str):
+        header = {name: self._sections.get(name) for name in _HEADER_SECTIONS}
+        header["name"] = self.name
+        header["created_at"] = updated
+        path = os.path.join(self.dir, HEADER_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(header, f, separators=(",", ":"), default=json_default)
+        os.replace(path + ".tmp", path)
+
+    def compact(self) -> int:
+        """Fold the log into a new base snapshot (written atomically) and truncate the log."""
+        os.makedirs(self.dir, exist_ok=True)
+        now = datetime.now().isoformat(timespec="seconds")
+        blob = json.dumps({
+            "name": self.name,
+            "created_at": now,
+            "seq": self._seq,
+            "sections": self._sections,
+        }, separators=(",", ":"), default=json_default)
+        base_path = os.path.join(self.dir, BASE_FILE)
+        tmp = base_path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(blob)
+        os.replace(tmp, base_path)
+        # Records up to self._seq are in the base now; a crash before truncation is harmless
+        open(os.path.join(self.dir, LOG_FILE), "w").close()
+        self._write_header(now)
+        self._records = 0
+        return len(blob)
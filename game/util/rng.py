@@ -0,0 +1,29 @@
+import random
+import zlib
+from typing import Optional
+
+
+# Shared game RNG. Gameplay randomness goes through this instance (not the `random`
+# module) so a session can be reproduced from its seed, e.g. by input replays.
+rng = random.Random()
+_seed = random.SystemRandom().getrandbits(32)
+
+
+def reseed(seed: Optional[int] = None) -> int:
+    """Seed the game RNG (a fresh seed if None) and return the seed used."""
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    global _seed
+    seed = int(seed) & 0xFFFFFFFF
+    rng.seed(seed)
+    _seed = seed
+    return seed
+
+
+def derive_seed(tag: str) -> int:
+    """
+    Seed for a separate random stream (e.g. crowd wandering) derived from the current
+    game seed and `tag`. Drawing from it never advances `rng`, so adding ambient
+    randomness does not change gameplay rolls of an existing replay.
+    """
+    return (_seed * 0x9E3779B1 ^ zlib.crc32(tag.encode("utf-8"))) & 0xFFFFFFFF
@@ -3,12 +3,38 @@ import os
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
+from game.config import Config
+from game.util.capture import capture, thumbnail_path
+from game.util.save_container import (
+    EXTENSION as CONTAINER_EXT,
+    is_container,
+    json_default,
+    read_container,
+    read_save_header,
+    write_container,
+)
+from game.util.save_store import MANIFEST_EXT, SaveStore
+
 
 # Project root (../../.. from this file)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 SAVE_FILE = os.path.join(PROJECT_ROOT, "save_game.json")  # legacy single-slot autosave
 SAVE_DIR = os.path.join(PROJECT_ROOT, "saves")
 
+_store: Optional[SaveStore] = None
+
+
+def get_store() -> SaveStore:
+    """Content-addressed section store behind the "store" save backend (saves/store/)."""
+    global _store
+    if _store is None:
+        _store = SaveStore(SAVE_DIR)
+    return _store
+
+
+def _use_store() -> bool:
+    return getattr(Config, "SAVE_BACKEND", "store") == "store"
+
 
 def _ensure_save_dir():
     try:
@@ -66,10 +92,15 @@ def _slugify(name: str) -> str:
     return slug.strip('-') or 'save'
 
 
-def write_named_save(name: str, data: Dict[str, Any]) -> Optional[str]:
+def write_named_save(name: str, data: Dict[str, Any], thumbnail=None) -> Optional[str]:
     """
     Write a new named save file under SAVE_DIR. The file includes metadata
     fields 'name' and 'created_at' (ISO). Returns the path or None on error.
+    `thumbnail` is a frame from capture.grab(); it is scaled and written as
+    <save>.png in the background.
+    With Config.SAVE_BACKEND == "store" the save is a small manifest whose sections are
+    deduplicated in the save store; otherwise Config.SAVE_FORMAT picks the binary
+    container ("binary") or plain JSON ("json").
     """
     try:
         _ensure_save_dir()
@@ -79,16 +110,34 @@ def write_named_save(name: str, data: Dict[str, Any]) -> Optional[str]:
         payload["name"] = str(name or "Save")
         payload["created_at"] = iso
         # Unique filename prefix with timestamp
-        fname = f"{now.strftime('%Y%m%d-%H%M%S')}_{_slugify(payload['name'])}.json"
+        store = _use_store()
+        binary = getattr(Config, "SAVE_FORMAT", "binary") == "binary"
+        ext = MANIFEST_EXT if store else CONTAINER_EXT if binary else ".json"
+        fname = f"{now.strftime('%Y%m%d-%H%M%S')}_{_slugify(payload['name'])}{ext}"
         fpath = os.path.join(SAVE_DIR, fname)
-        with open(fpath, 'w') as f:
-            json.dump(payload, f)
+        if store:
+            get_store().write(fpath, payload)
+        elif binary:
+            write_container(fpath, payload)
+        else:
+            with open(fpath, 'w') as f:
+                json.dump(payload, f, default=json_default)
+        if thumbnail is not None:
+            capture.write_thumbnail(thumbnail, fpath)
         return fpath
     except Exception:
         return None
 
 
 def load_save_file(path: str) -> Optional[Dict[str, Any]]:
+    if os.path.isdir(path):
+        # Journaled autosave slot (base snapshot + change log)
+        from game.util.journal import load_journal
+        return load_journal(path)
+    if path.lower().endswith(MANIFEST_EXT):
+        return get_store().read(path)
+    if is_container(path):
+        return read_container(path)
     try:
         with open(path, 'r') as f:
             return json.load(f)
@@ -96,32 +145,143 @@ def load_save_file(path: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def delete_named_save(path: str) -> bool:
+    """
+    Delete a named save (or journaled autosave slot). Store manifests release their
+    section blobs; blobs no other save references are removed. Returns True on success.
+    """
+    try:
+        if os.path.isdir(path):
+            import shutil
+            shutil.rmtree(path)
+            return True
+        if os.path.exists(thumbnail_path(path)):
+            os.remove(thumbnail_path(path))
+        if path.lower().endswith(MANIFEST_EXT):
+            return get_store().delete(path)
+        os.remove(path)
+        return True
+    except Exception:
+        return False
+
+
+def _summary_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    # Same fields as a container header
+    gs = data.get('game_state') or {}
+    return {
+        'name': data.get('name'),
+        'created_at': data.get('created_at'),
+        'scene': data.get('scene'),
+        'day': data.get('day'),
+        'player_name': gs.get('player_name'),
+        'player_race': gs.get('player_race'),
+        'level': gs.get('level'),
+    }
+
+
+def _slot(path: str, info: Dict[str, Any], default_name: str, is_autosave: bool) -> Dict[str, Any]:
+    if os.path.isdir(path):
+        mtime = max(os.path.getmtime(os.path.join(path, f)) for f in os.listdir(path))
+        thumb = None
+    else:
+        mtime = os.path.getmtime(path)
+        thumb = thumbnail_path(path)
+    return {
+        'path': path,
+        'name': str(info.get('name') or default_name),
+        'created_at': str(info.get('created_at') or ''),
+        'mtime': mtime,
+        'is_autosave': is_autosave,
+        'player_name': info.get('player_name') or '',
+        'player_race': info.get('player_race') or '',
+        'level': info.get('level') or 1,
+        'thumbnail': thumb,
+    }
+
+
+def migrate_saves() -> int:
+    """
+    Move older named saves to the configured format: legacy saves/*.json (and, with the
+    "store" backend, binary containers) are rewritten as store manifests or containers
+    with the same name and mtime. The source is removed only after the new save reads
+    back. Returns the count migrated.
+    """
+    store = _use_store()
+    if not store and getattr(Config, "SAVE_FORMAT", "binary") != "binary":
+        return 0
+    sources = ('.json', CONTAINER_EXT) if store else ('.json',)
+    migrated = 0
+    try:
+        _ensure_save_dir()
+        for fname in sorted(os.listdir(SAVE_DIR)):
+            if not fname.lower().endswith(sources):
+                continue
+            src = os.path.join(SAVE_DIR, fname)
+            dst = os.path.splitext(src)[0] + (MANIFEST_EXT if store else CONTAINER_EXT)
+            try:
+                data = load_save_file(src)
+                if not data or os.path.exists(dst):
+                    continue
+                if store:
+                    get_store().write(dst, data)
+                else:
+                    write_container(dst, data)
+                if (load_save_file(dst) or {}).get('game_state') is None:
+                    delete_named_save(dst)
+                    continue
+                st = os.stat(src)
+                os.utime(dst, (st.st_atime, st.st_mtime))
+                os.remove(src)
+                migrated += 1
+            except Exception:
+                continue
+    except Exception:
+        pass
+    return migrated
+
+
 def list_save_slots() -> List[Dict[str, Any]]:
     """
     Returns a list of save descriptors sorted by most recent first.
-    Each descriptor: { 'path', 'name', 'created_at', 'mtime', 'is_autosave' }
-    Note: Autosave has been removed; only named saves are listed.
+    Each descriptor: { 'path', 'name', 'created_at', 'mtime', 'is_autosave',
+                       'player_name', 'player_race', 'level', 'thumbnail' }
+    'thumbnail' is the PNG path a thumbnail is (or will be) written to, None for autosaves.
+    Journaled autosave slots are listed with 'is_autosave' set and their directory as 'path'.
     """
     items: List[Dict[str, Any]] = []
     try:
         _ensure_save_dir()
-        # Named saves only
+        # Named saves: manifests/containers only need their header; legacy JSON is parsed whole
         for fname in sorted(os.listdir(SAVE_DIR)):
-            if not fname.lower().endswith('.json'):
-                continue
+            lower = fname.lower()
             path = os.path.join(SAVE_DIR, fname)
             try:
-                data = load_save_file(path) or {}
-                name = str(data.get('name') or os.path.splitext(fname)[0])
-                created_at = str(data.get('created_at') or '')
-                mtime = os.path.getmtime(path)
-                items.append({
-                    'path': path,
-                    'name': name,
-                    'created_at': created_at,
-                    'mtime': mtime,
-                    'is_autosave': False,
-                })
+                if lower.endswith(MANIFEST_EXT):
+                    info = get_store().read_header(path)
+                    if info is None:
+                        continue
+                elif lower.endswith(CONTAINER_EXT):
+                    info = read_save_header(path)
+                    if info is None:
+                        continue
+                elif lower.endswith('.json'):
+                    info = _summary_fields(load_save_file(path) or {})
+                else:
+                    continue
+                items.append(_slot(path, info, os.path.splitext(fname)[0], False))
+            except Exception:
+                continue
+        # Journaled autosaves: their header file (slots written before headers existed are replayed)
+        from game.util.journal import list_journal_slots, read_journal_header
+        for path in list_journal_slots():
+            try:
+                info = read_journal_header(path)
+                if info is None:
+                    data = load_save_file(path) or {}
+                    if not data.get('game_state'):
+                        continue
+                    info = _summary_fields(data)
+                items.append(_slot(path, info, 'Autosave', True))
             except Exception:
                 continue
         # Sort by mtime (descending)
@@ -0,0 +1,162 @@
+import json
+import os
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Binary save container:
+#   MAGIC, <HIH version, header length, section count
+#   header: JSON metadata (name, created_at, scene, player summary) - enough for the load menu
+#   section table: per section <B name length, name, <BIII codec, offset, stored length, raw length
+#   section blobs (offsets relative to the end of the table)
+# Sections hold JSON; "meta" and "game_state" are decoded on load, the rest (LAZY_SECTIONS)
+# stay compressed until the game first needs them.
+MAGIC = b"RPGSAVE\x00"
+VERSION = 1
+EXTENSION = ".rpgsave"
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+
+# GameState entries split into their own sections and decoded on first use
+LAZY_SECTIONS = ("farming_plots", "exploration")
+# Save-dict keys kept in the small eagerly decoded "meta" section
+_META_KEYS = ("scene", "spawn", "player_pos", "time_minutes", "day")
+
+_PREFIX = struct.Struct("<HIH")
+_ENTRY = struct.Struct("<BIII")
+
+
+class LazySection:
+    """A section kept compressed in memory; get() decodes a fresh copy on every call."""
+    __slots__ = ("_blob", "_codec")
+
+    def __init__(self, blob: bytes, codec: int):
+        self._blob = blob
+        self._codec = codec
+
+    def get(self) -> Any:
+        return _decode(self._blob, self._codec)
+
+
+def _encode(value: Any, compress: bool = True) -> Tuple[int, bytes, int]:
+    raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    if compress and len(raw) > 64:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            return CODEC_ZLIB, packed, len(raw)
+    return CODEC_RAW, raw, len(raw)
+
+
+def _decode(blob: bytes, codec: int) -> Any:
+    if codec == CODEC_ZLIB:
+        blob = zlib.decompress(blob)
+    elif codec != CODEC_RAW:
+        raise ValueError(f"Unknown save section codec {codec}")
+    return json.loads(blob.decode("utf-8"))
+
+
+def _resolve(value: Any) -> Any:
+    return value.get() if isinstance(value, LazySection) else value
+
+
+def write_container(path: str, save: Dict[str, Any]) -> None:
+    """Write a save dict (see session.build_save_dict) as a container, atomically."""
+    gs = dict(save.get("game_state") or {})
+    lazy = {name: _resolve(gs.pop(name)) for name in LAZY_SECTIONS if name in gs}
+    meta = {k: save.get(k) for k in _META_KEYS}
+    header = {k: v for k, v in save.items() if k not in _META_KEYS and k != "game_state"}
+    header.update({
+        "scene": save.get("scene"),
+        "day": save.get("day"),
+        "player_name": gs.get("player_name"),
+        "player_race": gs.get("player_race"),
+        "level": gs.get("level"),
+    })
+    sections: List[Tuple[str, Tuple[int, bytes, int]]] = [
+        ("meta", _encode(meta, compress=False)),
+        ("game_state", _encode(gs)),
+    ]
+    sections.extend((name, _encode(value)) for name, value in lazy.items())
+
+    header_raw = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    table = bytearray()
+    blobs = bytearray()
+    for name, (codec, blob, raw_len) in sections:
+        key = name.encode("utf-8")
+        table += bytes([len(key)]) + key + _ENTRY.pack(codec, len(blobs), len(blob), raw_len)
+        blobs += blob
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + _PREFIX.pack(VERSION, len(header_raw), len(sections)))
+        f.write(header_raw)
+        f.write(table)
+        f.write(blobs)
+    os.replace(tmp, path)
+
+
+def _read_prefix(f) -> Tuple[Dict[str, Any], int]:
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a save container")
+    version, header_len, count = _PREFIX.unpack(f.read(_PREFIX.size))
+    if version > VERSION:
+        raise ValueError(f"Save container version {version} is newer than supported ({VERSION})")
+    return json.loads(f.read(header_len).decode("utf-8")), count
+
+
+def is_container(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except Exception:
+        return False
+
+
+def read_save_header(path: str) -> Optional[Dict[str, Any]]:
+    """Metadata only (name, created_at, scene, day, player_name, player_race, level)."""
+    try:
+        with open(path, "rb") as f:
+            header, _count = _read_prefix(f)
+        return header
+    except Exception:
+        return None
+
+
+def read_container(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a container as a save dict. LAZY_SECTIONS come back as LazySection values inside
+    game_state; GameState.from_dict keeps them compressed until they are first used.
+    """
+    try:
+        with open(path, "rb") as f:
+            header, count = _read_prefix(f)
+            entries = []
+            for _ in range(count):
+                n = f.read(1)[0]
+                name = f.read(n).decode("utf-8")
+                entries.append((name,) + _ENTRY.unpack(f.read(_ENTRY.size)))
+            data = f.read()
+    except Exception:
+        return None
+    save: Dict[str, Any] = dict(header)
+    gs: Dict[str, Any] = {}
+    lazy: Dict[str, LazySection] = {}
+    for name, codec, offset, length, _raw_len in entries:
+        blob = data[offset:offset + length]
+        if name == "meta":
+            save.update(_decode(blob, codec))
+        elif name == "game_state":
+            gs.update(_decode(blob, codec))
+        else:
+            lazy[name] = LazySection(blob, codec)
+    gs.update(lazy)
+    save["game_state"] = gs
+    return save
+
+
+def json_default(value: Any) -> Any:
+    """json.dump(default=...) hook for save dicts that may still hold LazySection values."""
+    if isinstance(value, LazySection):
+        return value.get()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from game.util.save_container import _META_KEYS, CODEC_RAW, CODEC_ZLIB, LAZY_SECTIONS, LazySection
+
+
+# Content-addressed save store. A named save is a small JSON manifest in SAVE_DIR holding
+# the metadata header, small sections inline and sha1 references to larger sections. Each
+# unique section is stored once under store/blobs/<2 hex>/<sha1> and reference counted in
+# store/index.json, so near-identical saves share their inventory/flags/plots/map blobs.
+MANIFEST_EXT = ".rpgref"
+FORMAT = "rpgstore"
+VERSION = 1
+INLINE_MAX = 256  # sections up to this many JSON bytes live in the manifest itself
+
+
+class LazyGroup(LazySection):
+    """Dict of sections (e.g. per-scene exploration maps) decoded together on first use."""
+    __slots__ = ("_parts",)
+
+    def __init__(self, parts: Dict[str, Any]):
+        super().__init__(b"", CODEC_RAW)
+        self._parts = parts
+
+    def get(self) -> Any:
+        return {k: (v.get() if isinstance(v, LazySection) else v) for k, v in self._parts.items()}
+
+
+def _canonical(value: Any) -> bytes:
+    if isinstance(value, LazySection):
+        value = value.get()
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def split_save(save: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Split a save dict into (header, sections). Dict-valued GameState entries and each
+    scene's exploration map become their own sections so unchanged ones dedupe across saves.
+    """
+    gs = dict(save.get("game_state") or {})
+    sections: Dict[str, Any] = {"meta": {k: save.get(k) for k in _META_KEYS}}
+    exploration = gs.pop("exploration", None) or {}
+    if isinstance(exploration, LazySection):
+        exploration = exploration.get()
+    for scene, emap in exploration.items():
+        sections[f"exploration/{scene}"] = emap
+    for key in list(gs):
+        if isinstance(gs[key], (dict, LazySection)):
+            sections[f"gs/{key}"] = gs.pop(key)
+    sections["game_state"] = gs
+    header = {k: v for k, v in save.items() if k not in _META_KEYS and k != "game_state"}
+    header.update({
+        "scene": save.get("scene"),
+        "day": save.get("day"),
+        "player_name": gs.get("player_name"),
+        "player_race": gs.get("player_race"),
+        "level": gs.get("level"),
+    })
+    return header, sections
+
+
+class SaveStore:
+    def __init__(self, manifest_dir: str, root: Optional[str] = None):
+        self.manifest_dir = manifest_dir
+        self.root = root or os.path.join(manifest_dir, "store")
+        self.blob_dir = os.path.join(self.root, "blobs")
+        self.index_path = os.path.join(self.root, "index.json")
+        self._refs: Optional[Dict[str, int]] = None
+
+    # --- index / reference counts ---
+    def _manifests(self) -> List[str]:
+        try:
+            return sorted(f for f in os.listdir(self.manifest_dir) if f.endswith(MANIFEST_EXT))
+        except Exception:
+            return []
+
+    def _refs_loaded(self) -> Dict[str, int]:
+        if self._refs is not None:
+            return self._refs
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            if index.get("manifests") == self._manifests():
+                self._refs = {k: int(v) for k, v in (index.get("refs") or {}).items()}
+                return self._refs
+        except Exception:
+            pass
+        # Missing/stale index (e.g. a crash mid-write or files removed by hand): rebuild
+        self.gc()
+        return self._refs
+
+    def _save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        blob = json.dumps({"manifests": self._manifests(), "refs": self._refs}, separators=(",", ":"))
+        _write_atomic(self.index_path, blob.encode("utf-8"))
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def gc(self) -> int:
+        """Recount references from the manifests on disk and delete unreferenced blobs."""
+        refs: Dict[str, int] = {}
+        for fname in self._manifests():
+            manifest = self._read_manifest(os.path.join(self.manifest_dir, fname))
+            for digest in (manifest or {}).get("blobs", {}).values():
+                refs[digest] = refs.get(digest, 0) + 1
+        removed = 0
+        try:
+            for sub in os.listdir(self.blob_dir):
+                subdir = os.path.join(self.blob_dir, sub)
+                for digest in os.listdir(subdir):
+                    if digest not in refs:
+                        os.remove(os.path.join(subdir, digest))
+                        removed += 1
+                if not os.listdir(subdir):
+                    os.rmdir(subdir)
+        except FileNotFoundError:
+            pass
+        self._refs = refs
+        self._save_index()
+        return removed
+
+    # --- write / read / delete ---
+    def write(self, path: str, save: Dict[str, Any]) -> str:
+        """Store a save dict; `path` is the manifest path (…/name.rpgref)."""
+        refs = self._refs_loaded()
+        header, sections = split_save(save)
+        inline: Dict[str, Any] = {}
+        blobs: Dict[str, str] = {}
+        for name, value in sections.items():
+            raw = _canonical(value)
+            if len(raw) <= INLINE_MAX:
+                inline[name] = json.loads(raw)
+                continue
+            digest = hashlib.sha1(raw).hexdigest()
+            bpath = self._blob_path(digest)
+            if not os.path.exists(bpath):
+                os.makedirs(os.path.dirname(bpath), exist_ok=True)
+                packed = zlib.compress(raw, 6)
+                if len(packed) < len(raw):
+                    _write_atomic(bpath, bytes([CODEC_ZLIB]) + packed)
+                else:
+                    _write_atomic(bpath, bytes([CODEC_RAW]) + raw)
+            blobs[name] = digest
+        old = self._read_manifest(path) if os.path.exists(path) else None
+        manifest = {"format": FORMAT, "version": VERSION, "header": header, "inline": inline, "blobs": blobs}
+        _write_atomic(path, json.dumps(manifest, separators=(",", ":")).encode("utf-8"))
+        for digest in blobs.values():
+            refs[digest] = refs.get(digest, 0) + 1
+        if old is not None:
+            # Overwrote an existing manifest: drop its references (blobs shared with the new one survive)
+            self._release(old.get("blobs") or {})
+        self._save_index()
+        return path
+
+    def _read_manifest(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r") as f:
+                manifest = json.load(f)
+        except Exception:
+            return None
+        if manifest.get("format") != FORMAT or int(manifest.get("version", 0)) > VERSION:
+            return None
+        return manifest
+
+    def read_header(self, path: str) -> Optional[Dict[str, Any]]:
+        manifest = self._read_manifest(path)
+        return None if manifest is None else manifest.get("header") or {}
+
+    def _blob(self, digest: str) -> LazySection:
+        with open(self._blob_path(digest), "rb") as f:
+            data = f.read()
+        return LazySection(data[1:], data[0])
+
+    def read(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a save dict. farming_plots/exploration come back as LazySection values
+        (see GameState.ensure_loaded); the rest is decoded now.
+        """
+        manifest = self._read_manifest(path)
+        if manifest is None:
+            return None
+        try:
+            parts: Dict[str, Any] = dict(manifest.get("inline") or {})
+            for name, digest in (manifest.get("blobs") or {}).items():
+                parts[name] = self._blob(digest)
+        except Exception:
+            return None
+        save: Dict[str, Any] = dict(manifest.get("header") or {})
+        meta = parts.pop("meta", {})
+        save.update(meta.get() if isinstance(meta, LazySection) else meta)
+        gs = parts.pop("game_state", {})
+        gs = dict(gs.get() if isinstance(gs, LazySection) else gs)
+        maps: Dict[str, Any] = {}
+        for name, value in parts.items():
+            if name.startswith("exploration/"):
+                maps[name[len("exploration/"):]] = value
+            elif name.startswith("gs/"):
+                key = name[3:]
+                if isinstance(value, LazySection) and key not in LAZY_SECTIONS:
+                    value = value.get()
+                gs[key] = value
+        gs["exploration"] = LazyGroup(maps)
+        save["game_state"] = gs
+        return save
+
+    def delete(self, path: str) -> bool:
+        """Remove a manifest and drop its blob references; blobs reaching zero are deleted."""
+        self._refs_loaded()
+        manifest = self._read_manifest(path)
+        try:
+            os.remove(path)
+        except Exception:
+            return False
+        self._release((manifest or {}).get("blobs") or {})
+        self._save_index()
+        return True
+
+    def _release(self, blobs: Dict[str, str]):
+        refs = self._refs_loaded()
+        for digest in blobs.values():
+            n = refs.get(digest, 0) - 1
+            if n > 0:
+                refs[digest] = n
+                continue
+            refs.pop(digest, None)
+            try:
+                os.remove(self._blob_path(digest))
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        count = 0
+        size = 0
+        try:
+            for sub in os.listdir(self.blob_dir):
+                for digest in os.listdir(os.path.join(self.blob_dir, sub)):
+                    count += 1
+                    size += os.path.getsize(os.path.join(self.blob_dir, sub, digest))
+        except FileNotFoundError:
+            pass
+        return {"blobs": count, "bytes": size, "manifests": len(self._manifests())}
@@ -0,0 +1,216 @@
+import copy
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from game.config import Config
+from game.util.save_container import LazySection
+from game.util.state import GameState
+from game.util.time_of_day import TimeOfDay
+
+
+# GameState attributes captured as-is (same keys as GameState.to_dict)
+_GS_SECTIONS = (
+    "coins", "inventory", "flags", "upgrades", "farming_plots",
+    "player_name", "player_race", "stats", "hp_current", "level", "xp", "unspent_points", "equipment",
+)
+
+
+class StateTracker:
+    """
+    Captures the simulation state (GameState, TimeOfDay, world scene and player position)
+    as named sections and returns only the sections that changed since the previous capture.
+    Live values are compared against the last captured copy, so unchanged sections cost an
+    equality check instead of a rebuild. Exploration maps are re-encoded only when their
+    reveal count grew. Sections still compressed from a save container are captured as their
+    LazySection without decoding. Captured values are never mutated afterwards and may be shared.
+    """
+    def __init__(self):
+        self._last: Dict[str, Any] = {}
+        self._explore_seen: Dict[str, Tuple[Any, int]] = {}
+
+    def reset(self):
+        # Forget the baseline: the next capture returns every section
+        self._last = {}
+        self._explore_seen = {}
+
+    def _live_scene(self, scene_manager) -> Tuple[Optional[str], Optional[List[int]]]:
+        curr = scene_manager.world if scene_manager is not None else None
+        if curr is None:
+            return None, None
+        name = curr.data.get("name", curr.name.lower()) if getattr(curr, "data", None) else curr.name.lower()
+        pos = None
+        if curr.player:
+            pr = curr.player["rect"]
+            pos = [pr.x, pr.y]
+        return name, pos
+
+    def _capture_exploration(self, changed: Dict[str, Any]):
+        pending = GameState.pending_section("exploration")
+        if pending is not None:
+            if self._last.get("exploration") is not pending:
+                self._last["exploration"] = changed["exploration"] = pending
+            return
+        maps = GameState.exploration or {}
+        prev = self._last.get("exploration")
+        if isinstance(prev, LazySection):
+            prev = None
+        seen = self._explore_seen
+        section: Dict[str, Any] = {}
+        dirty = prev is None or len(prev) != len(maps)
+        for name, m in maps.items():
+            mark = seen.get(name)
+            if prev is not None and name in prev and mark is not None and mark[0] is m and mark[1] == m.revealed:
+                section[name] = prev[name]
+            else:
+                section[name] = m.to_dict()
+                seen[name] = (m, m.revealed)
+                dirty = True
+        if dirty:
+            self._explore_seen = {name: seen[name] for name in maps}
+            self._last["exploration"] = section
+            changed["exploration"] = section
+
+    def capture(self, scene_manager=None) -> Dict[str, Any]:
+        """Return {section: value} for sections that changed since the last capture."""
+        last = self._last
+        changed: Dict[str, Any] = {}
+        for name in _GS_SECTIONS:
+            pending = GameState.pending_section(name)
+            if pending is not None:
+                # Still compressed from a save container: unchanged until decoded
+                if last.get(name) is not pending:
+                    last[name] = changed[name] = pending
+                continue
+            live = getattr(GameState, name, None)
+            if name not in last or last[name] != live:
+                value = copy.deepcopy(live)
+                last[name] = value
+                changed[name] = value
+        self._capture_exploration(changed)
+        scene, pos = self._live_scene(scene_manager)
+        live_misc = {
+            "time_minutes": TimeOfDay.minutes,
+            "day": getattr(TimeOfDay, "day", 1),
+            "scene": scene,
+            "player_pos": pos,
+        }
+        for name, live in live_misc.items():
+            if name not in last or last[name] != live:
+                last[name] = live
+                changed[name] = live
+        return changed
+
+
+def sections_to_save(sections: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a full set of captured sections into a save dict for session.apply_save()."""
+    gs = {}
+    for name in _GS_SECTIONS + ("exploration",):
+        if name in sections:
+            value = sections[name]
+            # LazySection values pass through and stay lazy in GameState.from_dict
+            gs[name] = value if isinstance(value, LazySection) else copy.deepcopy(value)
+    return {
+        "scene": sections.get("scene") or "town",
+        "spawn": None if sections.get("player_pos") else "start",
+        "player_pos": list(sections["player_pos"]) if sections.get("player_pos") else None,
+        "time_minutes": sections.get("time_minutes"),
+        "day": sections.get("day"),
+        "game_state": gs,
+    }
+
+
+class SnapshotRing:
+    """
+    Bounded ring of state snapshots taken every `interval` world frames. Every `keyframe_every`-th
+    snapshot holds all sections; the rest hold only the sections that changed (from StateTracker).
+    Restoring a point merges the nearest keyframe with the deltas after it. When the oldest
+    keyframe falls off the ring, the next snapshot is promoted to a keyframe.
+    """
+    def __init__(self, capacity: int = None, interval: int = None, keyframe_every: int = None):
+        self.capacity = max(2, int(capacity or getattr(Config, "SNAPSHOT_CAPACITY", 240)))
+        self.interval = max(1, int(interval or getattr(Config, "SNAPSHOT_INTERVAL_FRAMES", 30)))
+        self.keyframe_every = max(1, int(keyframe_every or getattr(Config, "SNAPSHOT_KEYFRAME_EVERY", 20)))
+        self.tracker = StateTracker()
+        # entries: {"t": world ms, "key": bool, "data": sections}
+        self.entries: Deque[Dict[str, Any]] = deque()
+        self._frames = 0
+        self._t_ms = 0.0
+        self._since_key = 0
+        self._generation: Optional[int] = None
+
+    def clear(self):
+        self.entries.clear()
+        self.tracker.reset()
+        self._since_key = 0
+
+    def on_frame(self, dt: float, scene_manager):
+        """Call once per stepped world frame."""
+        if scene_manager.generation != self._generation:
+            # New game or load: earlier snapshots belong to another session
+            self._generation = scene_manager.generation
+            self.clear()
+        self._t_ms += dt
+        self._frames += 1
+        if self._frames % self.interval == 0 and scene_manager.world is not None:
+            self.take(scene_manager)
+
+    def take(self, scene_manager):
+        if not self.entries or self._since_key >= self.keyframe_every:
+            self.tracker.reset()
+            self._since_key = 0
+        key = self._since_key == 0
+        self.entries.append({"t": self._t_ms, "key": key, "data": self.tracker.capture(scene_manager)})
+        self._since_key += 1
+        while len(self.entries) > self.capacity:
+            old = self.entries.popleft()
+            nxt = self.entries[0]
+            if not nxt["key"]:
+                merged = dict(old["data"])
+                merged.update(nxt["data"])
+                nxt["data"] = merged
+                nxt["key"] = True
+
+    def state_at(self, index: int) -> Dict[str, Any]:
+        """Full sections for the snapshot at `index` (negative indices count from newest)."""
+        entries = self.entries
+        if index < 0:
+            index += len(entries)
+        start = index
+        while start > 0 and not entries[start]["key"]:
+            start -= 1
+        merged: Dict[str, Any] = {}
+        for i in range(start, index + 1):
+            merged.update(entries[i]["data"])
+        return merged
+
+    def index_before(self, seconds_back: float) -> Optional[int]:
+        """Newest snapshot at least `seconds_back` of world time old (or the oldest retained)."""
+        if not self.entries:
+            return None
+        target = self._t_ms - seconds_back * 1000.0
+        for i in range(len(self.entries) - 1, -1, -1):
+            if self.entries[i]["t"] <= target:
+                return i
+        return 0
+
+    def restore(self, scene_manager, index: int):
+        """Restore the world to snapshot `index`; later snapshots are dropped (timeline branches)."""
+        from game.core.session import apply_save
+        if index < 0:
+            index += len(self.entries)
+        sections = self.state_at(index)
+        t = self.entries[index]["t"]
+        while len(self.entries) > index + 1:
+            self.entries.pop()
+        apply_save(scene_manager, sections_to_save(sections))
+        self._generation = scene_manager.generation
+        self._t_ms = t
+        # Next snapshot re-baselines against the restored state
+        self._since_key = self.keyframe_every
+
+    def rewind(self, scene_manager, seconds_back: float) -> bool:
+        index = self.index_before(seconds_back)
+        if index is None:
+            return False
+        self.restore(scene_manager, index)
+        return True
@@ -0,0 +1,57 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+import pygame
+
+
+def item_rect(item: Any) -> pygame.Rect:
+    # Drawables are plain Rects or records with a .rect (see game.core.records)
+    return item if isinstance(item, pygame.Rect) else item.rect
+
+
+class SpatialGrid:
+    """
+    Uniform grid over static world rects. Each item is registered in every cell its rect
+    touches; query(area) returns the items overlapping `area` in insertion order, so
+    callers keep their draw order. Cost is proportional to the cells covered by the
+    query, not to the number of items in the scene.
+    """
+    def __init__(self, cell_size: int = 256):
+        self.cell = max(1, int(cell_size))
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._items: List[Any] = []
+        self._rects: List[pygame.Rect] = []
+
+    @classmethod
+    def from_items(cls, items: Iterable[Any], cell_size: int = 256) -> "SpatialGrid":
+        grid = cls(cell_size)
+        for item in items:
+            grid.insert(item, item_rect(item))
+        return grid
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _span(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        c = self.cell
+        return rect.left // c, rect.top // c, (rect.right - 1) // c, (rect.bottom - 1) // c
+
+    def insert(self, item: Any, rect: pygame.Rect):
+        idx = len(self._items)
+        self._items.append(item)
+        self._rects.append(pygame.Rect(rect))
+        x0, y0, x1, y1 = self._span(rect)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                self._cells.setdefault((cx, cy), []).append(idx)
+
+    def query(self, area: pygame.Rect) -> List[Any]:
+        x0, y0, x1, y1 = self._span(area)
+        hits = set()
+        cells = self._cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                ids = cells.get((cx, cy))
+                if ids:
+                    hits.update(ids)
+        rects = self._rects
+        return [self._items[i] for i in sorted(hits) if rects[i].colliderect(area)]
@@ -1,4 +1,7 @@
-from typing import Dict
+from typing import Any, Callable, Dict, List
+
+from game.util.exploration import ExplorationMap
+from game.util.save_container import LazySection
 
 
 class GameState:
@@ -18,6 +21,12 @@ class GameState:
     # Farming persistence: per-plot state keyed by plot id
     # Example entry: {"plot_1": {"state": "planted", "planted_minutes": 123.0}}
     farming_plots: Dict[str, Dict] = {}
+    # Minimap fog of war: explored-cell bitsets keyed by scene name
+    exploration: Dict[str, ExplorationMap] = {}
+    # Sections loaded from a save container but not decoded yet (see ensure_loaded)
+    _lazy: Dict[str, LazySection] = {}
+    # Change listeners, called with "flag:<name>", "item:<id>" or "*" (whole state replaced)
+    _listeners: List[Callable[[str], None]] = []
 
     # NEW: Player profile and progression
     player_name: str = "Hero"
@@ -87,14 +96,68 @@ class GameState:
         cls.stats = dict(base)
         cls.hp_current = cls.stats["HP"]
 
+    @classmethod
+    def listen(cls, fn: Callable[[str], None]):
+        if fn not in cls._listeners:
+            cls._listeners.append(fn)
+
+    @classmethod
+    def _changed(cls, key: str):
+        for fn in cls._listeners:
+            try:
+                fn(key)
+            except Exception:
+                pass
+
+    @classmethod
+    def set_flag(cls, name: str, value: Any = True):
+        """Set a flag and tell listeners (quests) if it actually changed."""
+        if name in cls.flags and cls.flags[name] == value:
+            return
+        cls.flags[name] = value
+        cls._changed(f"flag:{name}")
+
+    @classmethod
+    def _set_farming_plots(cls, raw):
+        cls.farming_plots = dict(raw or {})
+
+    @classmethod
+    def _set_exploration(cls, raw):
+        cls.exploration = {}
+        for k, v in (raw or {}).items():
+            try:
+                cls.exploration[k] = ExplorationMap.from_dict(v)
+            except Exception:
+                pass
+
+    @classmethod
+    def ensure_loaded(cls, name: str | None = None):
+        """Decode lazily loaded sections (one by name, or all) before they are used."""
+        names = [name] if name else list(cls._lazy)
+        for n in names:
+            section = cls._lazy.pop(n, None)
+            if section is None:
+                continue
+            try:
+                raw = section.get()
+            except Exception:
+                raw = {}
+            getattr(cls, f"_set_{n}")(raw)
+
+    @classmethod
+    def pending_section(cls, name: str) -> LazySection | None:
+        return cls._lazy.get(name)
+
     @classmethod
     def to_dict(cls) -> Dict:
+        cls.ensure_loaded()
         return {
             "coins": int(cls.coins),
             "inventory": dict(cls.inventory or {}),
             "flags": dict(cls.flags or {}),
             "upgrades": dict(cls.upgrades or {}),
             "farming_plots": dict(cls.farming_plots or {}),
+            "exploration": {k: m.to_dict() for k, m in (cls.exploration or {}).items()},
             # NEW fields
             "player_name": cls.player_name,
             "player_race": cls.player_race,
@@ -119,7 +182,14 @@ class GameState:
         cls.inventory = dict(data.get("inventory", {"seeds": 0}))
         cls.flags = dict(data.get("flags", {"quest_started": False, "quest_completed": False}))
         cls.upgrades = dict(data.get("upgrades", {"boots": False}))
-        cls.farming_plots = dict(data.get("farming_plots", {}))
+        # Large sections may arrive still compressed; they are decoded on first use
+        cls._lazy = {}
+        for name in ("farming_plots", "exploration"):
+            raw: Any = data.get(name)
+            if isinstance(raw, LazySection):
+                cls._lazy[name] = raw
+                raw = None
+            getattr(cls, f"_set_{name}")(raw)
         # NEW defaults for old saves
         cls.player_name = str(data.get("player_name", "Hero"))
         cls.player_race = str(data.get("player_race", "Human"))
@@ -135,6 +205,7 @@ class GameState:
             "armor": eq.get("armor"),
             "accessory": eq.get("accessory"),
         }
+        cls._changed("*")
 
     @classmethod
     def reset_defaults(cls):
@@ -143,16 +214,20 @@ class GameState:
         cls.flags = {"quest_started": False, "quest_completed": False}
         cls.upgrades = {"boots": False}
         cls.farming_plots = {}
+        cls.exploration = {}
+        cls._lazy = {}
         cls.player_name = "Hero"
         cls.apply_race("Human")
         cls.level = 1
         cls.xp = 0
         cls.unspent_points = 0
         cls.equipment = {"weapon": None, "armor": None, "accessory": None}
+        cls._changed("*")
 
     @classmethod
     def add_item(cls, item_id: str, qty: int = 1):
         cls.inventory[item_id] = cls.inventory.get(item_id, 0) + qty
+        cls._changed(f"item:{item_id}")
 
     @classmethod
     def remove_item(cls, item_id: str, qty: int = 1) -> bool:
@@ -164,6 +239,7 @@ class GameState:
             cls.inventory.pop(item_id, None)
         else:
             cls.inventory[item_id] = new_qty
+        cls._changed(f"item:{item_id}")
         return True
 
     @classmethod
@@ -20,6 +20,13 @@ class _TimeOfDay:
         # Convenience for debug time skipping
         self.minutes = (self.minutes + float(mins)) % (24 * 60)
 
+    def ms_until_next_minute(self) -> float:
+        # Real milliseconds until the displayed clock minute changes
+        if self.minutes_per_second <= 0:
+            return 1000.0
+        frac = self.minutes - int(self.minutes)
+        return (1.0 - frac) * 1000.0 / self.minutes_per_second
+
     def set_morning(self):
         # Morning at 08:00; increment day counter
         self.minutes = 8 * 60.0
@@ -37,10 +44,6 @@ class _TimeOfDay:
         m = self.minutes
         return m >= 20 * 60 or m < 6 * 60
 
-    def is_shop_open(self) -> bool:
-        # shop open 08:00–20:00
-        return 8 * 60 <= self.minutes < 20 * 60
-
     def clock_text(self) -> str:
         total = int(self.minutes)  # convert to whole minutes for display
         h24 = (total // 60) % 24